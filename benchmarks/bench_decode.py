@@ -0,0 +1,31 @@
+"""
+Compares candle decoding with `decode_candles` against the previous `pd.json_normalize` path.
+
+    python -m benchmarks.bench_decode
+"""
+
+import time
+from datetime import datetime as dt
+from datetime import timedelta
+
+from benchmarks.fakes import make_candles
+from benchmarks.reference import json_normalize_candles
+from galgoz.decoder import decode_candles
+
+
+def timeit(func, *args, **kwargs) -> float:
+    start = time.perf_counter()
+    func(*args, **kwargs)
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    for n in (10_000, 100_000, 1_000_000):
+        candles = make_candles(dt(2020, 1, 1), dt(2020, 1, 1) + timedelta(minutes=n - 1), "M1")
+        legacy = timeit(json_normalize_candles, candles)
+        decoded = timeit(decode_candles, candles, time_index=False)
+        indexed = timeit(decode_candles, candles)
+        print(
+            f"{n:>9} candles: json_normalize {legacy:.3f}s, decode_candles {decoded:.3f}s "
+            f"(x{legacy / decoded:.1f}), with DatetimeIndex {indexed:.3f}s"
+        )
@@ -0,0 +1,39 @@
+"""
+Wall-clock comparison of the sequential and the concurrent `Galgoz.fetch_candles` paths.
+
+Uses the local fake OANDA client with an artificial round-trip latency, so it runs offline:
+
+    python -m benchmarks.bench_fetch
+"""
+
+import contextlib
+import io
+import time
+
+from benchmarks.fakes import FakeOandaClient
+from galgoz import Galgoz
+
+LATENCY = 0.25
+DATE_FROM = "2024-01-01T00:00:00Z"
+DATE_TO = "2024-03-01T00:00:00Z"
+
+
+def fetch(max_workers: int) -> tuple[float, int]:
+    gz = Galgoz(client=FakeOandaClient(latency=LATENCY))
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        candles = gz.fetch_candles(
+            granularity="M1",
+            date_from=DATE_FROM,
+            date_to=DATE_TO,
+            max_workers=max_workers,
+        )
+    return time.perf_counter() - start, len(candles)
+
+
+if __name__ == "__main__":
+    baseline, n = fetch(max_workers=1)
+    print(f"sequential: {baseline:.2f}s ({n} candles)")
+    for workers in (2, 4, 8, 16):
+        elapsed, _ = fetch(max_workers=workers)
+        print(f"max_workers={workers}: {elapsed:.2f}s (speedup x{baseline / elapsed:.1f})")
@@ -0,0 +1,74 @@
+"""
+Compares the weighted HMA with the previous rolling-mean version at 1M bars: full run, batch over many windows
+and per-bar streaming update.
+
+    python -m benchmarks.bench_hma
+"""
+
+import time
+
+import numpy as np
+
+from benchmarks.synthetic import synthetic_candles
+from galgoz.indicators import HMA
+from galgoz.indicators.streaming import RollingWindow
+
+BARS = 1_000_000
+WINDOW = 169
+WINDOWS = list(range(10, 260, 5))
+STREAMED = 100_000
+
+
+def rolling_mean_hma(close, window):
+    # The previous HMA.run, built on simple rolling means
+    wma1 = 2 * close.rolling(window=window // 2).mean()
+    wma2 = close.rolling(window=window).mean()
+    return (wma1 - wma2).rolling(window=int(np.sqrt(window))).mean()
+
+
+def rolling_mean_step(state, bar):
+    # The previous HMA._step, re-summing each window
+    half, full, diff = state
+    half.update(bar.mid_c)
+    full.update(bar.mid_c)
+    diff.update(2 * half.mean() - full.mean())
+    return diff.mean()
+
+
+def timeit(func, *args) -> float:
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+def stream(step, bars):
+    for bar in bars:
+        step(bar)
+
+
+if __name__ == "__main__":
+    data = synthetic_candles(BARS)
+    close = data.mid_c
+    hma = HMA(None, window=WINDOW)
+
+    legacy = timeit(rolling_mean_hma, close, WINDOW)
+    weighted = timeit(HMA, data, WINDOW)
+    print(f"{BARS} bars: rolling means {legacy:.3f}s, weighted {weighted:.3f}s")
+
+    legacy = timeit(lambda: [rolling_mean_hma(close, w) for w in WINDOWS])
+    looped = timeit(lambda: [HMA(data, window=w) for w in WINDOWS])
+    batched = timeit(HMA.batch, data, WINDOWS)
+    print(
+        f"{len(WINDOWS)} windows: rolling means {legacy:.2f}s, one HMA per window {looped:.2f}s, "
+        f"batch {batched:.2f}s"
+    )
+
+    bars = list(data[["mid_c"]].iloc[:STREAMED].itertuples(index=False))
+    state = tuple(RollingWindow(w) for w in (WINDOW // 2, WINDOW, int(np.sqrt(WINDOW))))
+    legacy = timeit(stream, lambda bar: rolling_mean_step(state, bar), bars)
+    hma._state = hma._new_state()
+    weighted = timeit(stream, hma._step, bars)
+    print(
+        f"streaming: rolling means {legacy / STREAMED * 1e6:.1f}us/bar, "
+        f"weighted {weighted / STREAMED * 1e6:.1f}us/bar"
+    )
@@ -0,0 +1,30 @@
+"""
+Scaling of the process-pool optimizer with the number of workers.
+
+    python -m benchmarks.bench_optimize
+"""
+
+import os
+import time
+
+import numpy as np
+
+from benchmarks.synthetic import synthetic_candles
+from galgoz.indicators import SuperTrend
+from galgoz.optimize import optimize
+
+BARS = 200_000
+GRID = {"atr_period": list(range(5, 45, 5)), "multiplier": list(np.arange(1.0, 7.0, 1.0))}
+
+if __name__ == "__main__":
+    data = synthetic_candles(BARS)
+    workers = 1
+    baseline = None
+    while workers <= (os.cpu_count() or 1):
+        start = time.perf_counter()
+        board = optimize(data, SuperTrend, GRID, folds=2, max_workers=workers)
+        elapsed = time.perf_counter() - start
+        baseline = baseline or elapsed
+        print(f"{workers:>3} workers: {elapsed:.2f}s (speedup x{baseline / elapsed:.1f})")
+        workers *= 2
+    print(board.head())
@@ -0,0 +1,38 @@
+"""
+Batched SuperTrend parameter sweep against one Backtest per parameter combination.
+
+    python -m benchmarks.bench_sweep
+"""
+
+import time
+
+import numpy as np
+
+from benchmarks.synthetic import synthetic_candles
+from galgoz.backtesting import Backtest, supertrend_signals
+from galgoz.indicators import SuperTrend
+
+BARS = 10_000
+ATR_PERIODS = list(range(5, 55))
+MULTIPLIERS = list(np.round(np.arange(1.0, 9.0, 0.2), 1))
+
+if __name__ == "__main__":
+    data = synthetic_candles(BARS)
+    supertrend_signals(data.iloc[:100], [5], [1.0])  # compile
+
+    start = time.perf_counter()
+    stats = Backtest(data=data, signals=supertrend_signals(data, ATR_PERIODS, MULTIPLIERS)).run()
+    batched = time.perf_counter() - start
+
+    sample = [(p, m) for p in ATR_PERIODS[:5] for m in MULTIPLIERS[:10]]
+    start = time.perf_counter()
+    for atr_period, multiplier in sample:
+        Backtest(data=data, indicators=[SuperTrend(data, atr_period=atr_period, multiplier=multiplier)]).run()
+    per_combination = (time.perf_counter() - start) / len(sample)
+
+    print(f"{len(stats)} combinations on {BARS} bars: batched {batched:.2f}s")
+    print(
+        f"one Backtest per combination: {per_combination * 1000:.1f}ms each, "
+        f"~{per_combination * len(stats):.1f}s for the grid"
+    )
+    print(stats.sort_values("sharpe", ascending=False).head())
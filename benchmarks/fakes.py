@@ -0,0 +1,230 @@
+"""
+Local stand-ins for the OANDA API (candles, prices, account and transactions), used by the tests and the offline
+benchmarks.
+"""
+
+import math
+import threading
+import time
+from datetime import datetime as dt
+from datetime import timedelta
+
+import copy
+
+import oandapyV20.endpoints.accounts as accounts  # type: ignore
+import oandapyV20.endpoints.instruments as instruments  # type: ignore
+import oandapyV20.endpoints.pricing as pricing  # type: ignore
+import oandapyV20.endpoints.transactions as transactions  # type: ignore
+from oandapyV20.exceptions import V20Error  # type: ignore
+
+GRANULARITY_MINUTES = {
+    "M1": 1,
+    "M5": 5,
+    "M15": 15,
+    "M30": 30,
+    "H1": 60,
+    "H4": 240,
+    "D": 1440,
+    "W": 10080,
+    "M": 43200,
+}
+
+TIME_FORMAT = "%Y-%m-%dT%H:%M:%S.000000000Z"
+
+NOW = dt(2024, 12, 18)
+
+
+def make_candle(time: dt, price: str = "MBA", complete: bool = True) -> dict:
+    """
+    Builds a deterministic candle dictionary with the same layout as the OANDA API.
+    """
+    minutes = (time - dt(2000, 1, 1)).total_seconds() / 60
+    mid = 150 + 5 * math.sin(minutes / 500) + 0.01 * (minutes % 7)
+    candle = {
+        "complete": complete,
+        "volume": int(minutes % 97) + 1,
+        "time": time.strftime(TIME_FORMAT),
+    }
+    for key, name, shift in (("M", "mid", 0), ("B", "bid", -0.01), ("A", "ask", 0.01)):
+        if key in price:
+            candle[name] = {
+                "o": f"{mid + shift:.3f}",
+                "h": f"{mid + shift + 0.05:.3f}",
+                "l": f"{mid + shift - 0.05:.3f}",
+                "c": f"{mid + shift + 0.02:.3f}",
+            }
+    return candle
+
+
+def make_candles(
+    date_from: dt, date_to: dt, granularity: str = "H1", price: str = "MBA"
+) -> list:
+    """
+    Candles between date_from and date_to, both ends included (to exercise boundary de-duplication).
+    """
+    step = timedelta(minutes=GRANULARITY_MINUTES[granularity])
+    candles = []
+    time = date_from
+    while time <= date_to:
+        candles.append(make_candle(time, price, complete=time + step <= NOW))
+        time += step
+    return candles
+
+
+class FakeOandaClient:
+    """
+    Local stand-in for `oandapyV20.API` serving generated candles.
+
+    Args:
+        latency (float): Seconds slept on every request, to emulate a network round trip.
+        failures (int): Number of initial requests that fail with a retryable V20Error.
+        stream_sessions (list): Messages served by successive pricing stream connections. An exception in
+            a session is raised when reached, emulating a dropped connection.
+        account (dict): Account served by AccountDetails (see `make_account`). Tests may modify it to emulate
+            changes on the server.
+        transaction_sessions (list): Messages served by successive transaction stream connections.
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        failures: int = 0,
+        stream_sessions: list | None = None,
+        account: dict | None = None,
+        transaction_sessions: list | None = None,
+    ):
+        self.latency = latency
+        self.failures = failures
+        self.stream_sessions = list(stream_sessions or [])
+        self.account = account
+        self.transaction_sessions = list(transaction_sessions or [])
+        self.requests: list = []
+        self._lock = threading.Lock()
+
+    def request(self, endpoint):
+        with self._lock:
+            self.requests.append(endpoint)
+            fail = self.failures > 0
+            if fail:
+                self.failures -= 1
+        if self.latency:
+            time.sleep(self.latency)
+        if fail:
+            raise V20Error(503, "Service Unavailable")
+        if isinstance(endpoint, instruments.InstrumentsCandles):
+            return {"candles": self._candles(endpoint.params)}
+        if isinstance(endpoint, pricing.PricingStream):
+            session = self.stream_sessions.pop(0) if self.stream_sessions else []
+            return self._stream(session)
+        if isinstance(endpoint, accounts.AccountDetails) and self.account is not None:
+            return {
+                "account": copy.deepcopy(self.account),
+                "lastTransactionID": self.account["lastTransactionID"],
+            }
+        if isinstance(endpoint, transactions.TransactionsStream):
+            session = self.transaction_sessions.pop(0) if self.transaction_sessions else []
+            return self._stream(session)
+        raise NotImplementedError(f"Fake client does not serve {endpoint}")
+
+    @staticmethod
+    def _stream(session: list):
+        for message in session:
+            if isinstance(message, Exception):
+                raise message
+            yield message
+
+    def _candles(self, params: dict) -> list:
+        granularity = params.get("granularity", "S5")
+        price = params.get("price", "M")
+        if "from" in params:
+            date_from = dt.strptime(params["from"], "%Y-%m-%dT%H:%M:%SZ")
+            date_to = dt.strptime(params["to"], "%Y-%m-%dT%H:%M:%SZ")
+            return make_candles(date_from, min(date_to, NOW), granularity, price)
+        step = timedelta(minutes=GRANULARITY_MINUTES[granularity])
+        count = int(params.get("count", 500))
+        return make_candles(NOW - step * (count - 1), NOW, granularity, price)
+
+
+def price_message(time: str, instrument: str, bid: float, ask: float) -> dict:
+    return {
+        "type": "PRICE",
+        "time": time,
+        "instrument": instrument,
+        "bids": [{"price": f"{bid:.3f}", "liquidity": 1000000}],
+        "asks": [{"price": f"{ask:.3f}", "liquidity": 1000000}],
+        "tradeable": True,
+    }
+
+
+def heartbeat_message(time: str) -> dict:
+    return {"type": "HEARTBEAT", "time": time}
+
+
+def make_account(trades: list | None = None, balance: float = 100000.0, last_id: int = 100) -> dict:
+    """
+    Builds an AccountDetails account with the given open trades, as (trade ID, instrument, units) tuples.
+    """
+    return {
+        "id": "101-001-0000000-001",
+        "balance": f"{balance:.4f}",
+        "NAV": f"{balance:.4f}",
+        "marginUsed": "0.0000",
+        "marginAvailable": f"{balance:.4f}",
+        "lastTransactionID": str(last_id),
+        "trades": [
+            {
+                "id": trade_id,
+                "instrument": instrument,
+                "price": "190.000",
+                "openTime": "2024-12-17T10:00:00.000000000Z",
+                "initialUnits": str(units),
+                "currentUnits": str(units),
+                "state": "OPEN",
+            }
+            for trade_id, instrument, units in trades or []
+        ],
+        "orders": [],
+        "positions": [],
+    }
+
+
+def fill_transaction(
+    transaction_id: int,
+    instrument: str,
+    units: int,
+    opened: int | None = None,
+    closed: list | None = None,
+    reduced: tuple | None = None,
+    balance: float = 100000.0,
+) -> dict:
+    """
+    Builds an ORDER_FILL transaction opening trade `opened`, closing the (trade ID, units) pairs of `closed`
+    and/or reducing the (trade ID, units) pair `reduced`.
+    """
+    transaction = {
+        "type": "ORDER_FILL",
+        "id": str(transaction_id),
+        "time": "2024-12-17T10:00:00.000000000Z",
+        "orderID": str(transaction_id - 1),
+        "instrument": instrument,
+        "units": str(units),
+        "price": "190.000",
+        "accountBalance": f"{balance:.4f}",
+    }
+    if opened is not None:
+        transaction["tradeOpened"] = {"tradeID": str(opened), "units": str(units), "price": "190.000"}
+    if closed:
+        transaction["tradesClosed"] = [
+            {"tradeID": str(trade_id), "units": str(units)} for trade_id, units in closed
+        ]
+    if reduced is not None:
+        transaction["tradeReduced"] = {"tradeID": str(reduced[0]), "units": str(reduced[1])}
+    return transaction
+
+
+def transaction_heartbeat(last_id: int) -> dict:
+    return {
+        "type": "HEARTBEAT",
+        "lastTransactionID": str(last_id),
+        "time": "2024-12-17T10:00:05.000000000Z",
+    }
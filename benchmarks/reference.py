@@ -0,0 +1,59 @@
+"""
+Previous implementations, kept as references for the tests and as baselines for the benchmarks.
+"""
+
+import numpy as np
+import pandas as pd
+
+from galgoz.indicators.trend import get_basic_bands
+
+
+def json_normalize_candles(data):
+    # Reference: the pd.json_normalize path candles_df used before the decoder
+    df = pd.json_normalize(data, sep="_")
+    float_columns = [col for col in df.columns if col not in ["time", "complete"]]
+    df[float_columns] = df[float_columns].astype(float)
+    df["complete"] = df["complete"].astype(int)
+    df["volume"] = df["volume"].astype(int)
+    return df
+
+
+def reference_final_bands(close, upper, lower):
+    # The pandas implementation get_final_bands had before the compiled kernel
+    trend = pd.Series(np.full(close.shape, np.nan), index=close.index)
+    dir_ = pd.Series(np.full(close.shape, 1), index=close.index)
+    long_ = pd.Series(np.full(close.shape, np.nan), index=close.index)
+    short = pd.Series(np.full(close.shape, np.nan), index=close.index)
+
+    for i in range(1, close.shape[0]):
+        if close.iloc[i] > upper.iloc[i - 1]:
+            dir_.iloc[i] = 1
+        elif close.iloc[i] < lower.iloc[i - 1]:
+            dir_.iloc[i] = -1
+        else:
+            dir_.iloc[i] = dir_.iloc[i - 1]
+            if dir_.iloc[i] > 0 and lower.iloc[i] < lower.iloc[i - 1]:
+                lower.iloc[i] = lower.iloc[i - 1]
+            if dir_.iloc[i] < 0 and upper.iloc[i] > upper.iloc[i - 1]:
+                upper.iloc[i] = upper.iloc[i - 1]
+
+        if dir_.iloc[i] > 0:
+            trend.iloc[i] = long_.iloc[i] = lower.iloc[i]
+        else:
+            trend.iloc[i] = short.iloc[i] = upper.iloc[i]
+
+    return trend, dir_, long_, short
+
+
+def reference_supertrend(high, low, close, period=14, multiplier=6.5):
+    import talib
+
+    high_ = pd.Series(np.squeeze(high))
+    low_ = pd.Series(np.squeeze(low))
+    close_ = pd.Series(np.squeeze(close))
+    avg_price = talib.MEDPRICE(high_.values, low_.values)
+    atr = talib.ATR(high_.values, low_.values, close_.values, period)
+    upper, lower = get_basic_bands(avg_price, atr, multiplier)
+    upper = pd.Series(upper, index=close_.index)
+    lower = pd.Series(lower, index=close_.index)
+    return reference_final_bands(close_, upper, lower)
@@ -0,0 +1,274 @@
+"""
+Offline benchmark suite with stored baselines and a comparison report.
+
+Covers `Galgoz.candles_df` decoding of a recorded candles response, every indicator of `galgoz.indicators`, batched
+parameter sweeps and the `qqe`/`supertrend` functions on synthetic bars, and `plotting.candles.plot` figure
+construction.
+
+    python -m benchmarks.suite                          # run and compare with benchmarks/baseline.json
+    python -m benchmarks.suite --sizes 10000 -k indicator
+    python -m benchmarks.suite --save                   # run and store the results as the new baseline
+    python -m benchmarks.suite record                   # re-record the candles fixture from the OANDA API
+
+The comparison exits with status 1 when a benchmark is slower than the baseline by more than the threshold.
+Indicator outputs are not cached while benchmarking.
+"""
+
+import argparse
+import contextlib
+import gzip
+import io
+import json
+import platform
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Callable
+
+import numpy as np
+import oandapyV20.endpoints.instruments as instruments  # type: ignore
+
+from benchmarks.synthetic import synthetic_candles
+from galgoz import Galgoz
+from galgoz.indicators import HMA, INDICATOR_CACHE, MFI, QQE, RSI, SG, WPR, Hline, SuperTrend
+from galgoz.indicators.oscillators import qqe
+from galgoz.indicators.trend import supertrend
+from galgoz.plotting.candles import plot
+from galgoz.utils import generate_indicators
+
+FOLDER = Path(__file__).resolve().parent
+FIXTURE = FOLDER / "fixtures" / "GBP_JPY_H4.json.gz"
+BASELINE = FOLDER / "baseline.json"
+
+SIZES = (10_000, 100_000, 1_000_000)
+INDICATORS = (SG, HMA, SuperTrend, RSI, WPR, QQE, MFI, Hline)
+
+# Benchmarks: name -> (setup(n) returning the function to time, sizes)
+BENCHMARKS: dict[str, tuple[Callable, tuple]] = {}
+
+
+def benchmark(name: str, sizes: tuple = SIZES):
+    """
+    Registers a benchmark. The decorated function gets the size and returns the callable to time.
+    """
+
+    def register(setup: Callable) -> Callable:
+        BENCHMARKS[name] = (setup, sizes)
+        return setup
+
+    return register
+
+
+class ReplayClient:
+    """
+    Stand-in for `oandapyV20.API` replaying a recorded candles response, repeated or cut to n candles.
+    """
+
+    def __init__(self, response: dict, n: int):
+        pages = -(-n // len(response["candles"]))
+        self.response = {**response, "candles": (response["candles"] * pages)[:n]}
+
+    def request(self, endpoint):
+        return self.response
+
+
+def load_fixture() -> dict:
+    with gzip.open(FIXTURE, "rt") as f:
+        return json.load(f)
+
+
+@benchmark("candles_df", sizes=(5_000, 50_000, 500_000))
+def bench_candles_df(n: int) -> Callable:
+    gz = Galgoz(client=ReplayClient(load_fixture(), n), store=None)
+
+    def run():
+        with contextlib.redirect_stdout(io.StringIO()):
+            gz.candles_df(granularity="H4", count=5000, price="M")
+
+    return run
+
+
+for _indicator in INDICATORS:
+
+    @benchmark(f"indicator.{_indicator.__name__}")
+    def bench_indicator(n: int, indicator=_indicator) -> Callable:
+        data = synthetic_candles(n)
+        return lambda: indicator(data)
+
+
+# Parameter sweeps: 50 windows (or 5 ATR periods x 10 multipliers) per call
+SWEEPS = {
+    HMA: {"window": range(10, 260, 5)},
+    RSI: {"window": range(5, 55)},
+    MFI: {"window": range(5, 55)},
+    SuperTrend: {"atr_period": range(10, 15), "multiplier": np.arange(1.0, 11.0)},
+}
+
+for _indicator, _grid in SWEEPS.items():
+
+    @benchmark(f"batch.{_indicator.__name__}", sizes=(10_000, 100_000))
+    def bench_batch(n: int, indicator=_indicator, grid=_grid) -> Callable:
+        data = synthetic_candles(n)
+        return lambda: indicator.batch(data, **grid)
+
+
+@benchmark("kernel.supertrend")
+def bench_supertrend(n: int) -> Callable:
+    data = synthetic_candles(n)
+    return lambda: supertrend(data.mid_h, data.mid_l, data.mid_c, 14, 6.5)
+
+
+@benchmark("kernel.qqe")
+def bench_qqe(n: int) -> Callable:
+    data = synthetic_candles(n)
+    return lambda: qqe(data, length=8, smooth=1, factor=1.618)
+
+
+@benchmark("plot.full", sizes=(10_000, 100_000))
+def bench_plot(n: int) -> Callable:
+    data = synthetic_candles(n)
+    indicators = generate_indicators(SuperTrend(data), QQE(data))
+    return lambda: plot(data.reset_index(), indicators=indicators)
+
+
+@benchmark("plot.max_bars")
+def bench_plot_downsampled(n: int) -> Callable:
+    data = synthetic_candles(n)
+    indicators = generate_indicators(SuperTrend(data), QQE(data))
+    return lambda: plot(data, indicators=indicators, max_bars=2000)
+
+
+def measure(func: Callable, repeat: int = 5, budget: float = 2.0) -> list[float]:
+    """
+    Times func after one warm-up call (which also compiles numba kernels), up to repeat times within budget seconds.
+    """
+    func()
+    times: list[float] = []
+    spent = 0.0
+    while len(times) < repeat and (not times or spent < budget):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+        spent += times[-1]
+    return times
+
+
+def run(pattern: str = "", sizes: tuple = (), repeat: int = 5, budget: float = 2.0) -> dict:
+    """
+    Runs the benchmarks whose name contains pattern, at the given sizes (default: the sizes of each benchmark).
+
+    Returns:
+        dict: Machine information and, by "name[size]", the min and median times in seconds.
+    """
+    results = {}
+    cache_enabled = INDICATOR_CACHE.enabled
+    INDICATOR_CACHE.enabled = False
+    try:
+        for name, (setup, default_sizes) in BENCHMARKS.items():
+            if pattern not in name:
+                continue
+            for n in sizes or default_sizes:
+                times = measure(setup(n), repeat, budget)
+                results[f"{name}[{n}]"] = {
+                    "min": min(times),
+                    "median": statistics.median(times),
+                    "runs": len(times),
+                }
+                print(f"{name}[{n}]: {min(times) * 1000:.2f} ms", file=sys.stderr)
+    finally:
+        INDICATOR_CACHE.enabled = cache_enabled
+    return {"machine": _machine(), "results": results}
+
+
+def compare(results: dict, baseline: dict, threshold: float = 1.5) -> tuple[str, list[str]]:
+    """
+    Compares the min times of results with a baseline.
+
+    Args:
+        results (dict): Output of `run`.
+        baseline (dict): Stored output of `run`.
+        threshold (float): Ratio above which a benchmark is reported as a regression. Default is 1.5, since
+            timings on shared machines are noisy.
+
+    Returns:
+        tuple: The report text and the names of the regressed benchmarks.
+    """
+    lines = [f"{'benchmark':<32} {'baseline':>12} {'current':>12} {'ratio':>7}"]
+    regressions = []
+    for name, current in results["results"].items():
+        reference = baseline["results"].get(name)
+        if reference is None:
+            lines.append(f"{name:<32} {'-':>12} {current['min'] * 1000:>10.2f}ms {'new':>7}")
+            continue
+        ratio = current["min"] / reference["min"]
+        flag = ""
+        if ratio > threshold:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        elif ratio < 1 / threshold:
+            flag = "  faster"
+        lines.append(
+            f"{name:<32} {reference['min'] * 1000:>10.2f}ms {current['min'] * 1000:>10.2f}ms "
+            f"{ratio:>7.2f}{flag}"
+        )
+    if baseline.get("machine") != results.get("machine"):
+        lines.append(f"Note: baseline recorded on {baseline.get('machine')}")
+    return "\n".join(lines), regressions
+
+
+def record(count: int = 5000):
+    """
+    Records the candles fixture from the OANDA API (needs the .env credentials and network access).
+    """
+    gz = Galgoz(store=None)
+    endpoint = instruments.InstrumentsCandles(
+        instrument="GBP_JPY", params={"granularity": "H4", "count": count, "price": "M"}
+    )
+    response = gz.client.request(endpoint)
+    FIXTURE.parent.mkdir(exist_ok=True)
+    with gzip.open(FIXTURE, "wt") as f:
+        json.dump(response, f)
+
+
+def _machine() -> dict:
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "processor": platform.machine(),
+        "system": platform.system(),
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawTextHelpFormatter)
+    parser.add_argument("command", nargs="?", default="run", choices=["run", "record"])
+    parser.add_argument("-k", dest="pattern", default="", help="Run the benchmarks containing this text")
+    parser.add_argument("--sizes", type=int, nargs="*", default=[], help="Override the bar counts")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--baseline", type=Path, default=BASELINE)
+    parser.add_argument("--save", action="store_true", help="Store the results as the baseline")
+    parser.add_argument("--output", type=Path, help="Also write the results to this JSON file")
+    parser.add_argument("--threshold", type=float, default=1.5)
+    args = parser.parse_args(argv)
+
+    if args.command == "record":
+        record()
+        return 0
+    results = run(args.pattern, tuple(args.sizes), args.repeat)
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2))
+    if args.save:
+        args.baseline.write_text(json.dumps(results, indent=2) + "\n")
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+    if not args.baseline.exists():
+        print(f"No baseline at {args.baseline}, run with --save to create it")
+        return 0
+    report, regressions = compare(results, json.loads(args.baseline.read_text()), args.threshold)
+    print(report)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,27 @@
+import numpy as np
+import pandas as pd
+
+
+def synthetic_candles(n: int, seed: int = 0) -> pd.DataFrame:
+    """
+    Random-walk M1 candles with the columns generated by the OANDA API, indexed by time.
+    """
+    rng = np.random.default_rng(seed)
+    close = 150 + np.cumsum(rng.normal(0, 0.02, n))
+    open_ = np.concatenate([[close[0]], close[:-1]])
+    spread = np.abs(rng.normal(0, 0.02, n))
+    data = pd.DataFrame(
+        {
+            "complete": np.ones(n, dtype=np.int64),
+            "volume": rng.integers(1, 500, n).astype(np.int64),
+            "mid_o": open_,
+            "mid_h": np.maximum(open_, close) + spread,
+            "mid_l": np.minimum(open_, close) - spread,
+            "mid_c": close,
+        },
+        index=pd.date_range("2020-01-01", periods=n, freq="min", tz="UTC", name="time"),
+    )
+    for side, shift in (("bid", -0.005), ("ask", 0.005)):
+        for field in "ohlc":
+            data[f"{side}_{field}"] = data[f"mid_{field}"] + shift
+    return data
@@ -0,0 +1,255 @@
+import threading
+import time
+from typing import Any, Optional
+
+import oandapyV20.endpoints.accounts as accounts  # type: ignore
+import oandapyV20.endpoints.transactions as transactions  # type: ignore
+import requests
+from oandapyV20.exceptions import StreamTerminated, V20Error  # type: ignore
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr
+
+# Transactions creating a pending order
+ORDER_TYPES = {
+    "MARKET_ORDER",
+    "FIXED_PRICE_ORDER",
+    "LIMIT_ORDER",
+    "STOP_ORDER",
+    "MARKET_IF_TOUCHED_ORDER",
+    "TAKE_PROFIT_ORDER",
+    "STOP_LOSS_ORDER",
+    "GUARANTEED_STOP_LOSS_ORDER",
+    "TRAILING_STOP_LOSS_ORDER",
+}
+
+
+class AccountState(BaseModel):
+    """
+    In-memory view of an OANDA account kept current from the transaction stream.
+
+    The state is bootstrapped with one AccountDetails request and then updated by each transaction (fills, trade
+    closes and reductions, pending orders and cancels, balance changes), so lookups by trade ID or instrument are
+    dictionary lookups without any request. The state is reconciled with a new AccountDetails request every
+    reconcile_interval seconds (checked on the stream heartbeats, every 5 seconds), after a reconnection and when a
+    gap in the transaction IDs shows that a transaction was missed. Margin values are only updated on reconcile.
+
+    Attributes:
+        gz (Any): The Galgoz instance providing the API client and the account ID.
+        reconcile_interval (float): Seconds between reconciliations. Default is 60.
+        reconnect_delay (float): Seconds to wait before reconnecting the stream. Default is 1.
+        max_reconnects (int): Maximum number of reconnections. Default is None (unlimited).
+        balance (float): Account balance.
+        nav (float): Net asset value, as of the last reconcile.
+        margin_used (float): Margin used, as of the last reconcile.
+        margin_available (float): Margin available, as of the last reconcile.
+        last_transaction_id (str): ID of the last transaction applied.
+        trades (dict): Open trades by trade ID, with their 'instrument' and 'currentUnits'.
+        orders (dict): Pending orders by order ID.
+        reconciliations (int): Number of AccountDetails requests made (the bootstrap included).
+        drift (int): Number of trades and orders found different on reconcile, which should stay 0.
+    """
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    gz: Any
+    reconcile_interval: float = 60.0
+    reconnect_delay: float = 1.0
+    max_reconnects: Optional[int] = None
+
+    balance: float = 0.0
+    nav: float = 0.0
+    margin_used: float = 0.0
+    margin_available: float = 0.0
+    last_transaction_id: Optional[str] = None
+    trades: dict = Field(default_factory=dict)
+    orders: dict = Field(default_factory=dict)
+    reconciliations: int = 0
+    drift: int = 0
+
+    # Net units and open trade IDs by instrument
+    _units: dict = PrivateAttr(default_factory=dict)
+    _instrument_trades: dict = PrivateAttr(default_factory=dict)
+    _last_reconcile: float = PrivateAttr(default=0.0)
+    _lock: Any = PrivateAttr(default_factory=threading.RLock)
+    _stop: threading.Event = PrivateAttr(default_factory=threading.Event)
+    _thread: Optional[threading.Thread] = PrivateAttr(default=None)
+
+    def trade(self, trade_id: str) -> Optional[dict]:
+        """
+        Returns the open trade with this ID, or None.
+        """
+        return self.trades.get(trade_id)
+
+    def position(self, instrument: str) -> float:
+        """
+        Returns the net units held on an instrument (positive long, negative short, 0 when flat).
+        """
+        return self._units.get(instrument, 0.0)
+
+    def trades_for(self, instrument: str) -> list[dict]:
+        """
+        Returns the open trades on an instrument.
+        """
+        with self._lock:
+            return [self.trades[i] for i in self._instrument_trades.get(instrument, ())]
+
+    def reconcile(self) -> int:
+        """
+        Replaces the state with a fresh AccountDetails snapshot.
+
+        Returns:
+            int: Number of trades and orders that differed from the snapshot (also added to drift).
+        """
+        r = accounts.AccountDetails(accountID=self.gz.account_id)
+        account = self.gz.client.request(r)["account"]
+        trades = {trade["id"]: trade for trade in account.get("trades", [])}
+        orders = {order["id"]: order for order in account.get("orders", [])}
+        with self._lock:
+            differences = 0
+            if self.reconciliations:
+                differences = len(_changed(self.trades, trades)) + len(_changed(self.orders, orders))
+            self.trades = trades
+            self.orders = orders
+            self._units = {}
+            self._instrument_trades = {}
+            for trade in trades.values():
+                self._add_trade(trade)
+            self.balance = float(account["balance"])
+            self.nav = float(account.get("NAV", self.balance))
+            self.margin_used = float(account.get("marginUsed", 0))
+            self.margin_available = float(account.get("marginAvailable", 0))
+            self.last_transaction_id = account["lastTransactionID"]
+            self.reconciliations += 1
+            self.drift += differences
+        self._last_reconcile = time.monotonic()
+        return differences
+
+    def start(self):
+        """
+        Bootstraps the state and keeps it current from the transaction stream in a background thread.
+        """
+        self.reconcile()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self.run, kwargs={"bootstrap": False}, daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None):
+        """
+        Stops the stream. It takes effect on the next message (at most one heartbeat interval).
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def run(self, bootstrap: bool = True):
+        """
+        Consumes the transaction stream until `stop` is called, reconnecting (and reconciling) on errors.
+        """
+        if bootstrap:
+            self.reconcile()
+        reconnects = 0
+        while not self._stop.is_set():
+            try:
+                self._consume()
+            except (StreamTerminated, V20Error, requests.ConnectionError, requests.Timeout):
+                pass
+            if self._stop.is_set():
+                break
+            if self.max_reconnects is not None and reconnects >= self.max_reconnects:
+                break
+            reconnects += 1
+            time.sleep(self.reconnect_delay)
+            # Transactions may have been missed while disconnected
+            self.reconcile()
+
+    def _consume(self):
+        r = transactions.TransactionsStream(accountID=self.gz.account_id)
+        for message in self.gz.client.request(r):
+            if self._stop.is_set():
+                return
+            self.on_message(message)
+
+    def on_message(self, message: dict):
+        """
+        Processes a message of the transaction stream (a transaction or a HEARTBEAT).
+        """
+        if message.get("type") == "HEARTBEAT":
+            missed = int(message["lastTransactionID"]) > int(self.last_transaction_id)
+            if missed or time.monotonic() - self._last_reconcile >= self.reconcile_interval:
+                self.reconcile()
+            return
+        transaction_id = int(message["id"])
+        last = int(self.last_transaction_id)
+        if transaction_id <= last:
+            return  # Already in the snapshot
+        if transaction_id > last + 1:
+            self.reconcile()
+            return
+        with self._lock:
+            applied = self._apply(message)
+            if applied:
+                self.last_transaction_id = message["id"]
+        if not applied:
+            # The transaction refers to a trade the state does not know (e.g. opened before the stream started)
+            self.reconcile()
+
+    def _apply(self, transaction: dict) -> bool:
+        # Returns False when the transaction cannot be applied to the state, which must then be reconciled
+        kind = transaction["type"]
+        if "accountBalance" in transaction:
+            self.balance = float(transaction["accountBalance"])
+        if kind in ORDER_TYPES:
+            self.orders[transaction["id"]] = transaction
+        elif kind in ("ORDER_CANCEL", "ORDER_FILL"):
+            self.orders.pop(transaction.get("orderID"), None)
+        if kind != "ORDER_FILL":
+            return True
+        instrument = transaction["instrument"]
+        for closed in transaction.get("tradesClosed", []):
+            self._remove_trade(closed["tradeID"])
+        reduced = transaction.get("tradeReduced")
+        if reduced is not None:
+            trade = self.trades.get(reduced["tradeID"])
+            if trade is None:
+                return False
+            units = float(reduced["units"])
+            trade["currentUnits"] = str(float(trade["currentUnits"]) + units)
+            self._units[instrument] = self._units.get(instrument, 0.0) + units
+        opened = transaction.get("tradeOpened")
+        if opened is not None:
+            self._add_trade(
+                {
+                    "id": opened["tradeID"],
+                    "instrument": instrument,
+                    "price": opened.get("price", transaction.get("price")),
+                    "openTime": transaction["time"],
+                    "initialUnits": opened["units"],
+                    "currentUnits": opened["units"],
+                    "state": "OPEN",
+                }
+            )
+        return True
+
+    def _add_trade(self, trade: dict):
+        instrument = trade["instrument"]
+        self.trades[trade["id"]] = trade
+        self._instrument_trades.setdefault(instrument, {})[trade["id"]] = None
+        self._units[instrument] = self._units.get(instrument, 0.0) + float(trade["currentUnits"])
+
+    def _remove_trade(self, trade_id: str):
+        trade = self.trades.pop(trade_id, None)
+        if trade is None:
+            return
+        instrument = trade["instrument"]
+        self._instrument_trades[instrument].pop(trade_id, None)
+        self._units[instrument] -= float(trade["currentUnits"])
+        if not self._instrument_trades[instrument]:
+            self._units[instrument] = 0.0
+
+
+def _changed(old: dict, new: dict) -> set:
+    # IDs added or removed, or whose units differ
+    ids = old.keys() ^ new.keys()
+    for key in old.keys() & new.keys():
+        if float(old[key].get("currentUnits", 0)) != float(new[key].get("currentUnits", 0)):
+            ids.add(key)
+    return ids
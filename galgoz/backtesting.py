@@ -0,0 +1,161 @@
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+from pydantic import BaseModel, ConfigDict, Field
+
+from .indicators.base import Indicator
+from .indicators.batch import supertrend_bands
+
+
+class Backtest(BaseModel):
+    """
+    Vectorized backtest of trading signals on candle data.
+
+    Signals are 1 (buy), -1 (sell) or 0 (no change). A signal on a bar is executed at the open of the next bar
+    and the position is kept until the opposite signal (stop and reverse). Buys are filled at the ask and sells
+    at the bid when the data has 'ask_o' and 'bid_o' columns, otherwise at the mid price.
+
+    Attributes:
+        data (pd.DataFrame): Candles indexed by time, with the 'mid_o' and 'mid_c' columns (and optionally 'bid_o' and 'ask_o').
+        indicators (list[Indicator]): Indicators generating the signals with their `signals` method. Their signals are
+            added and clipped to [-1, 1].
+        signals (pd.Series | pd.DataFrame): Signals to test, used instead of the indicators. A DataFrame tests
+            every column (e.g. parameter combinations) in one batched pass.
+        units (float): Position size in units of the instrument. Default is 1.
+        results (pd.DataFrame): Signals, positions, PnL and equity per bar, set by `run` (single signal series only).
+        stats (pd.Series | pd.DataFrame): Summary statistics, set by `run`. A DataFrame with one row per signal column
+            when signals is a DataFrame.
+    """
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    data: pd.DataFrame
+    indicators: list[Indicator] = Field(default_factory=list)
+    signals: Optional[pd.Series | pd.DataFrame] = None
+    units: float = 1.0
+    results: Optional[pd.DataFrame] = None
+    stats: Optional[pd.Series | pd.DataFrame] = None
+
+    def run(self) -> pd.Series | pd.DataFrame:
+        """
+        Runs the backtest and returns the summary statistics.
+        """
+        signals = self.signals
+        if signals is None:
+            if not self.indicators:
+                raise ValueError("No signals or indicators to backtest.")
+            signals = sum(indicator.signals() for indicator in self.indicators).clip(-1, 1)
+
+        matrix = np.asarray(signals, dtype=np.float64).reshape(len(self.data), -1)
+        result = backtest_signals(self.data, matrix, self.units)
+        stats = pd.DataFrame(
+            {key: value for key, value in result.items() if np.ndim(value) == 1}
+        )
+        if isinstance(signals, pd.DataFrame):
+            stats.index = signals.columns
+            self.stats = stats
+            return stats
+
+        self.results = pd.DataFrame(
+            {
+                "signals": matrix[:, 0],
+                "position": result["position"][:, 0],
+                "pnl": result["pnl"][:, 0],
+                "equity": result["equity"][:, 0],
+            },
+            index=self.data.index,
+        )
+        self.stats = stats.iloc[0]
+        return self.stats
+
+
+def positions_from_signals(signals: np.ndarray) -> np.ndarray:
+    """
+    Position held after each bar: the last non-zero signal up to that bar, 0 before the first one.
+
+    Args:
+        signals (np.ndarray): Signals, shape (bars, columns).
+
+    Returns:
+        np.ndarray: Positions, shape (bars, columns).
+    """
+    n, k = signals.shape
+    last = np.where(signals != 0, np.arange(n)[:, None], -1)
+    last = np.maximum.accumulate(last, axis=0)
+    positions = np.take_along_axis(signals, np.maximum(last, 0), axis=0)
+    positions[last < 0] = 0
+    return positions
+
+
+def backtest_signals(data: pd.DataFrame, signals: np.ndarray, units: float = 1.0) -> dict:
+    """
+    Computes positions, PnL and statistics for each column of a signals matrix in one vectorized pass.
+
+    Args:
+        data (pd.DataFrame): Candles with 'mid_o' and 'mid_c' columns, and optionally 'bid_o' and 'ask_o'.
+        signals (np.ndarray): Signals, shape (bars, columns).
+        units (float): Position size. Default is 1.
+
+    Returns:
+        dict: 'position', 'pnl' and 'equity' arrays of shape (bars, columns), and the 'total_pnl', 'trades',
+            'exposure', 'sharpe' and 'max_drawdown' arrays of shape (columns,).
+    """
+    open_ = data["mid_o"].to_numpy(dtype=np.float64)
+    close = data["mid_c"].to_numpy(dtype=np.float64)
+    if "ask_o" in data and "bid_o" in data:
+        half_spread = (
+            data["ask_o"].to_numpy(dtype=np.float64) - data["bid_o"].to_numpy(dtype=np.float64)
+        ) / 2
+    else:
+        half_spread = np.zeros_like(open_)
+
+    # Position held during each bar: decided at the previous close, filled at this bar's open
+    held = np.zeros_like(signals)
+    held[1:] = positions_from_signals(signals)[:-1] * units
+    traded = np.abs(np.diff(held, axis=0, prepend=0))
+
+    # Mark to market from open to next open (the last bar to its close), paying half the spread on every fill
+    next_open = np.append(open_[1:], close[-1])
+    pnl = held * (next_open - open_)[:, None] - traded * half_spread[:, None]
+    equity = np.cumsum(pnl, axis=0)
+
+    std = pnl.std(axis=0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sharpe = np.where(std > 0, pnl.mean(axis=0) / std * np.sqrt(len(pnl)), np.nan)
+    return {
+        "position": held,
+        "pnl": pnl,
+        "equity": equity,
+        "total_pnl": equity[-1],
+        "trades": np.count_nonzero(traded, axis=0),
+        "exposure": np.count_nonzero(held, axis=0) / len(held),
+        "sharpe": sharpe,
+        "max_drawdown": (np.maximum.accumulate(equity, axis=0) - equity).max(axis=0),
+    }
+
+
+def supertrend_signals(
+    data: pd.DataFrame, atr_periods: list[int], multipliers: list[float]
+) -> pd.DataFrame:
+    """
+    SuperTrend signals for every (atr_period, multiplier) combination in one batched pass.
+
+    The ATR and median price are computed once per ATR period, and the final bands of all multipliers run
+    together in the 2-D kernel. A signal is emitted when the direction flips.
+
+    Args:
+        data (pd.DataFrame): Candles with 'mid_h', 'mid_l' and 'mid_c' columns.
+        atr_periods (list[int]): ATR periods to test.
+        multipliers (list[float]): Multipliers to test.
+
+    Returns:
+        pd.DataFrame: Signals with one column per (atr_period, multiplier) combination.
+    """
+    _, direction = supertrend_bands(data, atr_periods, multipliers)
+    flips = np.zeros_like(direction)
+    flips[1:] = np.where(direction[1:] != direction[:-1], direction[1:], 0)
+    columns = pd.MultiIndex.from_product(
+        [atr_periods, multipliers], names=["atr_period", "multiplier"]
+    )
+    return pd.DataFrame(flips, index=data.index, columns=columns)
@@ -0,0 +1,61 @@
+import numpy as np
+import pandas as pd
+
+from .metrics import timed
+
+PRICE_COMPONENTS = ("bid", "mid", "ask")
+OHLC = ("o", "h", "l", "c")
+
+
+@timed("decode")
+def decode_candles(candles: list, time_index: bool = True) -> pd.DataFrame:
+    """
+    Decodes OANDA candle dictionaries into a typed DataFrame.
+
+    Every field is parsed straight into a preallocated NumPy array (float64 prices, int64 volume,
+    bool complete and datetime64 time), avoiding `pd.json_normalize` and string-to-float column casts.
+
+    Args:
+        candles (list): Candle dictionaries as returned by the OANDA API.
+        time_index (bool): If True (default), the frame is indexed by a UTC DatetimeIndex named 'time',
+            ready for the indicators. If False, the frame has the `Galgoz.candles_df` layout: a RangeIndex,
+            the original 'time' strings and 'complete' as integers.
+
+    Returns:
+        pd.DataFrame: The decoded candles, with a '{price}_{o|h|l|c}' column per price component present.
+    """
+    n = len(candles)
+    if n == 0:
+        return pd.DataFrame()
+    first = candles[0]
+    components = [key for key in first if key in PRICE_COMPONENTS]
+
+    complete = np.fromiter((c["complete"] for c in candles), dtype=np.bool_, count=n)
+    volume = np.fromiter((c["volume"] for c in candles), dtype=np.int64, count=n)
+    columns: dict = {}
+    for component in components:
+        for field in OHLC:
+            columns[f"{component}_{field}"] = np.fromiter(
+                (float(c[component][field]) for c in candles),
+                dtype=np.float64,
+                count=n,
+            )
+
+    if time_index:
+        # OANDA times are RFC3339 strings in UTC ("...000000000Z"); strip the Z so NumPy parses them directly
+        times = np.array([c["time"][:-1] for c in candles], dtype="datetime64[ns]")
+        index = pd.DatetimeIndex(times, name="time").tz_localize("UTC")
+        return pd.DataFrame(
+            {"complete": complete, "volume": volume, **columns}, index=index, copy=False
+        )
+
+    time = np.array([c["time"] for c in candles], dtype=object)
+    return pd.DataFrame(
+        {
+            "complete": complete.astype(np.int64),
+            "volume": volume,
+            "time": time,
+            **columns,
+        },
+        copy=False,
+    )
@@ -0,0 +1,368 @@
+"""
+Order execution over a pooled HTTP session, with concurrent submission, rate limiting and idempotent retries.
+"""
+
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, List, Optional
+
+import oandapyV20.endpoints.orders as orders  # type: ignore
+import oandapyV20.endpoints.trades as trades  # type: ignore
+import requests
+from oandapyV20.oandapyV20 import TRADING_ENVIRONMENTS  # type: ignore
+from pydantic import BaseModel, Field, PrivateAttr
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import NewConnectionError
+
+from .metrics import METRICS
+from .utils import load_env
+
+# Responses worth retrying: rate limited or server errors
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+# OANDA rejects an order whose client ID was already used; the order was then created by an earlier attempt
+DUPLICATE_CLIENT_ID = "CLIENT_ORDER_ID_ALREADY_EXISTS"
+
+
+class RateLimiter(BaseModel):
+    """
+    Token bucket limiting the request rate, shared by all the threads of an ExecutionClient.
+
+    Attributes:
+        rate (float): Requests per second. Default is 100 (OANDA allows 120 per second).
+        burst (int): Requests that can be sent at once after an idle period. Default is 10.
+    """
+
+    rate: float = 100.0
+    burst: int = 10
+
+    _tokens: float = PrivateAttr(default=None)
+    _last: float = PrivateAttr(default_factory=time.monotonic)
+    _lock: Any = PrivateAttr(default_factory=threading.Lock)
+
+    def acquire(self):
+        """
+        Blocks until a request can be sent.
+        """
+        with self._lock:
+            now = time.monotonic()
+            if self._tokens is None:
+                self._tokens = float(self.burst)
+            self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+            self._last = now
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if wait > 0:
+            time.sleep(wait)
+
+
+class ExecutionResult(BaseModel):
+    """
+    Outcome of an order or trade close request.
+
+    Attributes:
+        ok (bool): Whether the request succeeded.
+        client_id (str): Client order ID sent with the order (None for trade closes).
+        trade_id (str): ID of the closed trade (None for orders).
+        status (int): HTTP status of the last response, None if no response was received.
+        response (dict): JSON body of the last response.
+        error (str): Error message when the request failed.
+        attempts (int): Number of requests sent.
+        latency (float): Round trip time of the last request, in seconds.
+        elapsed (float): Time from submission to result, including rate limiting and retries, in seconds.
+    """
+
+    ok: bool
+    client_id: Optional[str] = None
+    trade_id: Optional[str] = None
+    status: Optional[int] = None
+    response: Optional[dict] = None
+    error: Optional[str] = None
+    attempts: int = 0
+    latency: float = 0.0
+    elapsed: float = 0.0
+
+
+class ExecutionClient(BaseModel):
+    """
+    Submits orders and trade closes concurrently through a pooled HTTP session.
+
+    Requests go through a thread pool of max_workers threads sharing one requests.Session, whose connection pool
+    keeps up to max_workers connections open, and a token bucket rate limiter. Failed requests (connection errors,
+    timeouts, 429 and 5xx responses) are retried with exponential backoff. Orders carry a client order ID, so a
+    retry of an order that was in fact created is rejected by OANDA as a duplicate and resolved to the existing
+    order instead of opening a second one.
+
+    Trade closes have no such guard: a retried partial close would close more units, and a retried full close
+    would fail on the closed trade. They are retried directly only when the request was not received (429 or
+    connection not established). After other failures the trade is queried first: a closed trade, or fewer
+    units than before a partial close (queried before sending it), means the close was executed.
+
+    Attributes:
+        account_id (str): The OANDA account ID.
+        access_token (str): The OANDA access token.
+        api_url (str): Base URL of the REST API. Default is the practice environment.
+        max_workers (int): Number of concurrent requests. Default is 8.
+        limiter (RateLimiter): Rate limiter shared by the requests.
+        retries (int): Number of retries of a failed request. Default is 3.
+        backoff (float): Initial backoff delay in seconds, doubled at each retry. Default is 0.5.
+        timeout (float): Timeout of each request in seconds. Default is 10.
+    """
+
+    account_id: str
+    access_token: str = Field(repr=False)
+    api_url: str = TRADING_ENVIRONMENTS["practice"]["api"]
+    max_workers: int = 8
+    limiter: RateLimiter = Field(default_factory=RateLimiter)
+    retries: int = 3
+    backoff: float = 0.5
+    timeout: float = 10.0
+
+    _session: Any = PrivateAttr(default=None)
+    _executor: Any = PrivateAttr(default=None)
+
+    def model_post_init(self, __context):
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.max_workers)
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+        self._session.headers.update(
+            {
+                "Authorization": f"Bearer {self.access_token}",
+                "Content-Type": "application/json",
+                "Accept-Datetime-Format": "RFC3339",
+            }
+        )
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers)
+
+    @classmethod
+    def from_env(cls, account: str = "practice", **kwargs) -> "ExecutionClient":
+        """
+        Creates a client with the account ID and access token of the .env file (see Galgoz).
+
+        Args:
+            account (str): "practice" or "live". Default is "practice".
+            **kwargs: Other ExecutionClient attributes.
+        """
+        load_env()
+        prefix = "OANDA_LIVE" if account == "live" else "OANDA_PRACTICE"
+        return cls(
+            account_id=os.getenv(f"{prefix}_ACCOUNT_ID", ""),
+            access_token=os.getenv(f"{prefix}_ACCESS_TOKEN", ""),
+            api_url=TRADING_ENVIRONMENTS[account]["api"],
+            **kwargs,
+        )
+
+    def submit_order(
+        self,
+        instrument: str,
+        units: int | str,
+        type: str = "MARKET",
+        client_id: Optional[str] = None,
+        **order,
+    ) -> Future:
+        """
+        Submits an order without waiting for the response.
+
+        Args:
+            instrument (str): The instrument (e.g., "GBP_JPY").
+            units (int | str): Units to buy (positive) or sell (negative).
+            type (str): The order type. Default is "MARKET".
+            client_id (str): Client order ID. Default is a new unique ID. Reuse it to retry an order safely.
+            **order: Other fields of the order request (e.g., price, stopLossOnFill). By default market orders
+                are fill or kill with the default position fill, as in Galgoz.create_order.
+
+        Returns:
+            Future: Resolves to an ExecutionResult.
+        """
+        client_id = client_id or f"galgoz-{uuid.uuid4().hex}"
+        data = {
+            "order": {
+                "instrument": instrument,
+                "units": str(units),
+                "timeInForce": "FOK",
+                "type": type,
+                "positionFill": "DEFAULT",
+                **order,
+                "clientExtensions": {"id": client_id},
+            }
+        }
+        endpoint = orders.OrderCreate(accountID=self.account_id, data=data)
+        return self._executor.submit(self._execute, endpoint, client_id=client_id)
+
+    def submit_close(self, trade_id: str, units: str = "ALL") -> Future:
+        """
+        Submits a trade close without waiting for the response.
+
+        Args:
+            trade_id (str): The ID of the trade to close.
+            units (str): The number of units to close. Default is "ALL".
+
+        Returns:
+            Future: Resolves to an ExecutionResult.
+        """
+        endpoint = trades.TradeClose(
+            accountID=self.account_id, tradeID=trade_id, data={"units": units}
+        )
+        return self._executor.submit(self._execute, endpoint, trade_id=trade_id)
+
+    def create_order(self, instrument: str, units: int | str, **kwargs) -> ExecutionResult:
+        """
+        Creates an order and waits for the result. See `submit_order`.
+        """
+        return self.submit_order(instrument, units, **kwargs).result()
+
+    def create_orders(self, orders: List[dict]) -> List[ExecutionResult]:
+        """
+        Creates several orders concurrently.
+
+        Args:
+            orders (List[dict]): `submit_order` arguments of each order, e.g. {"instrument": "GBP_JPY", "units": 100}.
+
+        Returns:
+            List[ExecutionResult]: The results, in the order of the requests.
+        """
+        futures = [self.submit_order(**order) for order in orders]
+        return [future.result() for future in futures]
+
+    def close_trades(self, trade_ids: List[str], units: str = "ALL") -> List[ExecutionResult]:
+        """
+        Closes several trades concurrently.
+
+        Returns:
+            List[ExecutionResult]: The results, in the order of trade_ids.
+        """
+        futures = [self.submit_close(trade_id, units) for trade_id in trade_ids]
+        return [future.result() for future in futures]
+
+    def close(self):
+        """
+        Waits for the submitted requests and closes the connections.
+        """
+        self._executor.shutdown(wait=True)
+        self._session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _execute(self, endpoint, client_id=None, trade_id=None) -> ExecutionResult:
+        start = time.perf_counter()
+        result = ExecutionResult(ok=False, client_id=client_id, trade_id=trade_id)
+        partial = trade_id is not None and endpoint.data["units"] != "ALL"
+        units = None
+        if partial:
+            _, trade = self._trade(trade_id, result)
+            if trade is not None and trade.get("state") == "OPEN":
+                units = abs(float(trade["currentUnits"]))
+        for attempt in range(self.retries + 1):
+            if attempt:
+                METRICS.count("api.retries", endpoint=type(endpoint).__name__)
+                time.sleep(self.backoff * 2 ** (attempt - 1))
+            result.attempts += 1
+            status, body, error, latency, sent = self._send(endpoint)
+            result.status, result.response, result.error = status, body, error
+            result.latency = latency
+            if status == endpoint.expected_status:
+                result.ok = True
+                break
+            if client_id is not None and _error_code(body) == DUPLICATE_CLIENT_ID:
+                # An earlier attempt (or call) created the order, e.g. its response was lost
+                details = orders.OrderDetails(accountID=self.account_id, orderID=f"@{client_id}")
+                status, body, error, _, _ = self._send(details)
+                result.attempts += 1
+                result.ok = status == details.expected_status
+                result.status, result.response, result.error = status, body, error
+                break
+            if status is not None and status not in RETRYABLE_STATUS:
+                break
+            if trade_id is not None and sent and status != 429:
+                # The close may have been executed (e.g. its response was lost): check the trade before retrying,
+                # and give up if that cannot be known
+                if partial and units is None:
+                    break
+                executed = self._close_executed(trade_id, units, result)
+                if executed is not False:
+                    break
+        result.elapsed = time.perf_counter() - start
+        return result
+
+    def _trade(self, trade_id: str, result: ExecutionResult) -> tuple:
+        """
+        Queries a trade, counting the request in the result. Returns the status and the trade (None on failure).
+        """
+        details = trades.TradeDetails(accountID=self.account_id, tradeID=trade_id)
+        status, body, _, _, _ = self._send(details)
+        result.attempts += 1
+        if status != details.expected_status or not body:
+            return status, None
+        return status, body.get("trade")
+
+    def _close_executed(
+        self, trade_id: str, units: Optional[float], result: ExecutionResult
+    ) -> Optional[bool]:
+        """
+        Whether a failed close was executed anyway: True if the trade is closed or has fewer units than before
+        a partial close (the result is then successful), False if it is unchanged, None if it could not be queried.
+
+        Args:
+            units (float): Units of the trade before a partial close, None for a full close.
+        """
+        status, trade = self._trade(trade_id, result)
+        if trade is None:
+            return None
+        if trade.get("state") == "CLOSED" or (
+            units is not None and abs(float(trade["currentUnits"])) < units
+        ):
+            result.ok = True
+            result.status, result.response, result.error = status, {"trade": trade}, None
+            return True
+        return False
+
+    def _send(self, endpoint) -> tuple:
+        """
+        Sends one request and returns the status (None without response), JSON body, error message, latency and
+        whether the request may have reached the server (False when the connection could not be established).
+        """
+        self.limiter.acquire()
+        name = type(endpoint).__name__
+        start = time.perf_counter()
+        try:
+            with METRICS.timer("api.request", endpoint=name) as tags:
+                response = self._session.request(
+                    endpoint.method,
+                    f"{self.api_url}/{endpoint}",
+                    json=getattr(endpoint, "data", None),
+                    timeout=self.timeout,
+                )
+                tags["status"] = response.status_code
+        except (requests.ConnectionError, requests.Timeout) as e:
+            return None, None, str(e), time.perf_counter() - start, not _not_connected(e)
+        latency = time.perf_counter() - start
+        METRICS.count("api.bytes", len(response.content), endpoint=name)
+        try:
+            body = response.json()
+        except ValueError:
+            body = None
+        error = None
+        if response.status_code != endpoint.expected_status:
+            error = (body or {}).get("errorMessage") or response.reason
+        return response.status_code, body, error, latency, True
+
+
+def _not_connected(error: requests.RequestException) -> bool:
+    # The connection was refused or timed out before the request was sent
+    reason = getattr(error.args[0], "reason", None) if error.args else None
+    return isinstance(error, requests.ConnectTimeout) or isinstance(reason, NewConnectionError)
+
+
+def _error_code(body: Optional[dict]) -> Optional[str]:
+    if not body:
+        return None
+    reject = body.get("orderRejectTransaction", {})
+    return body.get("errorCode") or reject.get("rejectReason")
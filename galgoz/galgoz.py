@@ -1,7 +1,7 @@
+import functools
 import os
-from pydantic import BaseModel, ConfigDict
-from typing import Any, List, Optional
-from dotenv import load_dotenv
+from pydantic import BaseModel, ConfigDict, Field
+from typing import TYPE_CHECKING, Any, List, Optional
 import pandas as pd
 import oandapyV20  # type: ignore
 import oandapyV20.endpoints.accounts as accounts  # type: ignore
@@ -9,17 +9,23 @@ import oandapyV20.endpoints.instruments as instruments  # type: ignore
 import oandapyV20.endpoints.orders as orders  # type: ignore
 import oandapyV20.endpoints.trades as trades  # type: ignore
 from oandapyV20.exceptions import V20Error  # type: ignore
-import plotly.graph_objects as go  # type: ignore
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime as dt
 from datetime import timedelta
 from pathlib import Path
+import time
 
-from .utils import generate_indicators
-from .plotting.candles import plot as cplot
+import requests
+
+from .utils import GRANULARITY_MINUTES, generate_indicators, load_env
+from .decoder import decode_candles
+from .metrics import METRICS
+from .storage import CandleStore, Resampler
+from .panel import align_panel
 from .indicators.base import Indicator
 
-# Load env parameters (account details and tokens)
-load_dotenv()
+if TYPE_CHECKING:
+    import plotly.graph_objects as go  # type: ignore
 
 # Get the root directory of the project
 ROOT_DIR = Path(__file__).resolve().parents[1]
@@ -30,15 +36,8 @@ MAX_CANDLES = 5000
 
 # Time increments for each granularity in minutes
 TIME_INCREMENT = {
-    "M1": 1 * MAX_CANDLES,
-    "M5": 5 * MAX_CANDLES,
-    "M15": 15 * MAX_CANDLES,
-    "M30": 30 * MAX_CANDLES,
-    "H1": 60 * MAX_CANDLES,
-    "H4": 240 * MAX_CANDLES,
-    "D": 1440 * MAX_CANDLES,
-    "W": 10080 * MAX_CANDLES,
-    "M": 43200 * MAX_CANDLES,
+    granularity: minutes * MAX_CANDLES
+    for granularity, minutes in GRANULARITY_MINUTES.items()
 }
 
 
@@ -46,20 +45,24 @@ class Galgoz(BaseModel):
     model_config = ConfigDict(arbitrary_types_allowed=True)
 
     account: str = "practice"
-    account_id: str = os.getenv(
-        "OANDA_LIVE_ACCOUNT_ID" if account == "live" else "OANDA_PRACTICE_ACCOUNT_ID",
-        "",
-    )
-    client: Any = oandapyV20.API(
-        access_token=os.getenv(
-            "OANDA_LIVE_ACCESS_TOKEN"
-            if account == "live"
-            else "OANDA_PRACTICE_ACCESS_TOKEN"
-        )
-    )
+    # Read from the .env file of the account when not given
+    account_id: Optional[str] = None
+    client: Any = None
     instrument: str = "GBP_JPY"
     data: pd.DataFrame = pd.DataFrame()
-    fig: Optional[go.Figure] = None
+    store: Optional[CandleStore] = Field(
+        default_factory=lambda: CandleStore(folder=DATA_FOLDER / "store")
+    )
+    fig: Any = None
+
+    def model_post_init(self, __context):
+        # The .env file is loaded and the API client built on the first instance, not on import
+        if self.account_id is None:
+            load_env()
+            prefix = "OANDA_LIVE" if self.account == "live" else "OANDA_PRACTICE"
+            self.account_id = os.getenv(f"{prefix}_ACCOUNT_ID", "")
+        if self.client is None:
+            self.client = default_client(self.account)
 
     def fetch_instruments(self):
         """
@@ -85,6 +88,9 @@ class Galgoz(BaseModel):
         price: str = "MBA",
         date_from: Optional[str] = None,
         date_to: Optional[str] = None,
+        max_workers: int = 1,
+        retries: int = 3,
+        backoff: float = 0.5,
     ) -> list:
         """
         Fetches candle data for a specified instrument.
@@ -95,11 +101,16 @@ class Galgoz(BaseModel):
             price (str): The price type to fetch (e.g., "M" for mid price). Default is "M".
             date_from (str): The start date and time for the candle data in UTC. Date format must be YYYY-MM-DDTHH:MM:SSZ. Default is None.
             date_to (str): The end date and time for the candle data in UTC.Date format must be YYYY-MM-DDTHH:MM:SSZ. Default is None.
+            max_workers (int): Number of date windows requested concurrently. Default is 1 (sequential).
+            retries (int): Number of times a failed window request is retried. Default is 3.
+            backoff (float): Initial delay in seconds between retries, doubled after each attempt. Default is 0.5.
 
         Returns:
             list: A list of candle data dictionaries.
 
         If both date_from and date_to are provided, the method fetches candles within the specified date range.
+        The range is split in windows of at most MAX_CANDLES candles, which are requested through a thread pool
+        of `max_workers` threads and stitched back together in time order.
         Otherwise, it fetches the specified count of candles.
         """
 
@@ -110,28 +121,24 @@ class Galgoz(BaseModel):
 
         if date_from is not None and date_to is not None:
             self._validate_date_format(date_from, date_to)
+            windows = _date_windows(date_from, date_to, granularity)
 
-            start_date = dt.strptime(date_from, "%Y-%m-%dT%H:%M:%SZ")
-            end_date = start_date
-
-            candles_list: list = []
-            while end_date < dt.strptime(date_to, "%Y-%m-%dT%H:%M:%SZ"):
-                end_date = start_date + timedelta(minutes=TIME_INCREMENT[granularity])
-                params["from"] = start_date.strftime("%Y-%m-%dT%H:%M:%SZ")
-
-                if end_date > dt.strptime(date_to, "%Y-%m-%dT%H:%M:%SZ"):
-                    end_date = dt.strptime(date_to, "%Y-%m-%dT%H:%M:%SZ")
-
-                params["to"] = end_date.strftime("%Y-%m-%dT%H:%M:%SZ")
+            def fetch_window(window):
+                start_date, end_date = window
+                window_params = dict(params)
+                window_params["from"] = start_date.strftime("%Y-%m-%dT%H:%M:%SZ")
+                window_params["to"] = end_date.strftime("%Y-%m-%dT%H:%M:%SZ")
                 print(f"Fetching candles from {start_date} to {end_date}")
-                candles = instruments.InstrumentsCandles(
-                    instrument=self.instrument, params=params
-                )
-                response = self.client.request(candles)
-                candles_list.extend(response.get("candles", []))
-                print(f"Total candles fetched: {len(response.get('candles', []))}")
-                start_date = end_date
-            return candles_list
+                candles = self._request_candles(window_params, retries, backoff)
+                print(f"Total candles fetched: {len(candles)}")
+                return candles
+
+            if max_workers > 1:
+                with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                    responses = list(executor.map(fetch_window, windows))
+            else:
+                responses = [fetch_window(window) for window in windows]
+            return _stitch_candles(responses)
         else:
             if count > 5000:
                 count = 5000
@@ -139,11 +146,117 @@ class Galgoz(BaseModel):
                     "The maximum number of candles that can be fetched is 5000. Setting count to 5000."
                 )
             params["count"] = str(count)
+            return self._request_candles(params, retries, backoff)
+
+    def fetch_panel(
+        self,
+        instruments: List[str],
+        granularity: str = "H1",
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None,
+        price: str = "MBA",
+        max_workers: int = 4,
+        how: str = "outer",
+        fill: Optional[str] = "ffill",
+        **kwargs,
+    ) -> pd.DataFrame:
+        """
+        Fetches the candles of several instruments concurrently and aligns them in a panel.
+
+        Args:
+            instruments (List[str]): Instruments to fetch (e.g., ["GBP_JPY", "EUR_USD"]).
+            granularity (str): The time frame for each candle. Default is "H1".
+            date_from (str): The start date and time in UTC. Date format must be YYYY-MM-DDTHH:MM:SSZ.
+            date_to (str): The end date and time in UTC. Date format must be YYYY-MM-DDTHH:MM:SSZ.
+            price (str): The price components to fetch. Default is "MBA".
+            max_workers (int): Number of instruments fetched concurrently. Default is 4.
+            how (str): "outer" or "inner" join of the instrument times. See `galgoz.panel.align_panel`.
+            fill (str): Gap handling ("ffill", "drop" or None). See `galgoz.panel.align_panel`.
+            **kwargs: Other `candles_df` parameters (e.g., count when no dates are given).
+
+        Returns:
+            pd.DataFrame: The panel, indexed by time with (instrument, field) MultiIndex columns.
+        """
+
+        def fetch(instrument: str) -> pd.DataFrame:
+            gz = self.model_copy(update={"instrument": instrument})
+            df = gz.candles_df(
+                granularity=granularity,
+                date_from=date_from,
+                date_to=date_to,
+                price=price,
+                **kwargs,
+            )
+            if len(df) == 0:
+                return df
+            index = pd.DatetimeIndex(pd.to_datetime(df["time"], utc=True), name="time")
+            return df.drop(columns="time").set_index(index)
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            frames = dict(zip(instruments, executor.map(fetch, instruments)))
+        return align_panel(frames, how=how, fill=fill)
+
+    def resampler(
+        self,
+        date_from: str,
+        date_to: str,
+        source: str = "M1",
+        price: str = "MBA",
+        **kwargs,
+    ) -> Resampler:
+        """
+        Fetches the candles of a fine granularity once and derives the coarser granularities from them.
+
+        The source candles are read through the candle store (see `candles_df`), so every other granularity
+        (e.g. H1 signals with a D filter) costs no API call.
+
+        Args:
+            date_from (str): The start date and time in UTC. Date format must be YYYY-MM-DDTHH:MM:SSZ.
+            date_to (str): The end date and time in UTC. Date format must be YYYY-MM-DDTHH:MM:SSZ.
+            source (str): The granularity fetched. Default is "M1".
+            price (str): The price components to fetch. Default is "MBA".
+            **kwargs: Other `candles_df` parameters, and the alignment of the candles (daily_alignment,
+                alignment_timezone and weekly_alignment, see `galgoz.utils.candle_start`).
+
+        Returns:
+            Resampler: Its `get(granularity)` returns the candles of a granularity, indexed by time.
+        """
+        alignment = {
+            key: kwargs.pop(key)
+            for key in ("daily_alignment", "alignment_timezone", "weekly_alignment")
+            if key in kwargs
+        }
+        df = self.candles_df(
+            granularity=source, date_from=date_from, date_to=date_to, price=price, **kwargs
+        )
+        return Resampler(df, source=source, **alignment)
+
+    def _request_candles(self, params: dict, retries: int = 3, backoff: float = 0.5):
+        """
+        Requests candles for the current instrument, retrying on rate limits, server errors and connection errors.
+        """
+        attempt = 0
+        while True:
             candles = instruments.InstrumentsCandles(
                 instrument=self.instrument, params=params
             )
-            response = self.client.request(candles)
-            return response.get("candles", [])
+            try:
+                with METRICS.timer(
+                    "api.request", endpoint="candles", instrument=self.instrument
+                ):
+                    response = self.client.request(candles)
+                result = response.get("candles", [])
+                METRICS.count("api.candles", len(result), instrument=self.instrument)
+                return result
+            except V20Error as e:
+                if attempt >= retries or not _is_retryable(e):
+                    raise
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt >= retries:
+                    raise
+            METRICS.count("api.retries", endpoint="candles", instrument=self.instrument)
+            time.sleep(backoff * 2**attempt)
+            attempt += 1
 
     def _validate_date_format(self, date_from, date_to):
         try:
@@ -156,27 +269,46 @@ class Galgoz(BaseModel):
         """
         Fetches candle data and returns it as a pandas DataFrame.
 
+        When a date range is requested and the instance has a `store`, the candles are read through the
+        local candle store: only the ranges not stored yet are downloaded.
+
         Args:
             **kwargs: Check the `fetch_candles` method for the available parameters.
 
         Returns:
             pd.DataFrame: A DataFrame containing the candle data with columns 'time', 'volume', and price-specific columns.
         """
-        data = self.fetch_candles(**kwargs)
-        df = pd.json_normalize(data, sep="_")
-        df.columns = df.columns.str.replace("bid_", "bid_", regex=False)
-        df.columns = df.columns.str.replace("ask_", "ask_", regex=False)
-        df.columns = df.columns.str.replace("mid_", "mid_", regex=False)
-        # Convert columns to float
-        float_columns = [col for col in df.columns if col not in ["time", "complete"]]
-        df[float_columns] = df[float_columns].astype(float)
-        df["complete"] = df["complete"].astype(int)
-        df["volume"] = df["volume"].astype(int)
-        return df
+        date_from = kwargs.get("date_from")
+        date_to = kwargs.get("date_to")
+        if self.store is None or date_from is None or date_to is None:
+            return decode_candles(self.fetch_candles(**kwargs), time_index=False)
+
+        self._validate_date_format(date_from, date_to)
+        granularity = kwargs.pop("granularity", "H1")
+        price = kwargs.pop("price", "MBA")
+        kwargs.pop("date_from")
+        kwargs.pop("date_to")
+
+        def fetch(gap_from: str, gap_to: str) -> pd.DataFrame:
+            return decode_candles(
+                self.fetch_candles(
+                    granularity=granularity,
+                    price=price,
+                    date_from=gap_from,
+                    date_to=gap_to,
+                    **kwargs,
+                ),
+                time_index=False,
+            )
+
+        return self.store.read_through(
+            fetch, self.instrument, granularity, price, date_from, date_to
+        )
 
     def create_order(self, units: str, type: str = "MARKET"):
         """
         Creates an order with the specified units and type.
+        To submit many orders concurrently, with retries and rate limiting, see `galgoz.execution.ExecutionClient`.
 
         Args:
             units (str): The number of units to order.
@@ -211,6 +343,7 @@ class Galgoz(BaseModel):
     def close_trade(self, trade_id: str, units: str = "ALL"):
         """
         Close a specific trade by its trade ID.
+        To close many trades concurrently, see `galgoz.execution.ExecutionClient.close_trades`.
 
         Args:
             trade_id (str): The ID of the trade to close.
@@ -245,7 +378,8 @@ class Galgoz(BaseModel):
         """
         Fetches candle data and stores it as a pickle file in the data folder.
 
-        The filename is generated based on the instrument, granularity, date_from, date_to, and the current timestamp.
+        The candles are read through the candle store (see `candles_df`), so only the missing ranges are downloaded.
+        The filename is generated based on the instrument and granularity.
 
         Args:
             granularity (str): The time frame for each candle (e.g., "H1" for 1 hour). Default is "H1".
@@ -266,6 +400,7 @@ class Galgoz(BaseModel):
         if len(df) > 0:
             df.to_pickle(filepath)
             print(f"Data saved to {filepath}")
+            return str(filepath)
         else:
             print(
                 f"No data to save for {self.instrument} at {granularity} granularity."
@@ -280,7 +415,7 @@ class Galgoz(BaseModel):
         indicators: Optional[List] = None,
         show: bool = True,
         **kwargs,
-    ) -> go.Figure:
+    ) -> "go.Figure":
         """
         Plots candlestick chart using the provided DataFrame.
         This function utilizes the `galgoz.plotting.candles.plot` method to generate
@@ -292,7 +427,55 @@ class Galgoz(BaseModel):
         Returns:
             go.Figure: The plotly figure object containing the candlestick chart.
         """
+        from .plotting.candles import plot as cplot
+
         self.fig = cplot(df=df, indicators=indicators, **kwargs)
         if show:
             self.fig.show()
         return self.fig
+
+
+@functools.cache
+def default_client(account: str = "practice") -> oandapyV20.API:
+    """
+    Returns the API client of an account ("practice" or "live"), built on first use with the access token of
+    the .env file and shared by the Galgoz instances.
+    """
+    load_env()
+    prefix = "OANDA_LIVE" if account == "live" else "OANDA_PRACTICE"
+    return oandapyV20.API(
+        access_token=os.getenv(f"{prefix}_ACCESS_TOKEN"), environment=account
+    )
+
+
+def _date_windows(date_from: str, date_to: str, granularity: str) -> list:
+    """
+    Splits a date range into consecutive (start, end) windows of at most MAX_CANDLES candles.
+    """
+    start_date = dt.strptime(date_from, "%Y-%m-%dT%H:%M:%SZ")
+    stop_date = dt.strptime(date_to, "%Y-%m-%dT%H:%M:%SZ")
+    windows = []
+    while start_date < stop_date:
+        end_date = min(
+            start_date + timedelta(minutes=TIME_INCREMENT[granularity]), stop_date
+        )
+        windows.append((start_date, end_date))
+        start_date = end_date
+    return windows
+
+
+def _stitch_candles(responses: list) -> list:
+    """
+    Concatenates the candles of consecutive windows, dropping candles repeated at the window boundaries.
+    """
+    candles_list: list = []
+    for candles in responses:
+        for candle in candles:
+            if candles_list and candle["time"] <= candles_list[-1]["time"]:
+                continue
+            candles_list.append(candle)
+    return candles_list
+
+
+def _is_retryable(error: V20Error) -> bool:
+    return int(error.code) == 429 or int(error.code) >= 500
@@ -1,8 +1,23 @@
 from .base import Indicator
+from .cache import INDICATOR_CACHE, IndicatorCache
+from .pipeline import Pipeline
 from .trend import SG, HMA, SuperTrend
 from .oscillators import RSI, WPR, QQE
 from .volume import MFI
 from .helpers import Hline
 
 
-__all__ = ["Indicator", "SG", "HMA", "SuperTrend", "RSI", "WPR", "QQE", "MFI", "Hline"]
+__all__ = [
+    "Indicator",
+    "IndicatorCache",
+    "INDICATOR_CACHE",
+    "Pipeline",
+    "SG",
+    "HMA",
+    "SuperTrend",
+    "RSI",
+    "WPR",
+    "QQE",
+    "MFI",
+    "Hline",
+]
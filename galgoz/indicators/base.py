@@ -1,7 +1,14 @@
+import itertools
+
+import numpy as np
 import pandas as pd
 
-from typing import Optional
-from pydantic import BaseModel, Field, field_validator, ConfigDict
+from typing import Any, ClassVar, Optional
+from pydantic import BaseModel, Field, PrivateAttr, field_validator, ConfigDict
+
+from .buffer import HistoryBuffer
+from .cache import INDICATOR_CACHE, IndicatorCache, cached_run
+from .pipeline import Node, Pipeline, default_graph
 
 
 class Indicator(BaseModel):
@@ -49,6 +56,22 @@ class Indicator(BaseModel):
         title="Indicator output data", default=None
     )
 
+    # Incremental state used by extend(), built from data on the first call
+    _state: Any = PrivateAttr(default=None)
+    # Data and output of extend(), in arrays grown geometrically (see HistoryBuffer)
+    _buffer: Optional[HistoryBuffer] = PrivateAttr(default=None)
+
+    # Data columns used by the indicator, None for all. The data is projected on these columns (without copying).
+    columns: ClassVar[Optional[tuple[str, ...]]] = None
+
+    # Cache of run() outputs shared by all indicators. Set to None on a subclass to disable it.
+    cache: ClassVar[Optional[IndicatorCache]] = INDICATOR_CACHE
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if "run" in cls.__dict__:
+            cls.run = cached_run(cls.__dict__["run"])
+
     @field_validator("output")
     def validate_output_field(cls, output):
         if not isinstance(output.index, pd.DatetimeIndex):
@@ -64,8 +87,24 @@ class Indicator(BaseModel):
                 raise ValueError(
                     "The index of the data must be a pandas DatetimeIndex."
                 )
+            data = cls._project(data)
         return data
 
+    @classmethod
+    def _project(cls, data: pd.DataFrame) -> pd.DataFrame:
+        """
+        Returns the columns of data used by the indicator, without copying the values.
+
+        The frame is built from the column Series with copy=False: `data[columns]` would copy them on pandas < 3
+        (without copy-on-write).
+        """
+        if cls.columns is None or data is None:
+            return data
+        missing = [column for column in cls.columns if column not in data.columns]
+        if missing:
+            raise ValueError(f"{cls.__name__} requires the data columns {missing}.")
+        return pd.DataFrame({column: data[column] for column in cls.columns}, copy=False)
+
     def _update_attributes(self, kwargs):
         for key, value in kwargs.items():
             if hasattr(self, key):
@@ -81,10 +120,152 @@ class Indicator(BaseModel):
             "Subclasses should implement this method to populate the output attribute."
         )
 
+    def signals(self) -> pd.Series:
+        """
+        This method should be implemented by subclasses that generate trading signals: 1 (buy), -1 (sell) or 0.
+        """
+        raise NotImplementedError(
+            f"{self.__class__.__name__} does not generate trading signals."
+        )
+
+    @classmethod
+    def batch(cls, data: pd.DataFrame, **params) -> pd.DataFrame:
+        """
+        Computes the output for every combination of parameter values, e.g. `RSI.batch(data, window=range(5, 201))`.
+
+        This generic version runs the indicator once per combination. Indicators with a batched computation
+        (see `galgoz.indicators.batch`) override it to share the work between combinations.
+
+        Args:
+            data (pd.DataFrame): The candles, indexed by time.
+            **params: Values of each parameter, a scalar or a sequence.
+
+        Returns:
+            pd.DataFrame: One column per combination (bars x combinations), labelled by the parameter values
+                (a MultiIndex with several parameters). Outputs with several columns add a last column level.
+        """
+        grid, columns = parameter_grid(**params)
+        data = cls._project(data)
+        outputs = [
+            cls(data, **dict(zip(grid, values))).output
+            for values in itertools.product(*grid.values())
+        ]
+        return pd.concat(outputs, axis=1, keys=columns)
+
     def update(self, new_data: Optional[pd.DataFrame]):
         """
-        This method should be implemented by subclasses to update the indicator with new data and recalculate the output attribute.
+        Replaces the indicator data and recalculates the output attribute over the whole history.
+        For live data, use `append` or `extend` to update the output incrementally.
+        """
+        self.data = self._project(new_data)
+        self._state = None
+        self._buffer = None
+        self.run()
+
+    def append(self, bar: pd.Series):
+        """
+        Appends a single bar and updates the output incrementally.
+
+        Args:
+            bar (pd.Series): The new candle, named by its Timestamp (e.g. a row of a candles DataFrame).
+        """
+        self.extend(pd.DataFrame([bar]))
+
+    def extend(self, new_data: pd.DataFrame):
+        """
+        Appends new bars and updates the output incrementally.
+
+        The indicator state (e.g. Wilder averages or rolling windows) is built from the existing data on the
+        first call and then updated bar by bar, so each new bar costs O(1) or O(window) instead of a full run().
+        The data and output are then kept in arrays grown geometrically (see `HistoryBuffer`), so the history is
+        not copied either. The result is the same as calling run() on the whole data.
+
+        The data and output frames are views of these arrays. Appending bars never changes the rows of frames
+        returned before, so a reference kept to an earlier output stays valid (without the new bars). Indicators
+        revising past values (the non-causal SG) invalidate the frames returned before: copy them to keep them.
+
+        Args:
+            new_data (pd.DataFrame): The new candles, indexed by time, with the same columns as data.
+        """
+        if self.data is None or self.output is None:
+            self.update(new_data)
+            return
+        if self._state is None:
+            self._state = self._new_state()
+            for bar in self.data.itertuples(index=False):
+                self._step(bar)
+        new_data = self._project(new_data)
+        values = [self._step(bar) for bar in new_data.itertuples(index=False)]
+        self._append(new_data, values)
+
+    def _append(self, new_data: pd.DataFrame, values, start: Optional[int] = None):
+        """
+        Appends new bars to data, and their output values to output (from row start if given, replacing the
+        values from there on).
+        """
+        buffer = self._buffer
+        if buffer is None or not buffer.holds(self.data, self.output):
+            if not HistoryBuffer.supports(self.data):
+                # E.g. string columns: the history is copied
+                n = len(self.data) if start is None else start
+                self.data = pd.concat([self.data, new_data])
+                self.output = pd.concat(
+                    [self.output.iloc[:n], self._output_from(values, self.data.index[n:])]
+                )
+                return
+            buffer = self._buffer = HistoryBuffer(self.data, self.output)
+        self.data, self.output = buffer.extend(new_data, values, start)
+
+    def _new_state(self) -> Any:
+        """
+        This method should be implemented by subclasses to return the initial incremental state.
+        """
+        raise NotImplementedError(
+            f"{self.__class__.__name__} does not support incremental updates."
+        )
+
+    def _step(self, bar) -> Any:
+        """
+        This method should be implemented by subclasses to consume one bar (a namedtuple with the data columns),
+        update the incremental state and return the output value(s) for that bar.
         """
         raise NotImplementedError(
-            "Subclasses should implement this method to update the indicator with new data and recalculate the output attribute."
+            f"{self.__class__.__name__} does not support incremental updates."
         )
+
+    def _graph(self, pipeline: Pipeline) -> Node:
+        """
+        Declares the output of the indicator as a node of a Pipeline. Subclasses built from shared blocks (RSI, ATR,
+        rolling means...) override it so that these blocks are evaluated once per pipeline. By default the whole
+        indicator is a single node that runs it.
+        """
+        return default_graph(self, pipeline)
+
+    def _output_from(self, values: list, index: pd.Index) -> pd.Series | pd.DataFrame:
+        if isinstance(self.output, pd.DataFrame):
+            return pd.DataFrame(values, index=index, columns=self.output.columns)
+        return pd.Series(values, index=index, name=self.output.name, dtype=float)
+
+
+def parameter_grid(**params) -> tuple[dict, pd.Index]:
+    """
+    Returns the values of each parameter as lists, and the column labels of their combinations (the product of
+    the values, in order): an Index named by the parameter, or a MultiIndex with several parameters.
+    """
+    grid = {name: np.atleast_1d(values).tolist() for name, values in params.items()}
+    if len(grid) == 1:
+        name, values = next(iter(grid.items()))
+        return grid, pd.Index(values, name=name)
+    return grid, pd.MultiIndex.from_product(list(grid.values()), names=list(grid))
+
+
+def as_float64(values) -> np.ndarray:
+    """
+    Returns values (a Series, a column or an array) as a read-only 1-D float64 array.
+
+    Float64 inputs are not copied: the result is a view of their values. Single column 2-D inputs (e.g. from
+    vectorbt) are squeezed.
+    """
+    array = np.squeeze(np.asarray(values, dtype=np.float64)).view()
+    array.flags.writeable = False
+    return array
@@ -0,0 +1,177 @@
+"""
+Indicators computed for many parameter values in one call, as 2-D outputs (bars x parameter combinations).
+
+The work that does not depend on the parameters is done once: the float64 inputs, one weighted moving average
+per distinct length shared by the windows and half windows of HMA, the typical price and money flows of MFI, the
+median price and one ATR per period shared by all SuperTrend multipliers, and a single pass over the bars updating
+the Wilder averages of every RSI period. The results match the indicator classes, column by column.
+
+The indicator classes expose these functions as `batch` class methods, e.g. `RSI.batch(data, window=range(5, 201))`.
+"""
+
+from typing import Sequence
+
+import numpy as np
+import pandas as pd
+import talib
+
+from .base import as_float64, parameter_grid
+from .kernels import final_bands_2d, wilder_rsi_windows
+from .streaming import savgol_endpoint_coeffs
+
+
+def batch_rsi(data: pd.DataFrame, window: int | Sequence[int]) -> pd.DataFrame:
+    """
+    RSI of 'mid_c' for every window, in one pass over the bars.
+    """
+    grid, columns = parameter_grid(window=window)
+    values = wilder_rsi_windows(
+        as_float64(data["mid_c"]), np.asarray(grid["window"], dtype=np.int64)
+    )
+    return pd.DataFrame(values, index=data.index, columns=columns)
+
+
+def batch_wpr(data: pd.DataFrame, window: int | Sequence[int]) -> pd.DataFrame:
+    """
+    Williams %R for every window.
+    """
+    grid, columns = parameter_grid(window=window)
+    high, low, close = (as_float64(data[column]) for column in ("mid_h", "mid_l", "mid_c"))
+    values = np.column_stack(
+        [talib.WILLR(high, low, close, timeperiod=w) for w in grid["window"]]
+    )
+    return pd.DataFrame(values, index=data.index, columns=columns)
+
+
+def batch_mfi(data: pd.DataFrame, window: int | Sequence[int]) -> pd.DataFrame:
+    """
+    Money Flow Index for every window, from one cumulative sum of the positive and negative money flows.
+    """
+    grid, columns = parameter_grid(window=window)
+    high, low, close, volume = (
+        as_float64(data[column]) for column in ("mid_h", "mid_l", "mid_c", "volume")
+    )
+    typical = (high + low + close) / 3
+    flow = typical * volume
+    change = np.diff(typical, prepend=np.nan)
+    positive = _running_sum(np.where(change > 0, flow, 0.0))
+    negative = _running_sum(np.where(change < 0, flow, 0.0))
+
+    values = np.full((len(data), len(columns)), np.nan)
+    for j, w in enumerate(grid["window"]):
+        if w >= len(data):
+            continue
+        # Flows of the w bars ending at each bar, the first bar having no flow
+        pos = positive[w + 1 :] - positive[1 : -w]
+        neg = negative[w + 1 :] - negative[1 : -w]
+        total = pos + neg
+        with np.errstate(divide="ignore", invalid="ignore"):
+            values[w:, j] = np.where(total < 1.0, 0.0, 100.0 * pos / total)
+    return pd.DataFrame(values, index=data.index, columns=columns)
+
+
+def batch_hma(data: pd.DataFrame, window: int | Sequence[int]) -> pd.DataFrame:
+    """
+    Hull Moving Average of 'mid_c' for every window. The weighted moving averages of the close are computed once
+    per distinct length, and shared by the windows and half windows using it.
+    """
+    grid, columns = parameter_grid(window=window)
+    close = as_float64(data["mid_c"])
+    wmas: dict[int, np.ndarray] = {}
+
+    def wma(length: int) -> np.ndarray:
+        if length not in wmas:
+            wmas[length] = talib.WMA(close, timeperiod=length)
+        return wmas[length]
+
+    # Column-major, so that each window fills one contiguous column, and the frame can use it without a copy
+    values = np.empty((len(data), len(columns)), order="F")
+    for j, w in enumerate(grid["window"]):
+        diff = 2 * wma(w // 2) - wma(w)
+        values[:, j] = talib.WMA(diff, timeperiod=int(np.sqrt(w)))
+    return pd.DataFrame(values, index=data.index, columns=columns, copy=False)
+
+
+def batch_sg(
+    data: pd.DataFrame,
+    window: int | Sequence[int],
+    order: int | Sequence[int] = 2,
+    causal: bool = False,
+) -> pd.DataFrame:
+    """
+    Savitzky-Golay filter of 'mid_c' for every (window, order) combination, causal or not (see `SG`).
+    """
+    from scipy import signal  # type: ignore
+
+    grid, columns = parameter_grid(window=window, order=order)
+    close = as_float64(data["mid_c"])
+    values = np.column_stack(
+        [
+            causal_savgol(close, w, p)
+            if causal
+            else signal.savgol_filter(close, window_length=w, polyorder=p)
+            for w in grid["window"]
+            for p in grid["order"]
+        ]
+    )
+    return pd.DataFrame(values, index=data.index, columns=columns)
+
+
+def causal_savgol(values: np.ndarray, window: int, order: int) -> np.ndarray:
+    """
+    Causal Savitzky-Golay filter: the value at each bar of the polynomial fitted to the window ending at that
+    bar, i.e. the last value of savgol_filter applied to the values up to that bar. NaN for the first
+    window - 1 bars.
+    """
+    out = np.full(len(values), np.nan)
+    if len(values) >= window:
+        windows = np.lib.stride_tricks.sliding_window_view(values, window)
+        out[window - 1 :] = windows @ savgol_endpoint_coeffs(window, order)
+    return out
+
+
+def batch_supertrend(
+    data: pd.DataFrame,
+    atr_period: int | Sequence[int],
+    multiplier: float | Sequence[float],
+) -> pd.DataFrame:
+    """
+    SuperTrend for every (atr_period, multiplier) combination. See `supertrend_bands`.
+    """
+    _, columns = parameter_grid(atr_period=atr_period, multiplier=multiplier)
+    trend, _ = supertrend_bands(data, atr_period, multiplier)
+    return pd.DataFrame(trend, index=data.index, columns=columns)
+
+
+def supertrend_bands(
+    data: pd.DataFrame,
+    atr_period: int | Sequence[int],
+    multiplier: float | Sequence[float],
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    SuperTrend trend and direction arrays for every (atr_period, multiplier) combination.
+
+    The median price is computed once and the ATR once per period; the final bands of all the multipliers of
+    a period run together in the 2-D kernel.
+
+    Returns:
+        tuple: The trend and direction, each of shape (bars, combinations), combinations ordered by period first.
+    """
+    grid, _ = parameter_grid(atr_period=atr_period, multiplier=multiplier)
+    high, low, close = (as_float64(data[column]) for column in ("mid_h", "mid_l", "mid_c"))
+    med_price = talib.MEDPRICE(high, low)[:, None]
+    multipliers = np.asarray(grid["multiplier"], dtype=np.float64)[None, :]
+    closes = np.broadcast_to(close[:, None], (len(close), multipliers.shape[1]))
+
+    trends, directions = [], []
+    for period in grid["atr_period"]:
+        matr = multipliers * talib.ATR(high, low, close, period)[:, None]
+        trend, direction = final_bands_2d(closes, med_price + matr, med_price - matr)
+        trends.append(trend)
+        directions.append(direction)
+    return np.concatenate(trends, axis=1), np.concatenate(directions, axis=1)
+
+
+def _running_sum(values: np.ndarray) -> np.ndarray:
+    # Cumulative sum with a leading 0, so that the sum of values[i - w + 1 : i + 1] is s[i + 1] - s[i + 1 - w]
+    return np.concatenate([[0.0], np.cumsum(values)])
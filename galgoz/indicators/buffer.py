@@ -0,0 +1,118 @@
+"""
+Growable storage for the data and output of indicators updated bar by bar (see `Indicator.extend`).
+
+Concatenating each new bar to the data and output DataFrames copies the whole history, so a live update would
+cost O(bars). Instead, the time index, the data columns and the output values are kept in preallocated arrays
+whose capacity doubles when full: appending a bar copies only that bar (O(1) amortized), and the DataFrames
+exposed as `data` and `output` are views of the filled rows, built without copying them.
+
+Rows already exposed are only written again when `extend` is given a start row (indicators revising their last
+values); appended rows and reallocations leave the frames returned before unchanged.
+"""
+
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+
+class HistoryBuffer:
+    """
+    Data and output of an indicator in arrays grown geometrically, sharing one time index.
+    """
+
+    def __init__(self, data: pd.DataFrame, output: pd.Series | pd.DataFrame):
+        self.size = len(data)
+        capacity = max(64, 2 * self.size)
+        self.index_dtype = data.index.dtype
+        self.index_name = data.index.name
+        self.index = np.empty(capacity, dtype=np.int64)
+        self.index[: self.size] = data.index.asi8
+        self.columns = data.columns
+        self.values = [np.empty(capacity, dtype=dtype) for dtype in data.dtypes]
+        for array, column in zip(self.values, data.columns):
+            array[: self.size] = data[column].to_numpy()
+        self.output_columns = output.columns if isinstance(output, pd.DataFrame) else None
+        self.output_name = output.name if self.output_columns is None else None
+        self.output = np.empty((capacity, output.shape[1] if output.ndim == 2 else 1))
+        self.output[: self.size] = output.to_numpy(dtype=np.float64).reshape(self.size, -1)
+        self.data_view, self.output_view = self._views()
+
+    @staticmethod
+    def supports(data: pd.DataFrame) -> bool:
+        """
+        Whether the data can be buffered: a DatetimeIndex and NumPy column dtypes (not strings or categoricals).
+        """
+        return (
+            isinstance(data.index, pd.DatetimeIndex)
+            and data.columns.is_unique
+            and all(isinstance(dtype, np.dtype) and dtype.kind in "biuf" for dtype in data.dtypes)
+        )
+
+    def holds(self, data: pd.DataFrame, output: pd.Series | pd.DataFrame) -> bool:
+        """
+        Whether data and output are the views last returned, i.e. were not replaced since (e.g. by run()).
+        """
+        return data is self.data_view and output is self.output_view
+
+    def extend(
+        self, new_data: pd.DataFrame, output: np.ndarray, start: Optional[int] = None
+    ) -> tuple[pd.DataFrame, pd.Series | pd.DataFrame]:
+        """
+        Appends bars and their output values.
+
+        Args:
+            new_data (pd.DataFrame): The new bars, with the columns of the buffered data.
+            output (np.ndarray): Output values (one row per bar) from row start to the last new bar.
+            start (int, optional): First output row written, for indicators revising their last values.
+                Defaults to the first new bar.
+
+        Returns:
+            tuple: The data and output views, including the new bars.
+        """
+        size = self.size + len(new_data)
+        if size > len(self.index):
+            self._grow(2 * size)
+        index = new_data.index
+        if index.dtype != self.index_dtype:
+            tz = getattr(self.index_dtype, "tz", None)
+            unit = self.index_dtype.unit if tz is not None else np.datetime_data(self.index_dtype)[0]
+            index = pd.DatetimeIndex(index).as_unit(unit)
+            if tz is not None:
+                index = index.tz_convert(tz)
+        self.index[self.size : size] = index.asi8
+        for array, column in zip(self.values, self.columns):
+            array[self.size : size] = new_data[column].to_numpy()
+        start = self.size if start is None else start
+        self.output[start:size] = np.asarray(output, dtype=np.float64).reshape(size - start, -1)
+        self.size = size
+        self.data_view, self.output_view = self._views()
+        return self.data_view, self.output_view
+
+    def _grow(self, capacity: int):
+        self.index = _resized(self.index, capacity)
+        self.values = [_resized(array, capacity) for array in self.values]
+        self.output = _resized(self.output, capacity)
+
+    def _views(self) -> tuple[pd.DataFrame, pd.Series | pd.DataFrame]:
+        n = self.size
+        index = pd.DatetimeIndex(
+            self.index[:n], dtype=self.index_dtype, name=self.index_name, copy=False
+        )
+        data = pd.DataFrame(
+            dict(zip(self.columns, (array[:n] for array in self.values))),
+            index=index,
+            columns=self.columns,
+            copy=False,
+        )
+        if self.output_columns is None:
+            output = pd.Series(self.output[:n, 0], index=index, name=self.output_name, copy=False)
+        else:
+            output = pd.DataFrame(self.output[:n], index=index, columns=self.output_columns, copy=False)
+        return data, output
+
+
+def _resized(array: np.ndarray, capacity: int) -> np.ndarray:
+    resized = np.empty((capacity, *array.shape[1:]), dtype=array.dtype)
+    resized[: len(array)] = array
+    return resized
@@ -0,0 +1,183 @@
+import functools
+import hashlib
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Optional
+
+import numpy as np
+import pandas as pd
+from pydantic import BaseModel, PrivateAttr
+
+from ..metrics import METRICS
+
+# Fields of Indicator that only affect plotting, not the output
+PLOT_FIELDS = {"name", "data", "output", "row", "mode", "line", "marker", "line_color"}
+
+
+def fingerprint(data: pd.DataFrame) -> str:
+    """
+    Returns a fingerprint of a candles DataFrame.
+
+    The fingerprint hashes the length, the columns, the whole index and all the bytes of the numeric columns, so
+    frames differing in any value (perturbed copies, corrected data, in-place edits) get different fingerprints.
+    Hashing runs at about 1 GB/s (some 8 ms per million bars and column): about the cost of a talib indicator
+    such as RSI, and far less than the others.
+
+    Args:
+        data (pd.DataFrame): The indicator data (projected on the columns the indicator uses).
+
+    Returns:
+        str: Hex digest of the fingerprint.
+    """
+    digest = hashlib.sha1()
+    digest.update(repr((len(data), tuple(data.columns))).encode())
+    digest.update(np.ascontiguousarray(data.index.asi8))
+    # Text columns (e.g. time strings) are derived from the index and skipped
+    for column, dtype in data.dtypes.items():
+        if getattr(dtype, "kind", "O") in "biuf":
+            digest.update(repr((column, dtype.str)).encode())
+            digest.update(np.ascontiguousarray(data[column].to_numpy()))
+    return digest.hexdigest()
+
+
+def _nbytes(output: pd.Series | pd.DataFrame) -> int:
+    usage = output.memory_usage(deep=False)
+    return int(usage.sum()) if isinstance(usage, pd.Series) else int(usage)
+
+
+class IndicatorCache(BaseModel):
+    """
+    LRU cache of indicator outputs keyed by the indicator class, its parameters and a fingerprint of its data.
+
+    Attributes:
+        enabled (bool): Whether Indicator.run() uses the cache. Default is True.
+        maxsize (int): Maximum number of outputs kept in memory. Default is 128.
+        max_bytes (int): Maximum memory used by the outputs kept in memory, None for no limit. Default is 256 MB.
+        folder (Path): Optional folder where outputs are also pickled, so they survive between sessions.
+        hits (int): Number of run() calls served from the cache (memory or disk).
+        misses (int): Number of run() calls that computed the output.
+    """
+
+    enabled: bool = True
+    maxsize: int = 128
+    max_bytes: Optional[int] = 256 * 2**20
+    folder: Optional[Path] = None
+    hits: int = 0
+    misses: int = 0
+
+    _entries: OrderedDict = PrivateAttr(default_factory=OrderedDict)
+    _bytes: int = PrivateAttr(default=0)
+    _lock: Any = PrivateAttr(default_factory=threading.Lock)
+
+    def key(self, indicator) -> str:
+        """
+        Returns the cache key of an indicator: its class, parameters and data fingerprint.
+        """
+        cls = type(indicator)
+        params = {
+            name: getattr(indicator, name)
+            for name in sorted(cls.model_fields)
+            if name not in PLOT_FIELDS
+        }
+        text = f"{cls.__module__}.{cls.__qualname__}{params}@{fingerprint(indicator.data)}"
+        return hashlib.sha1(text.encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[pd.Series | pd.DataFrame]:
+        """
+        Returns the cached output for key, or None, and updates the hit/miss counters.
+        """
+        with self._lock:
+            output = self._entries.get(key)
+            if output is not None:
+                self._entries.move_to_end(key)
+        if output is None and self.folder is not None:
+            path = self.folder / f"{key}.pkl"
+            if path.exists():
+                output = pd.read_pickle(path)
+                self._store(key, output)
+        with self._lock:
+            if output is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        # Deep copy: shallow copies share the values unless pandas copy-on-write is on (pandas < 3)
+        return output.copy(deep=True)
+
+    def put(self, key: str, output: pd.Series | pd.DataFrame):
+        """
+        Stores an output in memory (evicting the least recently used ones) and on disk if a folder is set.
+        """
+        output = output.copy(deep=True)
+        self._store(key, output)
+        if self.folder is not None:
+            self.folder.mkdir(parents=True, exist_ok=True)
+            output.to_pickle(self.folder / f"{key}.pkl")
+
+    def _store(self, key: str, output: pd.Series | pd.DataFrame):
+        size = _nbytes(output)
+        with self._lock:
+            if key in self._entries:
+                self._bytes -= _nbytes(self._entries.pop(key))
+            self._entries[key] = output
+            self._bytes += size
+            while len(self._entries) > self.maxsize or (
+                self.max_bytes is not None
+                and self._bytes > self.max_bytes
+                and len(self._entries) > 1
+            ):
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= _nbytes(evicted)
+
+    def clear(self, disk: bool = False):
+        """
+        Empties the memory cache and resets the counters. With disk=True, also deletes the pickled outputs.
+        """
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self.hits = 0
+            self.misses = 0
+        if disk and self.folder is not None and self.folder.exists():
+            for path in self.folder.glob("*.pkl"):
+                path.unlink()
+
+    def info(self) -> dict:
+        """
+        Returns the hit/miss counters and the current size of the memory cache.
+        """
+        return dict(
+            hits=self.hits,
+            misses=self.misses,
+            entries=len(self._entries),
+            bytes=self._bytes,
+        )
+
+
+INDICATOR_CACHE = IndicatorCache()
+
+
+def cached_run(run):
+    """
+    Wraps an Indicator.run() method so that outputs are looked up in the indicator's cache before computing them.
+    Each call is timed as "indicator.run", tagged with the indicator class and the cache outcome.
+    """
+
+    @functools.wraps(run)
+    def wrapper(self):
+        with METRICS.timer("indicator.run", indicator=type(self).__name__) as tags:
+            cache = self.cache
+            if cache is None or not cache.enabled or self.data is None:
+                tags["cache"] = "off"
+                return run(self)
+            key = cache.key(self)
+            output = cache.get(key)
+            if output is None:
+                tags["cache"] = "miss"
+                run(self)
+                cache.put(key, self.output)
+            else:
+                tags["cache"] = "hit"
+                self.output = output
+
+    return wrapper
@@ -22,6 +22,8 @@ class Hline(Indicator):
             [self.yvalue] * len(self.data), index=self.data.index, name="hline"
         )
 
-    def update(self, new_data: pd.DataFrame | None):
-        self.data = new_data
-        self.run()
+    def _new_state(self):
+        return self.yvalue
+
+    def _step(self, bar):
+        return self._state
@@ -0,0 +1,303 @@
+"""
+Compiled array kernels for the recursive parts of the indicators.
+
+The kernels operate on raw float64 NumPy arrays and are compiled with numba when it is installed.
+Without numba they run as plain Python over the arrays, with identical results. numba is only imported on the
+first call of a kernel, so importing the indicators does not pay for it.
+"""
+
+import functools
+
+import numpy as np
+
+
+def njit(**options):
+    """
+    Compiles the decorated kernel with `numba.njit(**options)` on its first call.
+    """
+
+    def decorate(func):
+        compiled = None
+
+        @functools.wraps(func)
+        def kernel(*args):
+            nonlocal compiled
+            if compiled is None:
+                try:
+                    from numba import njit as numba_njit  # type: ignore
+                except ImportError:  # pragma: no cover
+                    compiled = func
+                else:
+                    compiled = numba_njit(**options)(func)
+            return compiled(*args)
+
+        return kernel
+
+    return decorate
+
+
+@njit(cache=True)
+def final_bands(close, upper, lower):
+    """
+    SuperTrend final bands state machine.
+
+    Args:
+        close (np.ndarray): Close prices.
+        upper (np.ndarray): Basic upper band.
+        lower (np.ndarray): Basic lower band.
+
+    Returns:
+        tuple: trend, direction (1 or -1), long and short arrays.
+    """
+    n = close.shape[0]
+    upper = upper.copy()
+    lower = lower.copy()
+    trend = np.full(n, np.nan)
+    direction = np.ones(n, dtype=np.int64)
+    long_ = np.full(n, np.nan)
+    short = np.full(n, np.nan)
+
+    for i in range(1, n):
+        if close[i] > upper[i - 1]:
+            direction[i] = 1
+        elif close[i] < lower[i - 1]:
+            direction[i] = -1
+        else:
+            direction[i] = direction[i - 1]
+            if direction[i] > 0 and lower[i] < lower[i - 1]:
+                lower[i] = lower[i - 1]
+            if direction[i] < 0 and upper[i] > upper[i - 1]:
+                upper[i] = upper[i - 1]
+
+        if direction[i] > 0:
+            trend[i] = lower[i]
+            long_[i] = lower[i]
+        else:
+            trend[i] = upper[i]
+            short[i] = upper[i]
+
+    return trend, direction, long_, short
+
+
+@njit(cache=True)
+def qqe_slow_line(qqe_fast, length, factor):
+    """
+    QQE recursive smoothing of the fast line volatility and slow line state machine.
+
+    Args:
+        qqe_fast (np.ndarray): Smoothed RSI (QQE fast line).
+        length (int): RSI length, also used as the smoothing period.
+        factor (float): Multiplier of the smoothed RSI volatility.
+
+    Returns:
+        np.ndarray: The QQE slow line.
+    """
+    n = qqe_fast.shape[0]
+    wmma = np.zeros(n)
+    atr_rsi = np.zeros(n)
+    qqe_slow = np.zeros(n)
+    for i in range(1, n):
+        rsi_delta = abs(qqe_fast[i] - qqe_fast[i - 1])
+        prev_wmma = wmma[i - 1] if not np.isnan(wmma[i - 1]) else 0
+        wmma[i] = rsi_delta / length + (1 - 1 / length) * prev_wmma
+        prev_atr_rsi = atr_rsi[i - 1] if not np.isnan(atr_rsi[i - 1]) else 0
+        atr_rsi[i] = wmma[i] / length + (1 - 1 / length) * prev_atr_rsi
+
+        qqe_up = qqe_fast[i] + atr_rsi[i] * factor
+        qqe_down = qqe_fast[i] - atr_rsi[i] * factor
+        prev = qqe_slow[i - 1] if not np.isnan(qqe_slow[i - 1]) else 0
+        if qqe_up < prev:
+            qqe_slow[i] = qqe_up
+        elif qqe_fast[i] > prev and qqe_fast[i - 1] < prev:
+            qqe_slow[i] = qqe_down
+        elif qqe_down > prev:
+            qqe_slow[i] = qqe_down
+        elif qqe_fast[i] < prev and qqe_fast[i - 1] > prev:
+            qqe_slow[i] = qqe_up
+        else:
+            qqe_slow[i] = qqe_slow[i - 1]
+    return qqe_slow
+
+
+@njit(cache=True)
+def final_bands_2d(close, upper, lower):
+    """
+    SuperTrend final bands state machine over the columns of 2-D arrays (see `final_bands`).
+
+    Each column is an independent series, e.g. one parameter combination or one instrument.
+
+    Args:
+        close (np.ndarray): Close prices, shape (bars, columns). Can be a broadcast view of a single series.
+        upper (np.ndarray): Basic upper bands, shape (bars, columns).
+        lower (np.ndarray): Basic lower bands, shape (bars, columns).
+
+    Returns:
+        tuple: trend and direction (1 or -1) arrays, shape (bars, columns).
+    """
+    n, k = upper.shape
+    upper = upper.copy()
+    lower = lower.copy()
+    trend = np.full((n, k), np.nan)
+    direction = np.ones((n, k), dtype=np.int64)
+
+    for i in range(1, n):
+        for j in range(k):
+            if close[i, j] > upper[i - 1, j]:
+                direction[i, j] = 1
+            elif close[i, j] < lower[i - 1, j]:
+                direction[i, j] = -1
+            else:
+                direction[i, j] = direction[i - 1, j]
+                if direction[i, j] > 0 and lower[i, j] < lower[i - 1, j]:
+                    lower[i, j] = lower[i - 1, j]
+                if direction[i, j] < 0 and upper[i, j] > upper[i - 1, j]:
+                    upper[i, j] = upper[i - 1, j]
+
+            if direction[i, j] > 0:
+                trend[i, j] = lower[i, j]
+            else:
+                trend[i, j] = upper[i, j]
+
+    return trend, direction
+
+
+@njit(cache=True)
+def wilder_rsi_2d(close, period):
+    """
+    RSI with Wilder smoothing over the columns of a 2-D array, as computed by `talib.RSI` on each column.
+
+    Leading NaNs of a column (e.g. an instrument with a shorter history) are skipped.
+
+    Args:
+        close (np.ndarray): Close prices, shape (bars, columns).
+        period (int): RSI period.
+
+    Returns:
+        np.ndarray: RSI values, shape (bars, columns).
+    """
+    n, k = close.shape
+    out = np.full((n, k), np.nan)
+    for j in range(k):
+        start = 0
+        while start < n and np.isnan(close[start, j]):
+            start += 1
+        if start + period >= n:
+            continue
+        gain = 0.0
+        loss = 0.0
+        for i in range(start + 1, n):
+            diff = close[i, j] - close[i - 1, j]
+            if i > start + period:
+                loss *= period - 1
+                gain *= period - 1
+            if diff < 0:
+                loss -= diff
+            else:
+                gain += diff
+            if i < start + period:
+                continue
+            loss /= period
+            gain /= period
+            total = gain + loss
+            if -1e-8 < total < 1e-8:
+                out[i, j] = 0.0
+            else:
+                out[i, j] = 100.0 * (gain / total)
+    return out
+
+
+@njit(cache=True)
+def wilder_atr_2d(high, low, close, period):
+    """
+    Average True Range with Wilder smoothing over the columns of 2-D arrays, as computed by `talib.ATR`.
+
+    Leading NaNs of a column are skipped.
+
+    Args:
+        high (np.ndarray): High prices, shape (bars, columns).
+        low (np.ndarray): Low prices, shape (bars, columns).
+        close (np.ndarray): Close prices, shape (bars, columns).
+        period (int): ATR period.
+
+    Returns:
+        np.ndarray: ATR values, shape (bars, columns).
+    """
+    n, k = close.shape
+    out = np.full((n, k), np.nan)
+    for j in range(k):
+        start = 0
+        while start < n and np.isnan(close[start, j]):
+            start += 1
+        if start + period >= n:
+            continue
+        atr = 0.0
+        for i in range(start + 1, n):
+            true_range = high[i, j] - low[i, j]
+            true_range = max(
+                true_range,
+                abs(close[i - 1, j] - high[i, j]),
+                abs(close[i - 1, j] - low[i, j]),
+            )
+            if i <= start + period:
+                atr += true_range
+                if i < start + period:
+                    continue
+                atr /= period
+            else:
+                atr *= period - 1
+                atr += true_range
+                atr /= period
+            out[i, j] = atr
+    return out
+
+
+@njit(cache=True)
+def wilder_rsi_windows(close, periods):
+    """
+    RSI with Wilder smoothing of one series for several periods in a single pass over the bars, with the same
+    operations as `wilder_rsi_2d`.
+
+    Args:
+        close (np.ndarray): Close prices, shape (bars,).
+        periods (np.ndarray): RSI periods (int64), shape (columns,).
+
+    Returns:
+        np.ndarray: RSI values, shape (bars, columns).
+    """
+    n = len(close)
+    k = len(periods)
+    out = np.full((n, k), np.nan)
+    start = 0
+    while start < n and np.isnan(close[start]):
+        start += 1
+    gains = np.zeros(k)
+    losses = np.zeros(k)
+    for i in range(start + 1, n):
+        diff = close[i] - close[i - 1]
+        for j in range(k):
+            period = periods[j]
+            if start + period >= n:
+                continue
+            gain = gains[j]
+            loss = losses[j]
+            if i > start + period:
+                loss *= period - 1
+                gain *= period - 1
+            if diff < 0:
+                loss -= diff
+            else:
+                gain += diff
+            if i < start + period:
+                gains[j] = gain
+                losses[j] = loss
+                continue
+            loss /= period
+            gain /= period
+            gains[j] = gain
+            losses[j] = loss
+            total = gain + loss
+            if -1e-8 < total < 1e-8:
+                out[i, j] = 0.0
+            else:
+                out[i, j] = 100.0 * (gain / total)
+    return out
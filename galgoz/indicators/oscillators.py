@@ -1,11 +1,18 @@
-from ..indicators.base import Indicator
+from ..indicators.base import Indicator, as_float64
+from typing import Sequence
+
 import pandas as pd
 import numpy as np
 from talib import WILLR
 from talib import RSI as rsi
+from .batch import batch_rsi, batch_wpr
+from .kernels import qqe_slow_line
+from .pipeline import op
+from .streaming import EWMMean, QQESlowLine, RollingWindow, WilderRSI
 
 
 class WPR(Indicator):
+    columns = ("mid_h", "mid_l", "mid_c")
     row: int = 2
     window: int = 14
 
@@ -19,21 +26,40 @@ class WPR(Indicator):
     def __str__(self):
         return f"Williams %R (window={self.window})"
 
+    @classmethod
+    def batch(
+        cls, data: pd.DataFrame, window: int | Sequence[int] = window
+    ) -> pd.DataFrame:
+        """
+        Williams %R for every window (bars x windows), see `galgoz.indicators.batch`.
+        """
+        return batch_wpr(cls._project(data), window)
+
     def run(self):
         res = WILLR(
-            self.data["mid_h"],
-            self.data["mid_l"],
-            self.data["mid_c"],
+            as_float64(self.data["mid_h"]),
+            as_float64(self.data["mid_l"]),
+            as_float64(self.data["mid_c"]),
             timeperiod=self.window,
         )
         self.output = pd.Series(res, index=self.data.index, name="WPR")
 
-    def update(self, new_data: pd.DataFrame | None):
-        self.data = new_data
-        self.run()
+    def _new_state(self):
+        return RollingWindow(self.window), RollingWindow(self.window)
+
+    def _step(self, bar):
+        highs, lows = self._state
+        highs.update(bar.mid_h)
+        lows.update(bar.mid_l)
+        if not highs.full:
+            return np.nan
+        highest, lowest = highs.max(), lows.min()
+        diff = (highest - lowest) / (-100.0)
+        return (highest - bar.mid_c) / diff if diff != 0 else 0.0
 
 
 class RSI(Indicator):
+    columns = ("mid_c",)
     row: int = 2
     window: int = 14
 
@@ -47,19 +73,34 @@ class RSI(Indicator):
     def __str__(self):
         return f"Relative Strength Index (window={self.window})"
 
+    @classmethod
+    def batch(
+        cls, data: pd.DataFrame, window: int | Sequence[int] = window
+    ) -> pd.DataFrame:
+        """
+        RSI for every window (bars x windows) in one pass over the bars, see `galgoz.indicators.batch`.
+        """
+        return batch_rsi(cls._project(data), window)
+
     def run(self):
         res = rsi(
-            self.data.mid_c,
+            as_float64(self.data.mid_c),
             timeperiod=self.window,
         )
         self.output = pd.Series(res, index=self.data.index, name="RSI")
 
-    def update(self, new_data: pd.DataFrame | None):
-        self.data = new_data
-        self.run()
+    def _new_state(self):
+        return WilderRSI(self.window)
+
+    def _graph(self, pipeline):
+        return pipeline.node("rename", pipeline.rsi(self.window), name="RSI")
+
+    def _step(self, bar):
+        return self._state.update(bar.mid_c)
 
 
 class QQE(Indicator):
+    columns = ("mid_c",)
     row: int = 2
     length: int = 8
     smooth: int = 1
@@ -96,51 +137,60 @@ class QQE(Indicator):
         )
         self.output = result[["qqe_fast", "qqe_slow"]]
 
-    def update(self, new_data: pd.DataFrame | None):
-        self.data = new_data
-        self.run()
+    def signals(self) -> pd.Series:
+        """
+        Returns 1 when the fast line crosses above the slow line, -1 when it crosses below and 0 otherwise.
+        """
+        above = (self.output["qqe_fast"] > self.output["qqe_slow"]).to_numpy(dtype=np.int64)
+        crosses = np.zeros_like(above)
+        crosses[1:] = np.sign(np.diff(above))
+        return pd.Series(crosses, index=self.data.index, name="signals")
+
+    def _graph(self, pipeline):
+        fast = pipeline.node("ewm_mean", pipeline.rsi(self.length), span=self.smooth)
+        return pipeline.node("qqe_lines", fast, length=self.length, factor=self.factor)
+
+    def _new_state(self):
+        return (
+            WilderRSI(self.length),
+            EWMMean(self.smooth),
+            QQESlowLine(self.length, self.factor),
+        )
+
+    def _step(self, bar):
+        rsi_state, ewm_state, slow_state = self._state
+        fast = ewm_state.update(rsi_state.update(bar.mid_c))
+        return fast, slow_state.update(fast)
 
 
 def qqe(
     data: pd.DataFrame, length: int = 8, smooth: int = 1, factor: float = 1.618
 ) -> pd.DataFrame:
-    df = data.copy()
-    _rsi = rsi(df["mid_c"].to_numpy(dtype=np.float64), timeperiod=length)
-    _qqe_fast = pd.Series(data=_rsi, index=df.index).ewm(span=smooth).mean().to_numpy()
-    df["qqe_fast"] = _qqe_fast
-    rsi_delta = df["qqe_fast"].diff().abs().values
-    wmma = np.zeros(len(df))
-    atr_rsi = np.zeros(len(df))
-    for i in range(1, len(df)):
-        wmma[i] = rsi_delta[i] / length + (1 - 1 / length) * (
-            wmma[i - 1] if not np.isnan(wmma[i - 1]) else 0
-        )
-        atr_rsi[i] = wmma[i] / length + (1 - 1 / length) * (
-            atr_rsi[i - 1] if not np.isnan(atr_rsi[i - 1]) else 0
-        )
-    qqe_up = _qqe_fast + atr_rsi * factor
-    qqe_down = _qqe_fast - atr_rsi * factor
-
-    qqe_slow = np.zeros(len(df))
-    for i in range(1, len(df)):
-        if qqe_up[i] < (qqe_slow[i - 1] if not np.isnan(qqe_slow[i - 1]) else 0):
-            qqe_slow[i] = qqe_up[i]
-        elif _qqe_fast[i] > (
-            qqe_slow[i - 1] if not np.isnan(qqe_slow[i - 1]) else 0
-        ) and _qqe_fast[i - 1] < (
-            qqe_slow[i - 1] if not np.isnan(qqe_slow[i - 1]) else 0
-        ):
-            qqe_slow[i] = qqe_down[i]
-        elif qqe_down[i] > (qqe_slow[i - 1] if not np.isnan(qqe_slow[i - 1]) else 0):
-            qqe_slow[i] = qqe_down[i]
-        elif _qqe_fast[i] < (
-            qqe_slow[i - 1] if not np.isnan(qqe_slow[i - 1]) else 0
-        ) and _qqe_fast[i - 1] > (
-            qqe_slow[i - 1] if not np.isnan(qqe_slow[i - 1]) else 0
-        ):
-            qqe_slow[i] = qqe_up[i]
-        else:
-            qqe_slow[i] = qqe_slow[i - 1]
-
-    df["qqe_slow"] = qqe_slow
-    return df
+    """
+    Calculate the QQE fast and slow lines from the 'mid_c' column.
+
+    Args:
+        data (pd.DataFrame): Candle data with a 'mid_c' column. It is not copied nor modified.
+        length (int, optional): The RSI length. Defaults to 8.
+        smooth (int, optional): The EWM span used to smooth the RSI. Defaults to 1.
+        factor (float, optional): The volatility multiplier of the slow line. Defaults to 1.618.
+
+    Returns:
+        pd.DataFrame: The 'qqe_fast' and 'qqe_slow' columns, with the index of data.
+    """
+    _rsi = rsi(as_float64(data["mid_c"]), timeperiod=length)
+    _qqe_fast = pd.Series(data=_rsi).ewm(span=smooth).mean().to_numpy()
+    _qqe_slow = qqe_slow_line(_qqe_fast, length, factor)
+    return pd.DataFrame(
+        {"qqe_fast": _qqe_fast, "qqe_slow": _qqe_slow}, index=data.index, copy=False
+    )
+
+
+@op
+def qqe_lines(qqe_fast: pd.Series, length: int, factor: float) -> pd.DataFrame:
+    # Pipeline operation: the QQE output from the smoothed RSI
+    _qqe_fast = qqe_fast.to_numpy(dtype=np.float64)
+    _qqe_slow = qqe_slow_line(_qqe_fast, length, factor)
+    return pd.DataFrame(
+        {"qqe_fast": _qqe_fast, "qqe_slow": _qqe_slow}, index=qqe_fast.index, copy=False
+    )
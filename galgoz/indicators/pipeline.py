@@ -0,0 +1,229 @@
+"""
+Lazy evaluation of several indicators on the same data with shared intermediate results.
+
+Indicators are declared as nodes of a graph (see `Indicator._graph`). Nodes are keyed by their operation, inputs
+and parameters, so building blocks such as the RSI of 'mid_c', the ATR or a moving average are declared once and
+evaluated at most once, however many indicators use them. Nothing is computed until an output is requested.
+
+Example:
+    pipeline = Pipeline(data=df)
+    for indicator in (RSI(None), QQE(None, length=14), SuperTrend(None), HMA(None)):
+        pipeline.add(indicator)
+    pipeline.run()  # Sets the data and output of every indicator
+"""
+
+from collections import Counter
+from typing import Any, Callable, NamedTuple, Optional
+
+import numpy as np
+import pandas as pd
+import talib
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr
+
+from .cache import PLOT_FIELDS
+
+OPS: dict[str, Callable] = {}
+
+
+def op(func: Callable) -> Callable:
+    """
+    Registers a pipeline operation under its function name.
+
+    Operations without inputs (sources) are called with the pipeline data and their parameters, the others with
+    the values of their inputs and their parameters.
+    """
+    OPS[func.__name__] = func
+    return func
+
+
+class Node(NamedTuple):
+    """
+    A lazily evaluated computation. Nodes are hashable, equal nodes share their result.
+    """
+
+    op: str
+    inputs: tuple = ()
+    params: tuple = ()
+
+
+@op
+def column(data: pd.DataFrame, name: str) -> pd.Series:
+    return data[name]
+
+
+@op
+def run_indicator(data: pd.DataFrame, cls: type, params: tuple) -> pd.Series | pd.DataFrame:
+    # Fallback for indicators without a graph: run the indicator itself
+    return cls(data, **dict(params)).output
+
+
+@op
+def rsi(close: pd.Series, window: int) -> pd.Series:
+    res = talib.RSI(close.to_numpy(dtype=np.float64), timeperiod=window)
+    return pd.Series(res, index=close.index)
+
+
+@op
+def atr(high: pd.Series, low: pd.Series, close: pd.Series, period: int) -> pd.Series:
+    res = talib.ATR(
+        high.to_numpy(dtype=np.float64),
+        low.to_numpy(dtype=np.float64),
+        close.to_numpy(dtype=np.float64),
+        period,
+    )
+    return pd.Series(res, index=close.index)
+
+
+@op
+def medprice(high: pd.Series, low: pd.Series) -> pd.Series:
+    res = talib.MEDPRICE(high.to_numpy(dtype=np.float64), low.to_numpy(dtype=np.float64))
+    return pd.Series(res, index=high.index)
+
+
+@op
+def rolling_mean(values: pd.Series, window: int) -> pd.Series:
+    return values.rolling(window=window).mean()
+
+
+@op
+def wma(values: pd.Series, window: int) -> pd.Series:
+    res = talib.WMA(values.to_numpy(dtype=np.float64), timeperiod=window)
+    return pd.Series(res, index=values.index, name=values.name)
+
+
+@op
+def ewm_mean(values: pd.Series, span: float) -> pd.Series:
+    return values.ewm(span=span).mean()
+
+
+@op
+def linear(a: pd.Series, b: pd.Series, wa: float, wb: float) -> pd.Series:
+    return wa * a + wb * b
+
+
+@op
+def rename(values: pd.Series, name: str) -> pd.Series:
+    return values.rename(name)
+
+
+class Pipeline(BaseModel):
+    """
+    Graph of indicator nodes evaluated lazily on one DataFrame.
+
+    Attributes:
+        data (pd.DataFrame): The candles shared by all the indicators.
+        evaluations (Counter): Number of evaluations per operation, e.g. {"rsi": 1, "atr": 2}.
+    """
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    data: Optional[pd.DataFrame] = None
+    evaluations: Counter = Field(default_factory=Counter)
+
+    _values: dict = PrivateAttr(default_factory=dict)
+    _indicators: list = PrivateAttr(default_factory=list)
+
+    def node(self, op: str, *inputs: Node, **params) -> Node:
+        """
+        Declares a node. Nothing is evaluated.
+
+        Args:
+            op (str): Name of a registered operation (see `op`).
+            *inputs (Node): Nodes whose values are passed to the operation.
+            **params: Hashable parameters of the operation.
+
+        Returns:
+            Node: The node, equal to any node declared with the same arguments.
+        """
+        if op not in OPS:
+            raise ValueError(f"Unknown pipeline operation {op}.")
+        return Node(op, inputs, tuple(sorted(params.items())))
+
+    def column(self, name: str) -> Node:
+        return self.node("column", name=name)
+
+    def rsi(self, window: int, source: str = "mid_c") -> Node:
+        return self.node("rsi", self.column(source), window=window)
+
+    def atr(self, period: int) -> Node:
+        high, low, close = (self.column(name) for name in ("mid_h", "mid_l", "mid_c"))
+        return self.node("atr", high, low, close, period=period)
+
+    def medprice(self) -> Node:
+        return self.node("medprice", self.column("mid_h"), self.column("mid_l"))
+
+    def rolling_mean(self, window: int, source: Node | str = "mid_c") -> Node:
+        if isinstance(source, str):
+            source = self.column(source)
+        return self.node("rolling_mean", source, window=window)
+
+    def wma(self, window: int, source: Node | str = "mid_c") -> Node:
+        if isinstance(source, str):
+            source = self.column(source)
+        return self.node("wma", source, window=window)
+
+    def add(self, indicator) -> Node:
+        """
+        Declares an indicator and returns the node of its output. Nothing is evaluated.
+        """
+        node = indicator._graph(self)
+        self._indicators.append((indicator, node))
+        return node
+
+    def evaluate(self, node: Node) -> Any:
+        """
+        Returns the value of a node, evaluating it and the inputs it depends on only if they were not evaluated yet.
+        """
+        if node in self._values:
+            return self._values[node]
+        if self.data is None:
+            raise ValueError("The pipeline has no data.")
+        if node.inputs:
+            value = OPS[node.op](*(self.evaluate(i) for i in node.inputs), **dict(node.params))
+        else:
+            value = OPS[node.op](self.data, **dict(node.params))
+        self.evaluations[node.op] += 1
+        self._values[node] = value
+        return value
+
+    def output(self, indicator) -> pd.Series | pd.DataFrame:
+        """
+        Evaluates the output of an indicator added to the pipeline.
+        """
+        for added, node in self._indicators:
+            if added is indicator:
+                return self.evaluate(node)
+        raise ValueError(f"{indicator} was not added to the pipeline.")
+
+    def run(self) -> list:
+        """
+        Evaluates every indicator and sets its data and output, as if run() had been called on each of them.
+
+        Returns:
+            list: The indicators, in the order they were added.
+        """
+        for indicator, node in self._indicators:
+            indicator.data = self.data
+            indicator.output = self.evaluate(node)
+            indicator._state = None
+        return [indicator for indicator, _ in self._indicators]
+
+    def update(self, data: pd.DataFrame):
+        """
+        Replaces the data and forgets the evaluated values. The declared indicators are kept.
+        """
+        self.data = data
+        self._values.clear()
+
+
+def default_graph(indicator, pipeline: Pipeline) -> Node:
+    """
+    Graph of an indicator without shared building blocks: a single node running the indicator on the data.
+    """
+    cls = type(indicator)
+    params = tuple(
+        (name, getattr(indicator, name))
+        for name in sorted(cls.model_fields)
+        if name not in PLOT_FIELDS
+    )
+    return pipeline.node("run_indicator", cls=cls, params=params)
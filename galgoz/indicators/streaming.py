@@ -0,0 +1,346 @@
+"""
+Incremental state objects used by `Indicator.extend` to update indicators one bar at a time.
+
+Each object consumes one value per bar and returns the indicator value for that bar, replicating the
+arithmetic of the batch implementation (TA-Lib or pandas) so a streamed series matches a full `run()`.
+"""
+
+import functools
+import math
+from collections import deque
+
+import numpy as np
+
+
+class WilderRSI:
+    """
+    RSI with Wilder smoothing, as computed by `talib.RSI`.
+    """
+
+    def __init__(self, period: int):
+        self.period = period
+        self.count = 0
+        self.prev_value = math.nan
+        self.avg_gain = 0.0
+        self.avg_loss = 0.0
+
+    def update(self, value: float) -> float:
+        self.count += 1
+        if self.count == 1:
+            self.prev_value = value
+            return math.nan
+        diff = value - self.prev_value
+        self.prev_value = value
+        if self.count <= self.period + 1:
+            if diff < 0:
+                self.avg_loss -= diff
+            else:
+                self.avg_gain += diff
+            if self.count < self.period + 1:
+                return math.nan
+            self.avg_loss /= self.period
+            self.avg_gain /= self.period
+        else:
+            self.avg_loss *= self.period - 1
+            self.avg_gain *= self.period - 1
+            if diff < 0:
+                self.avg_loss -= diff
+            else:
+                self.avg_gain += diff
+            self.avg_loss /= self.period
+            self.avg_gain /= self.period
+        total = self.avg_gain + self.avg_loss
+        if -1e-8 < total < 1e-8:
+            return 0.0
+        return 100.0 * (self.avg_gain / total)
+
+
+class WilderATR:
+    """
+    Average True Range with Wilder smoothing, as computed by `talib.ATR`.
+    """
+
+    def __init__(self, period: int):
+        self.period = period
+        self.count = 0
+        self.prev_close = math.nan
+        self.atr = 0.0
+
+    def update(self, high: float, low: float, close: float) -> float:
+        self.count += 1
+        prev_close = self.prev_close
+        self.prev_close = close
+        if self.count == 1:
+            return math.nan
+        true_range = high - low
+        true_range = max(true_range, abs(prev_close - high), abs(prev_close - low))
+        if self.count <= self.period + 1:
+            self.atr += true_range
+            if self.count < self.period + 1:
+                return math.nan
+            self.atr /= self.period
+            return self.atr
+        self.atr *= self.period - 1
+        self.atr += true_range
+        self.atr /= self.period
+        return self.atr
+
+
+class EWMMean:
+    """
+    Exponentially weighted mean, as computed by `pd.Series.ewm(span=span).mean()` (adjust=True).
+    """
+
+    def __init__(self, span: float):
+        alpha = 2 / (span + 1)
+        self.old_wt_factor = 1 - alpha
+        self.old_wt = 1.0
+        self.weighted = math.nan
+
+    def update(self, value: float) -> float:
+        if self.weighted == self.weighted:
+            self.old_wt *= self.old_wt_factor
+            if value == value:
+                if self.weighted != value:
+                    self.weighted = self.old_wt * self.weighted + value
+                    self.weighted /= self.old_wt + 1.0
+                self.old_wt += 1.0
+        elif value == value:
+            self.weighted = value
+        return self.weighted
+
+
+class RollingWindow:
+    """
+    Fixed-length window over the last values, NaN until it is full.
+    """
+
+    def __init__(self, window: int):
+        self.window = window
+        self.values: deque = deque(maxlen=window)
+
+    def update(self, value: float):
+        self.values.append(value)
+
+    @property
+    def full(self) -> bool:
+        return len(self.values) == self.window
+
+    def mean(self) -> float:
+        if not self.full or any(v != v for v in self.values):
+            return math.nan
+        return math.fsum(self.values) / self.window
+
+    def max(self) -> float:
+        return max(self.values) if self.full else math.nan
+
+    def min(self) -> float:
+        return min(self.values) if self.full else math.nan
+
+
+class WeightedMean:
+    """
+    Weighted moving average (weights 1 to window, the last value weighing most), as computed by `talib.WMA`.
+
+    Each update costs O(1): the new value enters with weight window, then subtracting the plain sum of the
+    window lowers every weight by one and drops the oldest value. The sums are recomputed from the window every
+    window bars, which bounds the rounding errors of long streams at O(1) amortized. Leading NaNs are skipped.
+    """
+
+    def __init__(self, window: int):
+        self.window = window
+        self.divider = window * (window + 1) // 2
+        # The last window - 1 values, with their plain sum and their sum weighted 1 (oldest) to window - 1
+        self.values: deque = deque(maxlen=window - 1)
+        self.plain = 0.0
+        self.weighted = 0.0
+        self.count = 0
+
+    def update(self, value: float) -> float:
+        if self.window == 1:
+            return value
+        if not self.values and value != value:
+            return math.nan
+        if len(self.values) < self.window - 1:
+            self.values.append(value)
+            self.plain += value
+            self.weighted += value * len(self.values)
+            return math.nan
+        total = self.weighted + self.window * value
+        oldest = self.values[0]
+        self.values.append(value)
+        self.count += 1
+        if self.count % self.window:
+            self.weighted = total - (self.plain + value)
+            self.plain += value - oldest
+        else:
+            self.plain = math.fsum(self.values)
+            self.weighted = math.fsum(i * v for i, v in enumerate(self.values, 1))
+        return total / self.divider
+
+
+@functools.lru_cache(maxsize=32)
+def savgol_endpoint_coeffs(window: int, order: int) -> np.ndarray:
+    """
+    Returns the coefficients giving, as a dot product with the last window values (oldest first), the value at
+    the last bar of the polynomial of the given order fitted to them by least squares.
+    """
+    from scipy.signal import savgol_coeffs  # type: ignore
+
+    coeffs = savgol_coeffs(window, order, pos=window - 1, use="dot")
+    coeffs.flags.writeable = False
+    return coeffs
+
+
+class SavgolEndpoint:
+    """
+    Causal Savitzky-Golay estimate of the last bar, as computed by `SG` with causal=True.
+
+    The last window values are kept twice in a buffer of 2 * window values, so that they are always available
+    as a contiguous view and each update costs one dot product of length window.
+    """
+
+    def __init__(self, window: int, order: int):
+        self.window = window
+        self.coeffs = savgol_endpoint_coeffs(window, order)
+        self.buffer = np.zeros(2 * window)
+        self.pos = 0
+        self.count = 0
+
+    def push(self, value: float):
+        """
+        Adds a value without computing the estimate.
+        """
+        self.buffer[self.pos] = value
+        self.buffer[self.pos + self.window] = value
+        self.pos = (self.pos + 1) % self.window
+        self.count += 1
+
+    def update(self, value: float) -> float:
+        self.push(value)
+        if self.count < self.window:
+            return math.nan
+        return float(self.coeffs @ self.buffer[self.pos : self.pos + self.window])
+
+
+class MoneyFlow:
+    """
+    Money Flow Index, as computed by `talib.MFI`.
+    """
+
+    def __init__(self, period: int):
+        self.period = period
+        self.count = 0
+        self.prev_typical = math.nan
+        self.flows: deque = deque(maxlen=period)
+        self.positive = 0.0
+        self.negative = 0.0
+
+    def update(self, high: float, low: float, close: float, volume: float) -> float:
+        self.count += 1
+        typical = (high + low + close) / 3.0
+        diff = typical - self.prev_typical
+        self.prev_typical = typical
+        if self.count == 1:
+            return math.nan
+        if self.count > self.period + 1:
+            positive, negative = self.flows[0]
+            self.positive -= positive
+            self.negative -= negative
+        flow = typical * volume
+        if diff < 0:
+            self.flows.append((0.0, flow))
+            self.negative += flow
+        elif diff > 0:
+            self.flows.append((flow, 0.0))
+            self.positive += flow
+        else:
+            self.flows.append((0.0, 0.0))
+        if self.count < self.period + 1:
+            return math.nan
+        total = self.positive + self.negative
+        if total < 1.0:
+            return 0.0
+        return 100.0 * (self.positive / total)
+
+
+class SuperTrendBands:
+    """
+    SuperTrend final bands state machine (see `kernels.final_bands`), one bar at a time.
+    """
+
+    def __init__(self, period: int, multiplier: float):
+        self.atr = WilderATR(period)
+        self.multiplier = multiplier
+        self.upper = math.nan
+        self.lower = math.nan
+        self.direction = 1
+        self.count = 0
+
+    def update(self, high: float, low: float, close: float) -> tuple:
+        self.count += 1
+        atr = self.atr.update(high, low, close)
+        med_price = (high + low) / 2
+        matr = self.multiplier * atr
+        upper = med_price + matr
+        lower = med_price - matr
+        if self.count == 1:
+            self.upper, self.lower = upper, lower
+            return math.nan, 1, math.nan, math.nan
+
+        if close > self.upper:
+            direction = 1
+        elif close < self.lower:
+            direction = -1
+        else:
+            direction = self.direction
+            if direction > 0 and lower < self.lower:
+                lower = self.lower
+            if direction < 0 and upper > self.upper:
+                upper = self.upper
+        self.upper, self.lower, self.direction = upper, lower, direction
+
+        if direction > 0:
+            return lower, direction, lower, math.nan
+        return upper, direction, math.nan, upper
+
+
+class QQESlowLine:
+    """
+    QQE slow line state machine (see `kernels.qqe_slow_line`), one bar at a time.
+    """
+
+    def __init__(self, length: int, factor: float):
+        self.length = length
+        self.factor = factor
+        self.count = 0
+        self.prev_fast = math.nan
+        self.wmma = 0.0
+        self.atr_rsi = 0.0
+        self.slow = 0.0
+
+    def update(self, fast: float) -> float:
+        self.count += 1
+        prev_fast = self.prev_fast
+        self.prev_fast = fast
+        if self.count == 1:
+            return self.slow
+        length = self.length
+        rsi_delta = abs(fast - prev_fast)
+        prev_wmma = self.wmma if not np.isnan(self.wmma) else 0
+        self.wmma = rsi_delta / length + (1 - 1 / length) * prev_wmma
+        prev_atr_rsi = self.atr_rsi if not np.isnan(self.atr_rsi) else 0
+        self.atr_rsi = self.wmma / length + (1 - 1 / length) * prev_atr_rsi
+
+        qqe_up = fast + self.atr_rsi * self.factor
+        qqe_down = fast - self.atr_rsi * self.factor
+        prev = self.slow if not np.isnan(self.slow) else 0
+        if qqe_up < prev:
+            self.slow = qqe_up
+        elif fast > prev and prev_fast < prev:
+            self.slow = qqe_down
+        elif qqe_down > prev:
+            self.slow = qqe_down
+        elif fast < prev and prev_fast > prev:
+            self.slow = qqe_up
+        return self.slow
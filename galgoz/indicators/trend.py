@@ -1,41 +1,126 @@
+from typing import Sequence
+
 import pandas as pd
 import numpy as np
-from scipy import signal  # type: ignore
-from ..indicators.base import Indicator
+from ..indicators.base import Indicator, as_float64
+from .batch import batch_hma, batch_sg, batch_supertrend, causal_savgol
+from .kernels import final_bands
+from .pipeline import op
+from .streaming import SavgolEndpoint, SuperTrendBands, WeightedMean
 import talib
-from vectorbt import IndicatorFactory as IF  # type: ignore
 
 
 class SG(Indicator):
+    """
+    Savitzky-Golay filter of the close prices.
+
+    By default the whole series is filtered at once, so the last window//2 values are fitted with the values
+    that follow them: the output of past bars changes as new bars arrive. With causal=True, each bar gets the
+    value at that bar of the polynomial fitted to the window ending there, which is what a live run sees; new
+    bars then cost O(window) each and never change past values.
+    """
+
+    columns = ("mid_c",)
     window: int = 250
     order: int = 2
+    causal: bool = False
     line_color: str = "blue"
 
     def __init__(
-        self, data: pd.DataFrame, window: int = window, order: int = order, **kwargs
+        self,
+        data: pd.DataFrame,
+        window: int = window,
+        order: int = order,
+        causal: bool = causal,
+        **kwargs,
     ):
         super().__init__(name="SG", data=data)
         self.window = window
         self.order = order
+        self.causal = causal
         if data is not None:
             self.run()
         self._update_attributes(kwargs)
 
     def __str__(self):
-        return f"Savitzky-Golay Filter (window={self.window}, order={self.order})"
+        causal = ", causal" if self.causal else ""
+        return f"Savitzky-Golay Filter (window={self.window}, order={self.order}{causal})"
+
+    @classmethod
+    def batch(
+        cls,
+        data: pd.DataFrame,
+        window: int | Sequence[int] = window,
+        order: int | Sequence[int] = order,
+        causal: bool = causal,
+    ) -> pd.DataFrame:
+        """
+        Savitzky-Golay filter for every (window, order) combination, see `galgoz.indicators.batch`.
+        """
+        return batch_sg(cls._project(data), window, order, causal)
 
     def run(self):
-        res = signal.savgol_filter(
-            self.data.mid_c.values, window_length=self.window, polyorder=self.order
-        )
+        close = as_float64(self.data.mid_c)
+        if self.causal:
+            res = causal_savgol(close, self.window, self.order)
+        else:
+            from scipy import signal  # type: ignore
+
+            res = signal.savgol_filter(close, window_length=self.window, polyorder=self.order)
         self.output = pd.Series(res, index=self.data.index, name="SG")
 
-    def update(self, new_data: pd.DataFrame | None):
-        self.data = new_data
-        self.run()
+    def extend(self, new_data: pd.DataFrame):
+        """
+        Appends new bars and updates the output incrementally.
+
+        Only the causal filter streams bar by bar: its state holds the last window closes, and each new bar
+        costs O(window) without changing past values. The default filter is not causal: savgol_filter fits the
+        last window//2 values with a polynomial, so new bars change the tail of the output. Only the last window
+        values are recomputed (O(window)) and written to the output buffer. Outputs returned before the call are
+        invalidated: whether their tail is revised depends on the buffer being reallocated, so copy them to keep
+        them.
+        """
+        if self.data is None or self.output is None:
+            self.update(new_data)
+            return
+        if self.causal:
+            if self._state is None:
+                # Only the last window values matter, no need to replay the whole history
+                self._state = self._new_state()
+                for value in as_float64(self.data.mid_c)[-self.window :]:
+                    self._state.push(value)
+            super().extend(new_data)
+            return
+        from scipy import signal  # type: ignore
+
+        new_data = self._project(new_data)
+        n_old = len(self.data)
+        start = max(0, n_old - 2 * self.window)
+        keep = max(0, n_old - self.window)
+        closes = np.concatenate(
+            [as_float64(self.data.mid_c)[start:], new_data.mid_c.to_numpy(dtype=np.float64)]
+        )
+        tail = signal.savgol_filter(closes, window_length=self.window, polyorder=self.order)
+        self._append(new_data, tail[keep - start :], start=keep)
+
+    def _new_state(self):
+        # State of the causal filter, see extend()
+        return SavgolEndpoint(self.window, self.order)
+
+    def _step(self, bar):
+        return self._state.update(bar.mid_c)
 
 
 class HMA(Indicator):
+    """
+    Hull Moving Average of the close prices: the weighted moving average over sqrt(window) bars of
+    2 * WMA(window // 2) - WMA(window).
+
+    The weighted moving averages (`talib.WMA`) update their weighted sums from the plain sums of their windows,
+    so a full run is O(bars) and each streamed bar O(1), whatever the window.
+    """
+
+    columns = ("mid_c",)
     window: int = 169
     line_color: str = "blue"
 
@@ -49,18 +134,49 @@ class HMA(Indicator):
     def __str__(self):
         return f"Hull Moving Average (window={self.window})"
 
+    @classmethod
+    def batch(
+        cls, data: pd.DataFrame, window: int | Sequence[int] = window
+    ) -> pd.DataFrame:
+        """
+        HMA for every window (bars x windows), with the weighted moving averages shared by several windows
+        computed once, see `galgoz.indicators.batch`.
+        """
+        return batch_hma(cls._project(data), window)
+
     def run(self):
-        wma1 = 2 * self.data.mid_c.rolling(window=self.window // 2).mean()
-        wma2 = self.data.mid_c.rolling(window=self.window).mean()
-        diff = wma1 - wma2
-        self.output = diff.rolling(window=int(np.sqrt(self.window))).mean()
+        close = self.data.mid_c
+        res = hull_moving_average(as_float64(close), self.window)
+        self.output = pd.Series(res, index=self.data.index, name=close.name)
 
-    def update(self, new_data: pd.DataFrame | None):
-        self.data = new_data
-        self.run()
+    def _graph(self, pipeline):
+        half = pipeline.wma(self.window // 2)
+        full = pipeline.wma(self.window)
+        diff = pipeline.node("linear", half, full, wa=2, wb=-1)
+        return pipeline.wma(int(np.sqrt(self.window)), source=diff)
+
+    def _new_state(self):
+        return (
+            WeightedMean(self.window // 2),
+            WeightedMean(self.window),
+            WeightedMean(int(np.sqrt(self.window))),
+        )
+
+    def _step(self, bar):
+        half, full, diff = self._state
+        return diff.update(2 * half.update(bar.mid_c) - full.update(bar.mid_c))
+
+
+def hull_moving_average(close: np.ndarray, window: int) -> np.ndarray:
+    """
+    Hull Moving Average of a float64 array, NaN until window + sqrt(window) - 2 valid values were seen.
+    """
+    diff = 2 * talib.WMA(close, timeperiod=window // 2) - talib.WMA(close, timeperiod=window)
+    return talib.WMA(diff, timeperiod=int(np.sqrt(window)))
 
 
 class SuperTrend(Indicator):
+    columns = ("mid_h", "mid_l", "mid_c")
     atr_period: int = 14
     multiplier: float = 6.5
     line_color: str = "green"
@@ -84,6 +200,19 @@ class SuperTrend(Indicator):
             f"Supertrend (ATR period={self.atr_period}, multiplier={self.multiplier})"
         )
 
+    @classmethod
+    def batch(
+        cls,
+        data: pd.DataFrame,
+        atr_period: int | Sequence[int] = atr_period,
+        multiplier: float | Sequence[float] = multiplier,
+    ) -> pd.DataFrame:
+        """
+        SuperTrend for every (atr_period, multiplier) combination, with one ATR per period, see
+        `galgoz.indicators.batch`.
+        """
+        return batch_supertrend(cls._project(data), atr_period, multiplier)
+
     def run(self):
         st = _supertrend(
             self.data,
@@ -93,9 +222,29 @@ class SuperTrend(Indicator):
 
         self.output = st[0]
 
-    def update(self, new_data: pd.DataFrame | None):
-        self.data = new_data
-        self.run()
+    def signals(self) -> pd.Series:
+        """
+        Returns 1 when the trend turns up, -1 when it turns down and 0 otherwise.
+        """
+        direction = _supertrend(self.data, self.atr_period, self.multiplier)[1].to_numpy()
+        flips = np.zeros_like(direction)
+        flips[1:] = np.where(direction[1:] != direction[:-1], direction[1:], 0)
+        return pd.Series(flips, index=self.data.index, name="signals")
+
+    def _graph(self, pipeline):
+        return pipeline.node(
+            "supertrend_trend",
+            pipeline.column("mid_c"),
+            pipeline.medprice(),
+            pipeline.atr(self.atr_period),
+            multiplier=self.multiplier,
+        )
+
+    def _new_state(self):
+        return SuperTrendBands(self.atr_period, self.multiplier)
+
+    def _step(self, bar):
+        return self._state.update(bar.mid_h, bar.mid_l, bar.mid_c)[0]
 
 
 def _supertrend(data, atr_period=14, multiplier=6.5):
@@ -124,24 +273,25 @@ def supertrend(
     Returns:
         pd.Series: The Supertrend indicator.
     """
-    # USe squeeze to convert 2D array to 1D. This is necessary for talib and vectorbt to work well together
-    high_ = pd.Series(np.squeeze(high))
-    low_ = pd.Series(np.squeeze(low))
-    close_ = pd.Series(np.squeeze(close))
-    avg_price = talib.MEDPRICE(high_.values.astype(float), low_.values.astype(float))
-    atr = talib.ATR(
-        high_.values.astype(float),
-        low_.values.astype(float),
-        close_.values.astype(float),
-        period,
+    high_, low_, close_ = as_float64(high), as_float64(low), as_float64(close)
+    index = close.index if isinstance(close, (pd.Series, pd.DataFrame)) else None
+    upper, lower = get_basic_bands(
+        talib.MEDPRICE(high_, low_), talib.ATR(high_, low_, close_, period), multiplier
     )
-    upper, lower = get_basic_bands(avg_price, atr, multiplier)
-    upper = pd.Series(upper, index=close_.index)
-    lower = pd.Series(lower, index=close_.index)
+    close_ = pd.Series(close_, index=index, copy=False)
     trend, direction, long_, short = get_final_bands(close_, upper, lower)
     return trend, direction, long_, short
 
 
+@op
+def supertrend_trend(
+    close: pd.Series, med_price: pd.Series, atr: pd.Series, multiplier: float
+) -> pd.Series:
+    # Pipeline operation: the SuperTrend output from the shared MEDPRICE and ATR
+    upper, lower = get_basic_bands(med_price.to_numpy(), atr.to_numpy(), multiplier)
+    return get_final_bands(close, upper, lower)[0]
+
+
 def get_basic_bands(med_price, atr, multiplier):
     matr = multiplier * atr
     upper = med_price + matr
@@ -150,26 +300,15 @@ def get_basic_bands(med_price, atr, multiplier):
 
 
 def get_final_bands(close, upper, lower):
-    trend = pd.Series(np.full(close.shape, np.nan), index=close.index)
-    dir_ = pd.Series(np.full(close.shape, 1), index=close.index)
-    long_ = pd.Series(np.full(close.shape, np.nan), index=close.index)
-    short = pd.Series(np.full(close.shape, np.nan), index=close.index)
-
-    for i in range(1, close.shape[0]):
-        if close.iloc[i] > upper.iloc[i - 1]:
-            dir_.iloc[i] = 1
-        elif close.iloc[i] < lower.iloc[i - 1]:
-            dir_.iloc[i] = -1
-        else:
-            dir_.iloc[i] = dir_.iloc[i - 1]
-            if dir_.iloc[i] > 0 and lower.iloc[i] < lower.iloc[i - 1]:
-                lower.iloc[i] = lower.iloc[i - 1]
-            if dir_.iloc[i] < 0 and upper.iloc[i] > upper.iloc[i - 1]:
-                upper.iloc[i] = upper.iloc[i - 1]
-
-        if dir_.iloc[i] > 0:
-            trend.iloc[i] = long_.iloc[i] = lower.iloc[i]
-        else:
-            trend.iloc[i] = short.iloc[i] = upper.iloc[i]
-
-    return trend, dir_, long_, short
+    index = close.index
+    trend, dir_, long_, short = final_bands(
+        np.asarray(close, dtype=np.float64),
+        np.asarray(upper, dtype=np.float64),
+        np.asarray(lower, dtype=np.float64),
+    )
+    return (
+        pd.Series(trend, index=index),
+        pd.Series(dir_, index=index),
+        pd.Series(long_, index=index),
+        pd.Series(short, index=index),
+    )
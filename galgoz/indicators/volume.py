@@ -1,9 +1,14 @@
+from typing import Sequence
+
 import pandas as pd
-from ..indicators.base import Indicator
+from ..indicators.base import Indicator, as_float64
 from talib import MFI as mfi
+from .batch import batch_mfi
+from .streaming import MoneyFlow
 
 
 class MFI(Indicator):
+    columns = ("mid_h", "mid_l", "mid_c", "volume")
     row: int = 2
     window: int = 14
 
@@ -17,12 +22,27 @@ class MFI(Indicator):
     def __str__(self):
         return f"Money Flow Index (window={self.window})"
 
+    @classmethod
+    def batch(
+        cls, data: pd.DataFrame, window: int | Sequence[int] = window
+    ) -> pd.DataFrame:
+        """
+        Money Flow Index for every window (bars x windows), see `galgoz.indicators.batch`.
+        """
+        return batch_mfi(cls._project(data), window)
+
     def run(self):
         res = mfi(
-            self.data["mid_h"],
-            self.data["mid_l"],
-            self.data["mid_c"],
-            self.data["volume"],
+            as_float64(self.data["mid_h"]),
+            as_float64(self.data["mid_l"]),
+            as_float64(self.data["mid_c"]),
+            as_float64(self.data["volume"]),
             timeperiod=self.window,
         )
         self.output = pd.Series(res, index=self.data.index, name="MFI")
+
+    def _new_state(self):
+        return MoneyFlow(self.window)
+
+    def _step(self, bar):
+        return self._state.update(bar.mid_h, bar.mid_l, bar.mid_c, bar.volume)
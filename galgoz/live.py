@@ -0,0 +1,239 @@
+import threading
+import time
+from typing import Any, Callable, Optional
+
+import pandas as pd
+import requests
+import oandapyV20.endpoints.pricing as pricing  # type: ignore
+from oandapyV20.exceptions import StreamTerminated, V20Error  # type: ignore
+from pydantic import BaseModel, ConfigDict, PrivateAttr
+
+from .decoder import PRICE_COMPONENTS, decode_candles
+from .indicators.base import Indicator
+from .utils import candle_end, candle_start
+
+
+class CandleAggregator(BaseModel):
+    """
+    Aggregates price ticks into candles of a given granularity, with the OANDA candle alignment.
+
+    Candles have the columns of `decode_candles`: 'complete', 'volume' (number of ticks) and the bid, mid and
+    ask OHLC prices, and are named by their start time.
+
+    Attributes:
+        granularity (str): The candle granularity (e.g., "M5").
+    """
+
+    granularity: str = "M1"
+
+    _bar: Optional[dict] = PrivateAttr(default=None)
+    _start: Optional[pd.Timestamp] = PrivateAttr(default=None)
+    _end: Optional[pd.Timestamp] = PrivateAttr(default=None)
+
+    def update(self, time: pd.Timestamp, bid: float, ask: float) -> list:
+        """
+        Adds a tick and returns the candles it updated, as (candle, complete) tuples.
+
+        A tick beyond the current candle closes it, so the list can hold the completed candle and the new one.
+        """
+        updated = self.flush(time)
+        if self._bar is None:
+            self._start = candle_start(time, self.granularity)
+            self._end = candle_end(self._start, self.granularity)
+            self._bar = {"complete": 0, "volume": 0}
+            for component in PRICE_COMPONENTS:
+                for field in "ohlc":
+                    self._bar[f"{component}_{field}"] = float("nan")
+        bar = self._bar
+        bar["volume"] += 1
+        for component, price in (("bid", bid), ("mid", (bid + ask) / 2), ("ask", ask)):
+            if bar["volume"] == 1:
+                bar[f"{component}_o"] = bar[f"{component}_h"] = bar[f"{component}_l"] = price
+            else:
+                bar[f"{component}_h"] = max(bar[f"{component}_h"], price)
+                bar[f"{component}_l"] = min(bar[f"{component}_l"], price)
+            bar[f"{component}_c"] = price
+        updated.append((self._candle(), False))
+        return updated
+
+    def flush(self, time: pd.Timestamp) -> list:
+        """
+        Closes the current candle if `time` is at or beyond its end, and returns it as [(candle, True)].
+        """
+        if self._bar is None or time < self._end:
+            return []
+        self._bar["complete"] = 1
+        candle = self._candle()
+        self._bar = None
+        return [(candle, True)]
+
+    def reset(self):
+        """
+        Drops the candle being built (e.g. after a disconnection, when ticks may have been missed).
+        """
+        self._bar = None
+
+    def _candle(self) -> pd.Series:
+        return pd.Series(self._bar, name=self._start)
+
+
+class PriceStream(BaseModel):
+    """
+    Live candles built from the OANDA pricing stream.
+
+    Ticks are aggregated into candles of `granularity` for each instrument. Completed candles are appended to the
+    subscribed indicators and, with partial candles, passed to the subscribed callbacks. A candle is completed by
+    the first tick or heartbeat (sent every 5 seconds by OANDA) past its end, which bounds the latency.
+    After a disconnection the stream reconnects and back-fills the candles missed meanwhile with `fetch_candles`.
+
+    Attributes:
+        gz (Any): The Galgoz instance providing the API client, the account ID and `fetch_candles`.
+        instruments (list[str]): Instruments to stream.
+        granularity (str): Candle granularity. Default is "M1".
+        reconnect_delay (float): Seconds to wait before reconnecting. Default is 1.
+        max_reconnects (int): Maximum number of reconnections. Default is None (unlimited).
+        backfill (bool): Whether missed candles are fetched after reconnecting. Default is True.
+    """
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    gz: Any
+    instruments: list[str]
+    granularity: str = "M1"
+    reconnect_delay: float = 1.0
+    max_reconnects: Optional[int] = None
+    backfill: bool = True
+
+    _aggregators: dict = PrivateAttr(default_factory=dict)
+    _callbacks: dict = PrivateAttr(default_factory=dict)
+    _indicators: dict = PrivateAttr(default_factory=dict)
+    _last_complete: dict = PrivateAttr(default_factory=dict)
+    _backfill_pending: bool = PrivateAttr(default=False)
+    _stop: threading.Event = PrivateAttr(default_factory=threading.Event)
+    _thread: Optional[threading.Thread] = PrivateAttr(default=None)
+
+    def model_post_init(self, __context):
+        for instrument in self.instruments:
+            self._aggregators[instrument] = CandleAggregator(granularity=self.granularity)
+            self._callbacks[instrument] = []
+            self._indicators[instrument] = []
+
+    def subscribe(
+        self,
+        instrument: str,
+        callback: Optional[Callable[[str, pd.Series, bool], Any]] = None,
+        indicator: Optional[Indicator] = None,
+    ):
+        """
+        Subscribes a callback and/or an indicator to the candles of an instrument.
+
+        Args:
+            instrument (str): One of the streamed instruments.
+            callback (Callable): Called as callback(instrument, candle, complete) for every partial and completed candle.
+            indicator (Indicator): Indicator whose `append` is called with every completed candle.
+        """
+        if callback is not None:
+            self._callbacks[instrument].append(callback)
+        if indicator is not None:
+            self._indicators[instrument].append(indicator)
+
+    def start(self):
+        """
+        Runs the stream in a background thread.
+        """
+        self._stop.clear()
+        self._thread = threading.Thread(target=self.run, daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None):
+        """
+        Stops the stream. It takes effect on the next message (at most one heartbeat interval).
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def run(self):
+        """
+        Consumes the pricing stream until `stop` is called, reconnecting on errors.
+        """
+        reconnects = 0
+        while not self._stop.is_set():
+            try:
+                self._consume()
+            except (StreamTerminated, V20Error, requests.ConnectionError, requests.Timeout):
+                pass
+            if self._stop.is_set():
+                break
+            if self.max_reconnects is not None and reconnects >= self.max_reconnects:
+                break
+            reconnects += 1
+            for aggregator in self._aggregators.values():
+                aggregator.reset()
+            self._backfill_pending = self.backfill
+            time.sleep(self.reconnect_delay)
+
+    def _consume(self):
+        r = pricing.PricingStream(
+            accountID=self.gz.account_id,
+            params={"instruments": ",".join(self.instruments)},
+        )
+        for message in self.gz.client.request(r):
+            if self._stop.is_set():
+                return
+            self.on_message(message)
+
+    def on_message(self, message: dict):
+        """
+        Processes a message of the pricing stream (PRICE or HEARTBEAT).
+        """
+        now = pd.Timestamp(message["time"])
+        if now.tz is None:
+            now = now.tz_localize("UTC")
+        if self._backfill_pending:
+            self._backfill_pending = False
+            self._backfill(now)
+        if message.get("type") == "PRICE":
+            instrument = message["instrument"]
+            bid = float(message["bids"][0]["price"])
+            ask = float(message["asks"][0]["price"])
+            for candle, complete in self._aggregators[instrument].update(now, bid, ask):
+                self._dispatch(instrument, candle, complete)
+        for instrument, aggregator in self._aggregators.items():
+            for candle, complete in aggregator.flush(now):
+                self._dispatch(instrument, candle, complete)
+
+    def _dispatch(self, instrument: str, candle: pd.Series, complete: bool):
+        if complete:
+            last = self._last_complete.get(instrument)
+            if last is not None and candle.name <= last:
+                return
+            self._last_complete[instrument] = candle.name
+            for indicator in self._indicators[instrument]:
+                indicator.append(candle)
+        for callback in self._callbacks[instrument]:
+            callback(instrument, candle, complete)
+
+    def _backfill(self, now: pd.Timestamp):
+        """
+        Fetches the candles completed between the last completed candle of each instrument and now.
+        """
+        for instrument in self.instruments:
+            last = self._last_complete.get(instrument)
+            if last is None:
+                continue
+            gz = self.gz.model_copy(update={"instrument": instrument})
+            try:
+                candles = gz.fetch_candles(
+                    granularity=self.granularity,
+                    price="MBA",
+                    date_from=last.strftime("%Y-%m-%dT%H:%M:%SZ"),
+                    date_to=now.ceil("s").strftime("%Y-%m-%dT%H:%M:%SZ"),
+                )
+            except (V20Error, requests.ConnectionError, requests.Timeout):
+                continue
+            df = decode_candles(candles)
+            for start, row in df[df["complete"]].iterrows():
+                candle = row.to_dict()
+                candle["complete"] = 1
+                self._dispatch(instrument, pd.Series(candle, name=start), True)
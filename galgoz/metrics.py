@@ -0,0 +1,263 @@
+"""
+Timers and counters around the hot paths (API requests, decoding, indicators and plotting), reported to pluggable
+sinks. Metrics are disabled until a sink is added, and then cost a single check per instrumented call.
+
+    from galgoz.metrics import METRICS, InMemorySink
+
+    sink = METRICS.add_sink(InMemorySink())
+    gz.candles_df(granularity="H4", count=500)
+    print(sink.summary())
+"""
+
+import functools
+import logging
+import re
+import threading
+import time
+from contextlib import nullcontext
+from typing import Any, Callable
+
+import pandas as pd
+from pydantic import BaseModel, Field, PrivateAttr
+
+
+class MetricsSink(BaseModel):
+    """
+    Receives the measurements. Subclasses override `timing` and `count`.
+    """
+
+    def timing(self, name: str, seconds: float, tags: dict):
+        """
+        Records a duration in seconds.
+        """
+
+    def count(self, name: str, value: float, tags: dict):
+        """
+        Adds value to a counter.
+        """
+
+
+class LoggingSink(MetricsSink):
+    """
+    Logs every measurement.
+
+    Attributes:
+        logger (str): Name of the logger. Default is "galgoz.metrics".
+        level (int): Logging level of the messages. Default is logging.INFO.
+    """
+
+    logger: str = "galgoz.metrics"
+    level: int = logging.INFO
+
+    def timing(self, name: str, seconds: float, tags: dict):
+        logging.getLogger(self.logger).log(self.level, "%s%s %.3f ms", name, _format_tags(tags), seconds * 1000)
+
+    def count(self, name: str, value: float, tags: dict):
+        logging.getLogger(self.logger).log(self.level, "%s%s +%g", name, _format_tags(tags), value)
+
+
+class InMemorySink(MetricsSink):
+    """
+    Aggregates the measurements in memory, by name and tags.
+
+    Attributes:
+        timings (dict): Count, total, min and max seconds by (name, tags).
+        counters (dict): Totals by (name, tags).
+    """
+
+    timings: dict = Field(default_factory=dict)
+    counters: dict = Field(default_factory=dict)
+
+    _lock: Any = PrivateAttr(default_factory=threading.Lock)
+
+    def timing(self, name: str, seconds: float, tags: dict):
+        key = (name, tuple(sorted(tags.items())))
+        with self._lock:
+            stats = self.timings.get(key)
+            if stats is None:
+                self.timings[key] = {"count": 1, "total": seconds, "min": seconds, "max": seconds}
+            else:
+                stats["count"] += 1
+                stats["total"] += seconds
+                stats["min"] = min(stats["min"], seconds)
+                stats["max"] = max(stats["max"], seconds)
+
+    def count(self, name: str, value: float, tags: dict):
+        key = (name, tuple(sorted(tags.items())))
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def summary(self) -> pd.DataFrame:
+        """
+        Returns the timings as a DataFrame with the name, tags, count, total, mean, min and max (in seconds),
+        sorted by total time.
+        """
+        with self._lock:
+            rows = [
+                {"name": name, "tags": _format_tags(dict(tags)), **stats}
+                for (name, tags), stats in self.timings.items()
+            ]
+        if not rows:
+            return pd.DataFrame(columns=["name", "tags", "count", "total", "mean", "min", "max"])
+        summary = pd.DataFrame(rows)
+        summary.insert(4, "mean", summary["total"] / summary["count"])
+        return summary.sort_values("total", ascending=False, ignore_index=True)
+
+    def reset(self):
+        """
+        Clears the measurements.
+        """
+        with self._lock:
+            self.timings.clear()
+            self.counters.clear()
+
+
+class PrometheusSink(InMemorySink):
+    """
+    In-memory sink rendering the Prometheus text exposition format, to serve from a /metrics endpoint.
+
+    Timings are exposed as summaries ('{name}_seconds_count' and '{name}_seconds_sum') and counters as
+    '{name}_total', with dots in the names replaced by underscores.
+
+    Attributes:
+        namespace (str): Prefix of the metric names. Default is "galgoz".
+    """
+
+    namespace: str = "galgoz"
+
+    def render(self) -> str:
+        """
+        Returns the metrics in the Prometheus text format.
+        """
+        lines = []
+        with self._lock:
+            timings = sorted(self.timings.items())
+            counters = sorted(self.counters.items())
+        declared = set()
+        for (name, tags), stats in timings:
+            metric = f"{self._metric_name(name)}_seconds"
+            if metric not in declared:
+                lines.append(f"# TYPE {metric} summary")
+                declared.add(metric)
+            labels = _labels(tags)
+            lines.append(f"{metric}_count{labels} {stats['count']}")
+            lines.append(f"{metric}_sum{labels} {stats['total']:.9f}")
+        for (name, tags), value in counters:
+            metric = f"{self._metric_name(name)}_total"
+            if metric not in declared:
+                lines.append(f"# TYPE {metric} counter")
+                declared.add(metric)
+            lines.append(f"{metric}{_labels(tags)} {value:g}")
+        return "\n".join(lines) + "\n"
+
+    def _metric_name(self, name: str) -> str:
+        return re.sub(r"[^a-zA-Z0-9_]", "_", f"{self.namespace}_{name}")
+
+
+class Timer:
+    """
+    Context manager measuring a block and reporting it to the sinks on exit. Tags can be added inside the block
+    (e.g. a result size); an exception adds an 'error' tag with its type.
+    """
+
+    __slots__ = ("metrics", "name", "tags", "start")
+
+    def __init__(self, metrics: "Metrics", name: str, tags: dict):
+        self.metrics = metrics
+        self.name = name
+        self.tags = tags
+        self.start = 0.0
+
+    def __enter__(self) -> dict:
+        self.start = time.perf_counter()
+        return self.tags
+
+    def __exit__(self, kind, value, traceback):
+        seconds = time.perf_counter() - self.start
+        if kind is not None:
+            self.tags["error"] = kind.__name__
+        self.metrics.timing(self.name, seconds, **self.tags)
+
+
+class Metrics(BaseModel):
+    """
+    Dispatches the measurements to the sinks. Without sinks, nothing is measured.
+
+    Attributes:
+        sinks (list[MetricsSink]): The sinks receiving the measurements.
+    """
+
+    sinks: list[MetricsSink] = Field(default_factory=list)
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.sinks)
+
+    def add_sink(self, sink: MetricsSink) -> MetricsSink:
+        """
+        Adds a sink, enabling the metrics, and returns it.
+        """
+        self.sinks.append(sink)
+        return sink
+
+    def remove_sink(self, sink: MetricsSink):
+        """
+        Removes a sink. The metrics are disabled when none is left.
+        """
+        self.sinks.remove(sink)
+
+    def timer(self, name: str, **tags):
+        """
+        Returns a context manager timing its block, which yields the tags (a new dict, ignored when disabled).
+        """
+        if not self.sinks:
+            return nullcontext({})
+        return Timer(self, name, tags)
+
+    def timing(self, name: str, seconds: float, **tags):
+        """
+        Reports a duration in seconds.
+        """
+        for sink in self.sinks:
+            sink.timing(name, seconds, tags)
+
+    def count(self, name: str, value: float = 1, **tags):
+        """
+        Adds value to a counter.
+        """
+        for sink in self.sinks:
+            sink.count(name, value, tags)
+
+
+METRICS = Metrics()
+
+
+def timed(name: str) -> Callable:
+    """
+    Decorator timing each call of a function under name, when the metrics are enabled.
+    """
+
+    def decorate(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not METRICS.sinks:
+                return func(*args, **kwargs)
+            with Timer(METRICS, name, {}):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorate
+
+
+def _format_tags(tags: dict) -> str:
+    if not tags:
+        return ""
+    return "{" + ",".join(f"{key}={value}" for key, value in sorted(tags.items())) + "}"
+
+
+def _labels(tags: tuple) -> str:
+    if not tags:
+        return ""
+    escaped = (str(value).replace("\\", "\\\\").replace('"', '\\"') for _, value in tags)
+    return "{" + ",".join(f'{key}="{value}"' for (key, _), value in zip(tags, escaped)) + "}"
@@ -0,0 +1,221 @@
+import itertools
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
+from typing import Any, Iterator, Optional
+
+import numpy as np
+import pandas as pd
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr
+
+from .backtesting import Backtest
+
+# Candle columns shared with the workers (those missing from the data are skipped)
+SHARED_COLUMNS = ["mid_o", "mid_h", "mid_l", "mid_c", "volume", "bid_o", "ask_o"]
+
+# Candles attached by each worker process, see _attach
+_worker_data: Optional[pd.DataFrame] = None
+_worker_memory: Optional[shared_memory.SharedMemory] = None
+
+
+def _open_shared_memory(name: str) -> shared_memory.SharedMemory:
+    try:
+        # The parent process owns (and unlinks) the block, workers must not track it
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:  # Python < 3.13
+        return shared_memory.SharedMemory(name=name)
+
+
+def _attach(name: str, shape: tuple, columns: list, index: np.ndarray, tz: Optional[str]):
+    """
+    Worker initializer: maps the shared candle block into a DataFrame without copying it.
+    """
+    global _worker_data, _worker_memory
+    _worker_memory = _open_shared_memory(name)
+    values = np.ndarray(shape, dtype=np.float64, buffer=_worker_memory.buf)
+    values.flags.writeable = False
+    time_index = pd.DatetimeIndex(index, name="time")
+    if tz is not None:
+        time_index = time_index.tz_localize("UTC").tz_convert(tz)
+    _worker_data = pd.DataFrame(values, index=time_index, columns=columns, copy=False)
+
+
+def _mp_context():
+    """
+    Workers are started from a forkserver that has imported galgoz once, so they start fast without forking
+    the (possibly multi-threaded) parent process. Falls back to spawn where forkserver is not available.
+    """
+    if "forkserver" not in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("spawn")
+    context = multiprocessing.get_context("forkserver")
+    context.set_forkserver_preload([__name__])
+    return context
+
+
+def _evaluate(indicator_cls: type, params: dict, fold: int, start: int, end: int) -> dict:
+    """
+    Worker task: backtests the signals of one parameter combination on one fold.
+
+    The indicator is computed on all the bars up to the end of the fold, so it is warmed up at the fold start.
+    """
+    data = _worker_data.iloc[:end]
+    signals = indicator_cls(data, **params).signals().iloc[start:]
+    stats = Backtest(data=data.iloc[start:], signals=signals).run()
+    return {**params, "fold": fold, **stats.to_dict()}
+
+
+class Optimizer(BaseModel):
+    """
+    Parallel parameter optimization of an indicator's signals across a process pool.
+
+    The candle columns are copied once into a shared memory block that every worker maps, instead of pickling
+    the DataFrame for every task. The data is split in consecutive folds and each (parameter combination, fold)
+    is a task, whose results are streamed back as they complete, so `leaderboard` can be read while the
+    optimization runs. `walk_forward` then selects the parameters on past folds and tests them on the next one.
+
+    Attributes:
+        data (pd.DataFrame): Candles indexed by time.
+        indicator (type): Indicator class with a `signals` method (e.g. SuperTrend).
+        grid (dict): Parameter name to list of values; every combination is evaluated.
+        folds (int): Number of consecutive folds the data is split in. Default is 1.
+        anchored (bool): Whether `walk_forward` selects the parameters on all the folds before the tested one
+            (True) or only on the previous fold (False, rolling). Default is True.
+        max_workers (int): Number of worker processes. Default is None (one per CPU).
+        metric (str): Statistic ranking the leaderboard (see `backtest_signals`). Default is "sharpe".
+        results (list[dict]): Results received so far, one per (combination, fold).
+    """
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    data: pd.DataFrame
+    indicator: type
+    grid: dict[str, list]
+    folds: int = 1
+    anchored: bool = True
+    max_workers: Optional[int] = None
+    metric: str = "sharpe"
+    results: list[dict] = Field(default_factory=list)
+
+    _memory: Optional[shared_memory.SharedMemory] = PrivateAttr(default=None)
+
+    def combinations(self) -> list[dict]:
+        keys = list(self.grid)
+        return [dict(zip(keys, values)) for values in itertools.product(*self.grid.values())]
+
+    def fold_bounds(self) -> list[tuple]:
+        edges = np.linspace(0, len(self.data), self.folds + 1).astype(int)
+        return list(zip(edges[:-1], edges[1:]))
+
+    def run(self) -> Iterator[dict]:
+        """
+        Runs the optimization, yielding each result as soon as a worker returns it.
+        """
+        columns = [column for column in SHARED_COLUMNS if column in self.data]
+        values = self.data[columns].to_numpy(dtype=np.float64)
+        index = self.data.index
+        tz = str(index.tz) if getattr(index, "tz", None) is not None else None
+        naive_index = index.tz_convert("UTC").tz_localize(None) if tz else index
+        self._memory = shared_memory.SharedMemory(create=True, size=max(values.nbytes, 1))
+        try:
+            np.ndarray(values.shape, dtype=np.float64, buffer=self._memory.buf)[:] = values
+            del values
+            with ProcessPoolExecutor(
+                max_workers=self.max_workers or os.cpu_count(),
+                mp_context=_mp_context(),
+                initializer=_attach,
+                initargs=(
+                    self._memory.name,
+                    (len(index), len(columns)),
+                    columns,
+                    naive_index.to_numpy(dtype="datetime64[ns]"),
+                    tz,
+                ),
+            ) as executor:
+                futures = [
+                    executor.submit(_evaluate, self.indicator, params, fold, start, end)
+                    for params in self.combinations()
+                    for fold, (start, end) in enumerate(self.fold_bounds())
+                ]
+                for future in as_completed(futures):
+                    result = future.result()
+                    self.results.append(result)
+                    yield result
+        finally:
+            self._memory.close()
+            self._memory.unlink()
+            self._memory = None
+
+    def leaderboard(self, n: Optional[int] = 10) -> pd.DataFrame:
+        """
+        Ranks the parameter combinations received so far by their mean metric across folds. Every fold is
+        in-sample here: see `walk_forward` for out-of-sample results.
+
+        Args:
+            n (int): Number of combinations to return. Default is 10 (None for all).
+
+        Returns:
+            pd.DataFrame: The mean statistics per combination and the number of folds completed.
+        """
+        if not self.results:
+            return pd.DataFrame()
+        results = pd.DataFrame(self.results)
+        board = results.groupby(list(self.grid)).mean(numeric_only=True)
+        board["folds"] = results.groupby(list(self.grid)).size()
+        board = board.drop(columns="fold").sort_values(self.metric, ascending=False)
+        return board if n is None else board.head(n)
+
+    def walk_forward(self) -> pd.DataFrame:
+        """
+        Walk-forward analysis of the results: for each fold after the first, selects the combination with the best
+        mean metric in-sample (on the previous folds, see `anchored`) and reports its statistics on that fold,
+        out-of-sample. Folds whose results are not all received yet are skipped.
+
+        Returns:
+            pd.DataFrame: One row per tested fold, with the parameters selected, their in-sample metric
+                ('in_sample_<metric>') and their out-of-sample statistics.
+        """
+        if self.folds < 2:
+            raise ValueError("Walk-forward analysis needs at least 2 folds.")
+        if not self.results:
+            return pd.DataFrame()
+        params = list(self.grid)
+        results = pd.DataFrame(self.results).set_index(params)
+        combinations = len(self.combinations())
+        rows = []
+        for fold in range(1, self.folds):
+            first = 0 if self.anchored else fold - 1
+            train = results[(results["fold"] >= first) & (results["fold"] < fold)]
+            test = results[results["fold"] == fold]
+            if len(train) < combinations * (fold - first) or len(test) < combinations:
+                continue
+            in_sample = train.groupby(level=params)[self.metric].mean().dropna()
+            if in_sample.empty:
+                continue
+            best = in_sample.idxmax()
+            row = test.loc[[best]].reset_index().to_dict("records")[0]
+            rows.append({**row, f"in_sample_{self.metric}": in_sample[best]})
+        if not rows:
+            return pd.DataFrame()
+        return pd.DataFrame(rows).set_index("fold")
+
+
+def optimize(
+    data: pd.DataFrame, indicator: type, grid: dict[str, list], **kwargs: Any
+) -> pd.DataFrame:
+    """
+    Runs an `Optimizer` to completion and returns the full leaderboard.
+
+    Args:
+        data (pd.DataFrame): Candles indexed by time.
+        indicator (type): Indicator class with a `signals` method (e.g. SuperTrend).
+        grid (dict): Parameter name to list of values.
+        **kwargs: Other `Optimizer` attributes (folds, anchored, max_workers, metric).
+
+    Returns:
+        pd.DataFrame: The leaderboard of all the combinations.
+    """
+    optimizer = Optimizer(data=data, indicator=indicator, grid=grid, **kwargs)
+    for _ in optimizer.run():
+        pass
+    return optimizer.leaderboard(n=None)
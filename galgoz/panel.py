@@ -0,0 +1,140 @@
+"""
+Aligned multi-instrument candle panels and indicators computed across a whole panel at once.
+
+A panel is a DataFrame indexed by time with (instrument, field) MultiIndex columns, e.g. ("GBP_JPY", "mid_c").
+"""
+
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from .indicators.base import Indicator
+from .indicators.kernels import final_bands_2d, wilder_atr_2d, wilder_rsi_2d
+from .indicators.trend import hull_moving_average
+
+PRICE_FIELDS = [
+    f"{component}_{field}" for component in ("bid", "mid", "ask") for field in "ohlc"
+]
+
+
+def align_panel(
+    frames: dict[str, pd.DataFrame], how: str = "outer", fill: Optional[str] = "ffill"
+) -> pd.DataFrame:
+    """
+    Aligns the candles of several instruments on a shared DatetimeIndex.
+
+    Args:
+        frames (dict): Instrument name to candles indexed by time.
+        how (str): "outer" keeps every time of any instrument, "inner" only the times shared by all. Default is "outer".
+        fill (str): Gap handling for the outer join. "ffill" carries the last prices forward with zero volume
+            (leading gaps stay NaN), "drop" drops the times with any gap and None leaves the gaps as NaN.
+            Default is "ffill".
+
+    Returns:
+        pd.DataFrame: The panel, with (instrument, field) MultiIndex columns.
+    """
+    panel = pd.concat(frames, axis=1, join=how, names=["instrument", "field"]).sort_index()
+    if fill == "ffill":
+        columns = panel.columns.get_level_values("field")
+        prices = columns.isin(PRICE_FIELDS)
+        panel.loc[:, prices] = panel.loc[:, prices].ffill()
+        if "volume" in columns:
+            volume = columns == "volume"
+            panel.loc[:, volume] = panel.loc[:, volume].fillna(0)
+    elif fill == "drop":
+        panel = panel.dropna()
+    elif fill is not None:
+        raise ValueError(f"Unknown fill method {fill}, should be 'ffill', 'drop' or None")
+    return panel
+
+
+def field(panel: pd.DataFrame, name: str) -> pd.DataFrame:
+    """
+    Returns one field of every instrument (e.g. "mid_c") as a time x instrument DataFrame.
+    """
+    return panel.xs(name, axis=1, level="field")
+
+
+def to_array(panel: pd.DataFrame, fields: list[str]) -> np.ndarray:
+    """
+    Returns the panel as a float64 array of shape (time, instrument, field), fields in the given order.
+    """
+    instruments = panel.columns.get_level_values("instrument").unique()
+    columns = pd.MultiIndex.from_product([instruments, fields])
+    values = panel[columns].to_numpy(dtype=np.float64)
+    return values.reshape(len(panel), len(instruments), len(fields))
+
+
+def rsi(panel: pd.DataFrame, window: int = 14) -> pd.DataFrame:
+    """
+    RSI of the 'mid_c' field of every instrument in one call (same values as the RSI indicator).
+    """
+    close = field(panel, "mid_c")
+    return pd.DataFrame(
+        wilder_rsi_2d(close.to_numpy(dtype=np.float64), window),
+        index=close.index,
+        columns=close.columns,
+    )
+
+
+def atr(panel: pd.DataFrame, period: int = 14) -> pd.DataFrame:
+    """
+    Average True Range of the mid prices of every instrument in one call.
+    """
+    close = field(panel, "mid_c")
+    return pd.DataFrame(
+        wilder_atr_2d(
+            field(panel, "mid_h").to_numpy(dtype=np.float64),
+            field(panel, "mid_l").to_numpy(dtype=np.float64),
+            close.to_numpy(dtype=np.float64),
+            period,
+        ),
+        index=close.index,
+        columns=close.columns,
+    )
+
+
+def supertrend(
+    panel: pd.DataFrame, atr_period: int = 14, multiplier: float = 6.5
+) -> pd.DataFrame:
+    """
+    SuperTrend of every instrument in one call (same values as the SuperTrend indicator output).
+    """
+    close = field(panel, "mid_c")
+    med_price = (field(panel, "mid_h") + field(panel, "mid_l")).to_numpy() / 2
+    matr = multiplier * atr(panel, atr_period).to_numpy()
+    trend, _ = final_bands_2d(
+        close.to_numpy(dtype=np.float64), med_price + matr, med_price - matr
+    )
+    return pd.DataFrame(trend, index=close.index, columns=close.columns)
+
+
+def hma(panel: pd.DataFrame, window: int = 169) -> pd.DataFrame:
+    """
+    HMA of the 'mid_c' field of every instrument in one call (same values as the HMA indicator).
+    """
+    close = field(panel, "mid_c")
+    values = np.full(close.shape, np.nan)
+    for j, column in enumerate(close.to_numpy(dtype=np.float64).T):
+        # Gaps left by fill=None are skipped, as apply() does
+        valid = ~np.isnan(column)
+        values[valid, j] = hull_moving_average(column[valid], window)
+    return pd.DataFrame(values, index=close.index, columns=close.columns)
+
+
+def apply(panel: pd.DataFrame, indicator: type[Indicator], **params) -> pd.DataFrame:
+    """
+    Runs any Indicator class on each instrument of the panel and collects the outputs.
+
+    Unlike the functions above this loops over the instruments; it covers indicators without a panel version.
+    Leading gaps of each instrument are dropped before running the indicator.
+
+    Returns:
+        pd.DataFrame: Outputs with the instrument as the first column level.
+    """
+    outputs = {}
+    for instrument in panel.columns.get_level_values("instrument").unique():
+        data = panel[instrument].dropna(how="all")
+        outputs[instrument] = indicator(data, **params).output
+    return pd.concat(outputs, axis=1).reindex(panel.index)
@@ -4,9 +4,12 @@ import pandas as pd
 from typing import List
 import plotly.graph_objects as go  # type: ignore
 from plotly.subplots import make_subplots  # type: ignore
+from ..metrics import timed
 from ..utils import set_data_index_and_time_str
+from .decimate import aggregate_ohlc, decimate
 
 
+@timed("plot")
 def plot(
     df: Optional[pd.DataFrame] = None,
     instrument: Optional[str] = None,
@@ -15,10 +18,16 @@ def plot(
     price: str = "mid",
     width: int = 2000,
     height: int = 1000,
+    max_bars: Optional[int] = None,
+    decimation: str = "minmax",
 ):
     """
     Plots candlestick data.
 
+    By default every candle is drawn on a category axis labelled with its time. For long data, set max_bars to
+    bound the size of the figure: candles are aggregated to at most max_bars candles (OHLC preserving), indicator
+    lines are decimated to at most max_bars points and drawn with WebGL (Scattergl), on a datetime axis.
+
     Args:
         df (Optional[pd.DataFrame]): DataFrame containing the candlestick data.
             Must include columns for time, open, high, low, and close prices.
@@ -32,6 +41,10 @@ def plot(
                 - "mode" (str): Mode for the plot (e.g., "lines").
                 - "row" (int): Row number for the subplot.
                 - "line" (Dict[str, Union[str, int]]): Line properties (e.g., color, width).
+        max_bars (Optional[int]): Maximum number of candles and points per indicator line drawn. Defaults to None
+            (all the candles).
+        decimation (str): Decimation of the indicator lines when max_bars is set, "minmax" or "lttb". Defaults to
+            "minmax".
     Raises:
         ValueError: If no DataFrame is provided.
     Returns:
@@ -39,9 +52,13 @@ def plot(
     """
     if df is None:
         raise ValueError("No data received")
+    elif max_bars is not None:
+        df_plot = aggregate_ohlc(_time_indexed(df), max_bars, price)
+        x = df_plot.index
     else:
         df_plot = df.copy()
         set_data_index_and_time_str(df_plot)
+        x = df_plot.time_str
 
     if instrument is None:
         instrument = "Instrument"
@@ -63,7 +80,7 @@ def plot(
 
     fig.add_trace(
         go.Candlestick(
-            x=df_plot.time_str,
+            x=x,
             open=df_plot[f"{price}_o"],
             high=df_plot[f"{price}_h"],
             low=df_plot[f"{price}_l"],
@@ -81,12 +98,26 @@ def plot(
         col=1,
     )
 
-    add_indicators_to_plot(indicators, fig)
-    _candle_plot_layout(width, height, df_plot, fig)
+    if max_bars is not None:
+        add_decimated_indicators_to_plot(indicators, fig, max_bars, decimation)
+        _candle_plot_layout(width, height, fig)
+        fig.update_xaxes(type="date")
+    else:
+        add_indicators_to_plot(indicators, fig)
+        # Display only a percentage of the xticks based on the length of the dataset
+        num_ticks = len(df_plot) // 10  # Show 10% of the ticks
+        _candle_plot_layout(width, height, fig, tickvals=df_plot.time_str[::num_ticks])
 
     return fig
 
 
+def _time_indexed(df: pd.DataFrame) -> pd.DataFrame:
+    # Data indexed by time, without copying nor formatting time strings
+    if isinstance(df.index, pd.DatetimeIndex):
+        return df
+    return df.set_index(pd.DatetimeIndex(pd.to_datetime(df["time"]), name="time"))
+
+
 def add_indicators_to_plot(indicators, fig):
     if indicators is not None:
         for indicator in indicators:
@@ -132,7 +163,43 @@ def add_indicators_to_plot(indicators, fig):
                 )
 
 
-def _candle_plot_layout(width, height, df_plot, fig):
+def add_decimated_indicators_to_plot(indicators, fig, max_points, method="minmax"):
+    """
+    Adds the indicators to the figure as WebGL lines of at most max_points points each, on a datetime axis.
+    """
+    if indicators is None:
+        return
+    for indicator in indicators:
+        output = indicator["output"]
+        if isinstance(output, pd.DataFrame):
+            lines = [(output[column], f"{indicator['name']} ({column})") for column in output]
+        else:
+            lines = [(output, indicator["name"])]
+        for i, (line, name) in enumerate(lines):
+            points = decimate(line, max_points, method)
+            fig.add_trace(
+                go.Scattergl(
+                    x=points.index,
+                    y=points.to_numpy(),
+                    mode=indicator["mode"][i],
+                    line=indicator["line"][i],
+                    marker=indicator["marker"][i],
+                    name=name,
+                ),
+                row=indicator["row"],
+                col=1,
+            )
+        fig.update_yaxes(
+            title_text=indicator["name"],
+            row=indicator["row"],
+            col=1,
+            showticklabels=True,
+        )
+        if indicator["row"] != 1:
+            fig.update_xaxes(showticklabels=False, row=indicator["row"], col=1)
+
+
+def _candle_plot_layout(width, height, fig, tickvals=None):
     fig.update_layout(
         legend=dict(
             x=0,
@@ -160,10 +227,8 @@ def _candle_plot_layout(width, height, df_plot, fig):
         showline=True,
     )
 
-    # Display only a percentage of the xticks based on the length of the dataset
-    num_ticks = len(df_plot) // 10  # Show 10% of the ticks
     fig.update_xaxes(
-        tickvals=df_plot.time_str[::num_ticks],
+        tickvals=tickvals,
         showspikes=True,
         spikecolor="green",
         spikemode="across",
@@ -0,0 +1,116 @@
+"""
+Reduction of long candle and indicator series to a number of points a chart can display.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+def aggregate_ohlc(df: pd.DataFrame, max_bars: int, price: str = "mid") -> pd.DataFrame:
+    """
+    Aggregates consecutive candles so that at most max_bars candles are left, preserving open, high, low and close.
+
+    Each aggregated candle covers the same number of consecutive bars (the last one may be shorter) and is
+    timestamped by the first of them, so gaps such as weekends do not create empty candles.
+
+    Args:
+        df (pd.DataFrame): Candles indexed by time with the '{price}_o', '{price}_h', '{price}_l' and '{price}_c'
+            columns.
+        max_bars (int): Maximum number of candles returned.
+        price (str): Prefix of the price columns. Default is "mid".
+
+    Returns:
+        pd.DataFrame: The '{price}_o/h/l/c' columns, with the original candles if there are fewer than max_bars.
+    """
+    columns = [f"{price}_{field}" for field in "ohlc"]
+    n = len(df)
+    if n <= max_bars:
+        return df[columns]
+    step = -(-n // max_bars)
+    starts = np.arange(0, n, step)
+    ends = np.minimum(starts + step, n) - 1
+    o, h, l, c = (df[column].to_numpy(dtype=np.float64) for column in columns)
+    return pd.DataFrame(
+        {
+            columns[0]: o[starts],
+            columns[1]: np.fmax.reduceat(h, starts),
+            columns[2]: np.fmin.reduceat(l, starts),
+            columns[3]: c[ends],
+        },
+        index=df.index[starts],
+    )
+
+
+def minmax_indices(y: np.ndarray, max_points: int) -> np.ndarray:
+    """
+    Returns the sorted positions of the minimum and maximum of y in max_points // 2 equal buckets.
+
+    Keeping both extremes of every bucket preserves the visual envelope of the line (spikes are never dropped).
+    Buckets with only NaNs keep their first position, so gaps remain visible.
+    """
+    n = len(y)
+    if n <= max_points:
+        return np.arange(n)
+    step = -(-n // max(1, max_points // 2))
+    padded = np.full(-(-n // step) * step, np.nan)
+    padded[:n] = y
+    buckets = padded.reshape(-1, step)
+    offsets = np.arange(0, len(padded), step)
+    lows = np.where(np.isnan(buckets), np.inf, buckets).argmin(axis=1) + offsets
+    highs = np.where(np.isnan(buckets), -np.inf, buckets).argmax(axis=1) + offsets
+    indices = np.unique(np.concatenate([lows, highs]))
+    return indices[indices < n]
+
+
+def lttb_indices(y: np.ndarray, max_points: int) -> np.ndarray:
+    """
+    Returns the positions of the points kept by Largest-Triangle-Three-Buckets downsampling.
+
+    The first and last points are kept and, in each of the max_points - 2 buckets in between, the point forming
+    the largest triangle with the previous kept point and the average of the next bucket. Positions are used as
+    the x coordinates. NaNs are never selected unless a whole bucket is NaN.
+    """
+    n = len(y)
+    if n <= max_points:
+        return np.arange(n)
+    if max_points < 3:
+        raise ValueError("LTTB needs at least 3 points.")
+    edges = np.append(np.linspace(1, n - 1, max_points - 1).astype(np.int64), n)
+    indices = np.empty(max_points, dtype=np.int64)
+    indices[0], indices[-1] = 0, n - 1
+    previous = 0
+    for i in range(max_points - 2):
+        start, stop, stop_next = edges[i], edges[i + 1], edges[i + 2]
+        following = y[stop:stop_next]
+        y_next = np.nanmean(following) if np.isfinite(following).any() else y[previous]
+        x_next = (stop + stop_next - 1) / 2
+        x = np.arange(start, stop)
+        areas = np.abs(
+            (previous - x_next) * (y[start:stop] - y[previous])
+            - (previous - x) * (y_next - y[previous])
+        )
+        previous = start + int(np.where(np.isnan(areas), -1.0, areas).argmax())
+        indices[i + 1] = previous
+    return indices
+
+
+def decimate(values: pd.Series, max_points: int, method: str = "minmax") -> pd.Series:
+    """
+    Reduces a line (e.g. an indicator output) to at most max_points points.
+
+    Args:
+        values (pd.Series): The line, indexed by time.
+        max_points (int): Maximum number of points kept.
+        method (str): "minmax" keeps the extremes of each bucket, "lttb" the visually most significant point.
+            Default is "minmax".
+
+    Returns:
+        pd.Series: The kept points.
+    """
+    if method == "minmax":
+        select = minmax_indices
+    elif method == "lttb":
+        select = lttb_indices
+    else:
+        raise ValueError(f"Unknown decimation method {method}, should be 'minmax' or 'lttb'")
+    return values.iloc[select(values.to_numpy(dtype=np.float64), max_points)]
@@ -0,0 +1,142 @@
+from collections import deque
+from typing import List, Optional
+
+import pandas as pd
+import plotly.graph_objects as go  # type: ignore
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr
+
+from ..indicators.base import Indicator
+from ..utils import generate_indicators
+from .candles import plot
+
+
+class LiveChart(BaseModel):
+    """
+    Candle chart updated in place as new candles arrive, showing a sliding window of the last candles.
+
+    The figure is a plotly FigureWidget built once by `show`, which needs the optional "live" dependencies
+    (ipywidgets, or anywidget from plotly 6): `poetry install -E live`. Each update replaces or appends the last candle and
+    indicator points in fixed-size buffers and assigns them to the existing traces in a single batch update, so its
+    cost depends on the window, not on the length of the history.
+
+    The indicators are not updated by the chart: append the completed candles to them before calling `update`,
+    or subscribe them to the PriceStream that calls the chart (e.g. `stream.subscribe(instrument, chart.on_candle,
+    indicator)`).
+
+    Attributes:
+        indicators (list[Indicator]): Indicators drawn with the candles.
+        window (int): Number of candles (and indicator points) kept visible. Default is 500.
+        instrument (str): Name of the candles trace. Default is "Instrument".
+        price (str): Price component drawn, "mid", "bid" or "ask". Default is "mid".
+        width (int): Width of the chart. Default is 2000.
+        height (int): Height of the chart. Default is 1000.
+        fig (go.FigureWidget): The chart, built by `show`.
+    """
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    indicators: List[Indicator] = Field(default_factory=list)
+    window: int = 500
+    instrument: str = "Instrument"
+    price: str = "mid"
+    width: int = 2000
+    height: int = 1000
+    fig: Optional[go.FigureWidget] = None
+
+    _candles: deque = PrivateAttr(default=None)
+    # One (indicator, column, trace index, points) entry per indicator line
+    _lines: list = PrivateAttr(default_factory=list)
+
+    def show(self, df: pd.DataFrame) -> go.FigureWidget:
+        """
+        Builds the chart from the last `window` candles of df and the current indicator outputs.
+
+        Args:
+            df (pd.DataFrame): Candles indexed by time, with the '{price}_o/h/l/c' columns.
+
+        Returns:
+            go.FigureWidget: The chart. Display it in a notebook to see the updates.
+        """
+        tail = df.iloc[-self.window :]
+        indicators = [
+            {**indicator, "output": indicator["output"].iloc[-self.window :]}
+            for indicator in generate_indicators(*self.indicators)
+        ]
+        fig = plot(
+            tail,
+            instrument=self.instrument,
+            indicators=indicators or None,
+            price=self.price,
+            width=self.width,
+            height=self.height,
+            max_bars=self.window,
+        )
+        self.fig = _figure_widget(fig)
+
+        columns = [f"{self.price}_{field}" for field in "ohlc"]
+        self._candles = deque(
+            zip(tail.index, *(tail[column] for column in columns)), maxlen=self.window
+        )
+        self._lines = []
+        trace = 1
+        for indicator in self.indicators:
+            output = indicator.output.iloc[-self.window :]
+            lines = output.items() if isinstance(output, pd.DataFrame) else [(None, output)]
+            for column, line in lines:
+                points = deque(zip(line.index, line), maxlen=self.window)
+                self._lines.append((indicator, column, trace, points))
+                trace += 1
+        return self.fig
+
+    def update(self, candle: pd.Series, complete: bool):
+        """
+        Updates the chart with a partial or completed candle.
+
+        A candle with the time of the last candle replaces it, a later one is appended and drops the oldest.
+        Indicator points are added for completed candles from the last value of each indicator output.
+
+        Args:
+            candle (pd.Series): The candle, named by its start time (e.g. from PriceStream or a candles DataFrame).
+            complete (bool): Whether the candle is completed.
+        """
+        if self.fig is None:
+            raise ValueError("The chart has not been built, call show() first.")
+        values = (candle.name, *(candle[f"{self.price}_{field}"] for field in "ohlc"))
+        _push(self._candles, values)
+        if complete:
+            for indicator, column, _, points in self._lines:
+                output = indicator.output if column is None else indicator.output[column]
+                _push(points, (output.index[-1], output.iloc[-1]))
+
+        with self.fig.batch_update():
+            times, opens, highs, lows, closes = zip(*self._candles)
+            self.fig.data[0].update(x=times, open=opens, high=highs, low=lows, close=closes)
+            if complete:
+                for _, _, trace, points in self._lines:
+                    x, y = zip(*points)
+                    self.fig.data[trace].update(x=x, y=y)
+
+    def on_candle(self, instrument: str, candle: pd.Series, complete: bool):
+        """
+        PriceStream callback, see `update`.
+        """
+        self.update(candle, complete)
+
+
+def _figure_widget(fig: go.Figure) -> go.FigureWidget:
+    # plotly defines FigureWidget without its widget backend, but raises when one is built
+    try:
+        return go.FigureWidget(fig)
+    except ImportError as error:
+        raise ImportError(
+            "LiveChart requires the optional live dependencies (ipywidgets, or anywidget from plotly 6): "
+            "install them with `poetry install -E live` or `pip install galgoz[live]`."
+        ) from error
+
+
+def _push(buffer: deque, values: tuple):
+    # Replaces the last entry if it has the same time, otherwise appends (dropping the oldest when full)
+    if buffer and buffer[-1][0] == values[0]:
+        buffer[-1] = values
+    else:
+        buffer.append(values)
@@ -0,0 +1,12 @@
+from .store import CandleStore
+from .parquet import read_parquet, write_parquet, migrate_pickles
+from .resample import Resampler, resample_candles
+
+__all__ = [
+    "CandleStore",
+    "read_parquet",
+    "write_parquet",
+    "migrate_pickles",
+    "Resampler",
+    "resample_candles",
+]
@@ -0,0 +1,170 @@
+from pathlib import Path
+from typing import Optional
+
+import pandas as pd
+import pyarrow as pa  # type: ignore
+import pyarrow.dataset as ds  # type: ignore
+
+PARTITIONING = ds.partitioning(
+    pa.schema(
+        [
+            ("instrument", pa.string()),
+            ("granularity", pa.string()),
+            ("year", pa.int32()),
+        ]
+    ),
+    flavor="hive",
+)
+
+# Rows per row group. Row groups are sorted by time, so the min/max statistics
+# of the time column let a time filter skip every group outside the range.
+ROW_GROUP_SIZE = 10_000
+
+
+def _dataset(root: Path):
+    return ds.dataset(root, format="parquet", partitioning=PARTITIONING)
+
+
+def _time_filter(date_from: Optional[str] = None, date_to: Optional[str] = None):
+    expression = ds.scalar(True)
+    if date_from is not None:
+        start = pa.scalar(pd.Timestamp(date_from, tz="UTC"), type=pa.timestamp("ns", "UTC"))
+        expression &= ds.field("time") >= start
+    if date_to is not None:
+        end = pa.scalar(pd.Timestamp(date_to, tz="UTC"), type=pa.timestamp("ns", "UTC"))
+        expression &= ds.field("time") <= end
+    return expression
+
+
+def _filter(
+    instrument: str,
+    granularity: str,
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None,
+):
+    expression = (ds.field("instrument") == instrument) & (
+        ds.field("granularity") == granularity
+    )
+    # Year bounds prune whole partitions before the row group statistics are checked
+    if date_from is not None:
+        expression &= ds.field("year") >= pd.Timestamp(date_from).year
+    if date_to is not None:
+        expression &= ds.field("year") <= pd.Timestamp(date_to).year
+    return expression & _time_filter(date_from, date_to)
+
+
+def write_parquet(df: pd.DataFrame, root: Path, instrument: str, granularity: str):
+    """
+    Writes candles to a Parquet dataset partitioned by instrument, granularity and year.
+
+    The candles are merged with the rows already stored for the years they touch, so partial downloads
+    can be appended without losing data.
+
+    Args:
+        df (pd.DataFrame): Candles in the format returned by `Galgoz.candles_df` (a 'time' column) or indexed by time.
+        root (Path): Root folder of the dataset.
+        instrument (str): Instrument name (e.g., "GBP_JPY").
+        granularity (str): Candle granularity (e.g., "H1").
+    """
+    if len(df) == 0:
+        return
+    df = df.reset_index() if "time" not in df.columns else df.copy()
+    df["time"] = pd.to_datetime(df["time"], utc=True).astype("datetime64[ns, UTC]")
+    df = df.drop(columns=["time_str", "index"], errors="ignore")
+    years = sorted(df["time"].dt.year.unique())
+
+    root = Path(root)
+    if root.exists():
+        stored = (
+            _dataset(root)
+            .to_table(
+                filter=_filter(instrument, granularity)
+                & ds.field("year").isin([int(year) for year in years])
+            )
+            .to_pandas()
+        )
+        if len(stored) > 0:
+            stored = stored.drop(columns=["instrument", "granularity", "year"])
+            df = pd.concat([stored, df], ignore_index=True)
+    df = (
+        df.drop_duplicates(subset="time", keep="last")
+        .sort_values("time")
+        .reset_index(drop=True)
+    )
+    df["instrument"] = instrument
+    df["granularity"] = granularity
+    df["year"] = df["time"].dt.year.astype("int32")
+
+    ds.write_dataset(
+        pa.Table.from_pandas(df, preserve_index=False),
+        root,
+        format="parquet",
+        partitioning=PARTITIONING,
+        existing_data_behavior="delete_matching",
+        max_rows_per_group=ROW_GROUP_SIZE,
+        min_rows_per_group=ROW_GROUP_SIZE,
+    )
+
+
+def read_parquet(
+    root: Path,
+    instrument: str,
+    granularity: str,
+    columns: Optional[list] = None,
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None,
+) -> pd.DataFrame:
+    """
+    Reads candles from a Parquet dataset written by `write_parquet`.
+
+    Only the partitions and row groups overlapping [date_from, date_to] are read, and only the requested columns.
+
+    Args:
+        root (Path): Root folder of the dataset.
+        instrument (str): Instrument name (e.g., "GBP_JPY").
+        granularity (str): Candle granularity (e.g., "H1").
+        columns (list): Columns to read (e.g., ["mid_c"]). Default is None (all columns).
+        date_from (str): Start of the range (inclusive), any format understood by pd.Timestamp. Default is None.
+        date_to (str): End of the range (inclusive), any format understood by pd.Timestamp. Default is None.
+
+    Returns:
+        pd.DataFrame: The candles, indexed by a UTC DatetimeIndex named 'time'.
+    """
+    dataset = _dataset(root)
+    if columns is None:
+        columns = [
+            name
+            for name in dataset.schema.names
+            if name not in ("instrument", "granularity", "year")
+        ]
+    columns = ["time"] + [column for column in columns if column != "time"]
+    table = dataset.to_table(
+        columns=columns, filter=_filter(instrument, granularity, date_from, date_to)
+    )
+    return table.to_pandas().sort_values("time").set_index("time")
+
+
+def migrate_pickles(source: Path, root: Path) -> list:
+    """
+    Converts the `{instrument}_{granularity}.pkl` files of a folder into a Parquet dataset.
+
+    Files whose name does not end with a known granularity are skipped.
+
+    Args:
+        source (Path): Folder with the pickle files (e.g., DATA_FOLDER).
+        root (Path): Root folder of the Parquet dataset.
+
+    Returns:
+        list: The pickle files that were migrated.
+    """
+    from ..galgoz import TIME_INCREMENT
+
+    migrated = []
+    for path in sorted(Path(source).glob("*.pkl")):
+        instrument, _, granularity = path.stem.rpartition("_")
+        if not instrument or granularity not in TIME_INCREMENT:
+            continue
+        write_parquet(pd.read_pickle(path), root, instrument, granularity)
+        print(f"Migrated {path.name}")
+        migrated.append(path)
+    return migrated
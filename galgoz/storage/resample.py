@@ -0,0 +1,175 @@
+"""
+Coarser candles built from the candles of a finer granularity, with the OANDA candle alignment.
+"""
+
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+from pydantic import BaseModel, ConfigDict, PrivateAttr
+
+from ..decoder import OHLC, PRICE_COMPONENTS
+from ..utils import GRANULARITY_MINUTES, candle_end, candle_start
+
+TIME_FORMAT = "%Y-%m-%dT%H:%M:%S.000000000Z"
+
+
+def resample_candles(
+    df: pd.DataFrame, granularity: str, source: str = "M1", **alignment
+) -> pd.DataFrame:
+    """
+    Aggregates candles of the source granularity into candles of a coarser granularity.
+
+    Each candle gets the first open, highest high, lowest low and last close of the source candles it contains,
+    for every price component present (mid, bid, ask), and the sum of their volumes. Candles start at the times
+    given by `candle_start`, so they line up with the candles served by OANDA. A candle is complete when all its
+    source candles are complete and its period is over (a later candle exists, or the last source candle ends
+    with it).
+
+    Args:
+        df (pd.DataFrame): Source candles sorted by time, either indexed by time (as returned by
+            `decode_candles`) or in the `Galgoz.candles_df` layout with a 'time' column.
+        granularity (str): The granularity of the candles returned (e.g., "H4").
+        source (str): The granularity of df. Default is "M1".
+        **alignment: daily_alignment, alignment_timezone and weekly_alignment, see `candle_start`.
+
+    Returns:
+        pd.DataFrame: The candles, in the layout of df.
+    """
+    _check_granularities(granularity, source)
+    indexed = "time" not in df.columns
+    candles = df if indexed else _time_indexed(df)
+    if len(candles) == 0:
+        return df.iloc[:0]
+
+    times = candles.index
+    starts = candle_start(times, granularity, **alignment)
+    breaks = np.flatnonzero(np.diff(starts.asi8)) + 1
+    firsts = np.concatenate([[0], breaks])
+    lasts = np.concatenate([breaks, [len(times)]]) - 1
+
+    columns: dict = {}
+    components = dict.fromkeys(column.split("_")[0] for column in candles.columns)
+    for component in (component for component in components if component in PRICE_COMPONENTS):
+        o, h, l, c = (candles[f"{component}_{field}"].to_numpy(dtype=np.float64) for field in OHLC)
+        columns[f"{component}_o"] = o[firsts]
+        columns[f"{component}_h"] = np.maximum.reduceat(h, firsts)
+        columns[f"{component}_l"] = np.minimum.reduceat(l, firsts)
+        columns[f"{component}_c"] = c[lasts]
+
+    index = starts[firsts]
+    complete = np.logical_and.reduceat(candles["complete"].to_numpy(dtype=bool), firsts)
+    source_end = times[lasts[-1]] + pd.Timedelta(minutes=GRANULARITY_MINUTES[source])
+    complete[-1] &= source_end >= candle_end(index[-1], granularity, **alignment)
+    volume = np.add.reduceat(candles["volume"].to_numpy(), firsts)
+
+    resampled = pd.DataFrame(
+        {"complete": complete, "volume": volume, **columns},
+        index=pd.DatetimeIndex(index, name="time"),
+    )
+    return resampled if indexed else _candles_df_layout(resampled)
+
+
+class Resampler(BaseModel):
+    """
+    Candles of several granularities derived from the candles of one fine granularity, updated incrementally.
+
+    A single download of fine candles (e.g. M1 from the candle store) serves every coarser granularity, so
+    strategies combining e.g. H1 signals with D filters make no extra API calls. Resampled frames are cached;
+    `update` merges new or updated fine candles and recomputes only the coarse candles they fall in.
+
+    Attributes:
+        source (str): Granularity of the fine candles. Default is "M1".
+        daily_alignment (int): Hour of the day candles are aligned to. Default is 17.
+        alignment_timezone (str): Timezone of the daily alignment. Default is "America/New_York".
+        weekly_alignment (str): Day weekly candles start on. Default is "Friday".
+        candles (pd.DataFrame): The fine candles, indexed by time.
+    """
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    source: str = "M1"
+    daily_alignment: int = 17
+    alignment_timezone: str = "America/New_York"
+    weekly_alignment: str = "Friday"
+    candles: pd.DataFrame = pd.DataFrame()
+
+    _frames: dict = PrivateAttr(default_factory=dict)
+
+    def __init__(self, candles: Optional[pd.DataFrame] = None, **kwargs):
+        super().__init__(**kwargs)
+        if candles is not None:
+            self.update(candles)
+
+    @property
+    def alignment(self) -> dict:
+        return {
+            "daily_alignment": self.daily_alignment,
+            "alignment_timezone": self.alignment_timezone,
+            "weekly_alignment": self.weekly_alignment,
+        }
+
+    def get(self, granularity: str) -> pd.DataFrame:
+        """
+        Returns the candles of a granularity, indexed by time. The source granularity returns the fine candles.
+        """
+        if granularity == self.source:
+            return self.candles
+        if granularity not in self._frames:
+            self._frames[granularity] = resample_candles(
+                self.candles, granularity, self.source, **self.alignment
+            )
+        return self._frames[granularity]
+
+    def update(self, df: pd.DataFrame):
+        """
+        Merges fine candles (new ones, or updates of stored ones such as the last incomplete candle) and updates
+        the cached granularities from the first coarse candle they touch.
+
+        Args:
+            df (pd.DataFrame): Fine candles sorted by time, indexed by time or with a 'time' column.
+        """
+        new = df if "time" not in df.columns else _time_indexed(df)
+        if len(new) == 0:
+            return
+        stored = self.candles
+        if len(stored) == 0:
+            self.candles = new
+        elif new.index[0] >= stored.index[-1]:
+            # Appended candles, possibly replacing the last stored one
+            keep = stored.index.searchsorted(new.index[0])
+            self.candles = pd.concat([stored.iloc[:keep], new])
+        else:
+            merged = pd.concat([stored, new])
+            self.candles = merged[~merged.index.duplicated(keep="last")].sort_index()
+
+        for granularity, frame in self._frames.items():
+            start = candle_start(new.index[0], granularity, **self.alignment)
+            tail = self.candles.iloc[self.candles.index.searchsorted(start) :]
+            self._frames[granularity] = pd.concat(
+                [
+                    frame.iloc[: frame.index.searchsorted(start)],
+                    resample_candles(tail, granularity, self.source, **self.alignment),
+                ]
+            )
+
+
+def _check_granularities(granularity: str, source: str):
+    target_minutes = GRANULARITY_MINUTES[granularity]
+    source_minutes = GRANULARITY_MINUTES[source]
+    if source_minutes >= target_minutes or min(target_minutes, 1440) % source_minutes:
+        raise ValueError(f"{granularity} candles cannot be built from {source} candles.")
+
+
+def _time_indexed(df: pd.DataFrame) -> pd.DataFrame:
+    # Galgoz.candles_df layout to a frame indexed by the UTC times
+    times = pd.DatetimeIndex(pd.to_datetime(df["time"], utc=True), name="time")
+    return df.drop(columns="time").set_index(times)
+
+
+def _candles_df_layout(df: pd.DataFrame) -> pd.DataFrame:
+    # Frame indexed by time to the Galgoz.candles_df layout (RangeIndex, time strings, integer complete)
+    out = df.reset_index()
+    out["time"] = df.index.strftime(TIME_FORMAT)
+    out["complete"] = out["complete"].astype(np.int64)
+    return out[["complete", "volume", "time", *df.columns[2:]]]
@@ -0,0 +1,176 @@
+import json
+from datetime import datetime as dt
+from datetime import timezone
+from pathlib import Path
+from typing import Callable, Optional
+
+import pandas as pd
+from pydantic import BaseModel, ConfigDict, PrivateAttr
+
+DATE_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
+
+
+class CandleStore(BaseModel):
+    """
+    Persistent candle store keyed by instrument, granularity and price.
+
+    Each key is stored as a pickled DataFrame (in the format returned by `Galgoz.candles_df`) plus a JSON
+    sidecar listing the time ranges already downloaded. Reads only fetch the gaps that are not covered yet.
+    A range is only marked as covered up to its first incomplete candle, so the trailing live candle is
+    fetched again on the next read.
+
+    Attributes:
+        folder (Path): Folder where the candle files are stored.
+    """
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    folder: Path
+
+    _frames: dict = PrivateAttr(default_factory=dict)
+
+    def path(self, instrument: str, granularity: str, price: str) -> Path:
+        return self.folder / f"{instrument}_{granularity}_{price}.pkl"
+
+    def _coverage_path(self, instrument: str, granularity: str, price: str) -> Path:
+        return self.path(instrument, granularity, price).with_suffix(".json")
+
+    def coverage(self, instrument: str, granularity: str, price: str) -> list:
+        """
+        Returns the sorted, non-overlapping list of (from, to) datetime ranges held by the store.
+        """
+        path = self._coverage_path(instrument, granularity, price)
+        if not path.exists():
+            return []
+        with open(path) as f:
+            ranges = json.load(f)
+        return [(dt.strptime(a, DATE_FORMAT), dt.strptime(b, DATE_FORMAT)) for a, b in ranges]
+
+    def missing(
+        self, instrument: str, granularity: str, price: str, date_from: str, date_to: str
+    ) -> list:
+        """
+        Returns the (from, to) ranges, as date strings, of the requested range not held by the store.
+        """
+        start = dt.strptime(date_from, DATE_FORMAT)
+        end = dt.strptime(date_to, DATE_FORMAT)
+        gaps = []
+        for covered_from, covered_to in self.coverage(instrument, granularity, price):
+            if covered_to <= start:
+                continue
+            if covered_from >= end:
+                break
+            if covered_from > start:
+                gaps.append((start, covered_from))
+            start = max(start, covered_to)
+        if start < end:
+            gaps.append((start, end))
+        return [(a.strftime(DATE_FORMAT), b.strftime(DATE_FORMAT)) for a, b in gaps]
+
+    def load(
+        self,
+        instrument: str,
+        granularity: str,
+        price: str,
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None,
+    ) -> pd.DataFrame:
+        """
+        Returns the stored candles, optionally restricted to the range [date_from, date_to].
+        """
+        key = (instrument, granularity, price)
+        if key not in self._frames:
+            path = self.path(*key)
+            self._frames[key] = pd.read_pickle(path) if path.exists() else pd.DataFrame()
+        df = self._frames[key]
+        if len(df) == 0 or (date_from is None and date_to is None):
+            return df
+        times = pd.to_datetime(df["time"]).dt.tz_localize(None)
+        mask = pd.Series(True, index=df.index)
+        if date_from is not None:
+            mask &= times >= dt.strptime(date_from, DATE_FORMAT)
+        if date_to is not None:
+            mask &= times <= dt.strptime(date_to, DATE_FORMAT)
+        return df[mask].reset_index(drop=True)
+
+    def merge(
+        self,
+        instrument: str,
+        granularity: str,
+        price: str,
+        df: pd.DataFrame,
+        date_from: str,
+        date_to: str,
+    ):
+        """
+        Merges candles fetched for [date_from, date_to] into the store and records the range as covered.
+
+        Candles already held are replaced by the new ones, so a previously incomplete candle is updated.
+        """
+        key = (instrument, granularity, price)
+        stored = self.load(*key)
+        if len(df) > 0:
+            merged = pd.concat([stored, df], ignore_index=True) if len(stored) else df
+            merged = (
+                merged.drop_duplicates(subset="time", keep="last")
+                .sort_values("time")
+                .reset_index(drop=True)
+            )
+            self.folder.mkdir(parents=True, exist_ok=True)
+            merged.to_pickle(self.path(*key))
+            self._frames[key] = merged
+
+        covered_to = min(dt.strptime(date_to, DATE_FORMAT), dt.now(timezone.utc).replace(tzinfo=None))
+        if len(df) > 0 and not df["complete"].astype(bool).all():
+            first_incomplete = df.loc[~df["complete"].astype(bool), "time"].min()
+            covered_to = min(
+                covered_to, pd.Timestamp(first_incomplete).tz_localize(None).to_pydatetime()
+            )
+        covered_from = dt.strptime(date_from, DATE_FORMAT)
+        if covered_from < covered_to:
+            self._add_coverage(key, covered_from, covered_to)
+
+    def _add_coverage(self, key: tuple, covered_from: dt, covered_to: dt):
+        ranges = sorted(self.coverage(*key) + [(covered_from, covered_to)])
+        merged = [ranges[0]]
+        for a, b in ranges[1:]:
+            if a <= merged[-1][1]:
+                merged[-1] = (merged[-1][0], max(merged[-1][1], b))
+            else:
+                merged.append((a, b))
+        self.folder.mkdir(parents=True, exist_ok=True)
+        with open(self._coverage_path(*key), "w") as f:
+            json.dump(
+                [[a.strftime(DATE_FORMAT), b.strftime(DATE_FORMAT)] for a, b in merged], f
+            )
+
+    def read_through(
+        self,
+        fetch: Callable[[str, str], pd.DataFrame],
+        instrument: str,
+        granularity: str,
+        price: str,
+        date_from: str,
+        date_to: str,
+    ) -> pd.DataFrame:
+        """
+        Fetches the gaps of [date_from, date_to] missing from the store, merges them and returns the full range.
+
+        Args:
+            fetch (Callable): Function taking (date_from, date_to) and returning the candles of that range.
+            instrument (str): Instrument name (e.g., "GBP_JPY").
+            granularity (str): Candle granularity (e.g., "H1").
+            price (str): Price components (e.g., "MBA").
+            date_from (str): Start of the range. Date format must be YYYY-MM-DDTHH:MM:SSZ.
+            date_to (str): End of the range. Date format must be YYYY-MM-DDTHH:MM:SSZ.
+
+        Returns:
+            pd.DataFrame: The candles of the requested range.
+        """
+        for gap_from, gap_to in self.missing(
+            instrument, granularity, price, date_from, date_to
+        ):
+            self.merge(
+                instrument, granularity, price, fetch(gap_from, gap_to), gap_from, gap_to
+            )
+        return self.load(instrument, granularity, price, date_from, date_to)
@@ -1,6 +1,37 @@
+import functools
+
 from .indicators.base import Indicator
+import numpy as np
 import pandas as pd
 
+# Duration of each granularity in minutes (W and M are nominal: 7 and 30 days)
+GRANULARITY_MINUTES = {
+    "M1": 1,
+    "M5": 5,
+    "M15": 15,
+    "M30": 30,
+    "H1": 60,
+    "H4": 240,
+    "D": 1440,
+    "W": 10080,
+    "M": 43200,
+}
+
+WEEKDAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+
+
+@functools.cache
+def load_env() -> bool:
+    """
+    Loads the .env file (account IDs and access tokens) into the environment variables, once.
+
+    Returns:
+        bool: Whether a .env file was found.
+    """
+    from dotenv import load_dotenv
+
+    return load_dotenv()
+
 
 def generate_indicators(*indicators: Indicator):
     """
@@ -45,3 +76,68 @@ def set_data_index_and_time_str(df: pd.Series | pd.DataFrame):
     df["time_str"] = df["time"].dt.strftime(" %-b %d, '%y %H:%M")
     df.set_index("time", inplace=True)
     return df
+
+
+def candle_start(
+    times: pd.DatetimeIndex | pd.Timestamp,
+    granularity: str,
+    daily_alignment: int = 17,
+    alignment_timezone: str = "America/New_York",
+    weekly_alignment: str = "Friday",
+) -> pd.DatetimeIndex | pd.Timestamp:
+    """
+    Returns the start time of the candle containing each time, with the OANDA candle alignment.
+
+    Minute granularities are aligned in UTC. Hourly, daily, weekly and monthly candles are aligned to the
+    daily alignment hour in the alignment timezone (17:00 America/New_York by default): weekly candles start
+    on the weekly alignment day and monthly candles on the last day of the previous month.
+
+    Args:
+        times (pd.DatetimeIndex | pd.Timestamp): UTC times (naive times are assumed to be UTC).
+        granularity (str): The candle granularity (e.g., "H4").
+        daily_alignment (int): Hour of the day candles are aligned to. Default is 17.
+        alignment_timezone (str): Timezone of the daily alignment. Default is "America/New_York".
+        weekly_alignment (str): Day weekly candles start on. Default is "Friday".
+
+    Returns:
+        pd.DatetimeIndex | pd.Timestamp: The UTC candle start times.
+    """
+    scalar = isinstance(times, pd.Timestamp)
+    index = pd.DatetimeIndex([times] if scalar else times)
+    if index.tz is None:
+        index = index.tz_localize("UTC")
+    else:
+        index = index.tz_convert("UTC")
+
+    minutes = GRANULARITY_MINUTES[granularity]
+    if minutes < 60:
+        start = index.floor(f"{minutes}min")
+    else:
+        local = index.tz_convert(alignment_timezone).tz_localize(None)
+        alignment = pd.Timedelta(hours=daily_alignment)
+        if granularity == "M":
+            # Monthly candles open at the daily alignment hour of the last day of the previous month
+            next_day = pd.Timedelta(days=1) - alignment
+            local_start = (local + next_day).to_period("M").to_timestamp() - next_day
+        elif granularity == "W":
+            days = (local - alignment).normalize()
+            offset = (days.dayofweek - WEEKDAYS.index(weekly_alignment)) % 7
+            local_start = days - pd.to_timedelta(offset, unit="D") + alignment
+        else:
+            local_start = (local - alignment).floor(f"{minutes}min") + alignment
+        start = local_start.tz_localize(
+            alignment_timezone,
+            ambiguous=np.ones(len(local_start), dtype=bool),
+            nonexistent="shift_forward",
+        ).tz_convert("UTC")
+    return start[0] if scalar else start
+
+
+def candle_end(
+    start: pd.DatetimeIndex | pd.Timestamp, granularity: str, **alignment
+) -> pd.DatetimeIndex | pd.Timestamp:
+    """
+    Returns the end (the start of the next candle) of candles starting at `start`. See `candle_start`.
+    """
+    duration = pd.Timedelta(minutes=GRANULARITY_MINUTES[granularity] * 1.5)
+    return candle_start(start + duration, granularity, **alignment)
@@ -0,0 +1,111 @@
+import requests
+
+from benchmarks.fakes import (
+    FakeOandaClient,
+    fill_transaction,
+    make_account,
+    transaction_heartbeat,
+)
+from galgoz import Galgoz
+from galgoz.account import AccountState
+
+
+def make_state(client, **kwargs):
+    gz = Galgoz(client=client, account_id="101-001-0000000-001")
+    return AccountState(gz=gz, **{"reconnect_delay": 0, "max_reconnects": 0, **kwargs})
+
+
+def test_state_follows_transactions():
+    account = make_account([("1", "GBP_JPY", 100), ("2", "EUR_USD", -50)])
+    session = [
+        fill_transaction(101, "GBP_JPY", 200, opened=3, balance=100010),
+        fill_transaction(102, "GBP_JPY", -100, closed=[(1, -100)], balance=100020),
+        fill_transaction(103, "EUR_USD", 20, reduced=(2, 20), balance=100030),
+        transaction_heartbeat(103),
+    ]
+    client = FakeOandaClient(account=account, transaction_sessions=[session])
+    state = make_state(client)
+    state.run()
+
+    assert state.reconciliations == 1
+    assert state.last_transaction_id == "103"
+    assert state.balance == 100030
+    assert state.position("GBP_JPY") == 200
+    assert state.position("EUR_USD") == -30
+    assert state.position("USD_JPY") == 0
+    assert state.trade("1") is None
+    assert [trade["id"] for trade in state.trades_for("GBP_JPY")] == ["3"]
+
+    # The server now holds the same state: reconciling finds no drift
+    client.account = make_account(
+        [("2", "EUR_USD", -30), ("3", "GBP_JPY", 200)], balance=100030, last_id=103
+    )
+    assert state.reconcile() == 0
+
+
+def test_reconcile_on_gap_and_reconnect():
+    account = make_account([("1", "GBP_JPY", 100)])
+    client = FakeOandaClient(
+        account=account,
+        transaction_sessions=[
+            [
+                fill_transaction(101, "GBP_JPY", 50, opened=2),
+                requests.ConnectionError("connection dropped"),
+            ],
+            [fill_transaction(105, "GBP_JPY", 10, opened=6)],
+        ],
+    )
+    state = make_state(client, max_reconnects=1)
+    state.reconcile()
+    # Changes on the server while the stream is down
+    client.account = make_account(
+        [("1", "GBP_JPY", 100), ("2", "GBP_JPY", 50), ("4", "GBP_JPY", 25)], last_id=104
+    )
+    state.run(bootstrap=False)
+    # Reconciled after reconnecting, then trade 6 opened by the second session
+    assert state.reconciliations == 2
+    assert state.position("GBP_JPY") == 185
+    assert state.drift == 1  # Trade 4 was missed by the stream
+
+
+def test_gap_in_transaction_ids_reconciles():
+    client = FakeOandaClient(account=make_account([("1", "GBP_JPY", 100)]))
+    state = make_state(client)
+    state.reconcile()
+    client.account = make_account([("1", "GBP_JPY", 100), ("3", "GBP_JPY", 10)], last_id=103)
+    state.on_message(fill_transaction(103, "GBP_JPY", 10, opened=3))
+    assert state.reconciliations == 2
+    assert state.position("GBP_JPY") == 110 and state.last_transaction_id == "103"
+
+
+def test_heartbeat_reconciles_missed_transactions():
+    client = FakeOandaClient(account=make_account([("1", "GBP_JPY", 100)]))
+    state = make_state(client, reconcile_interval=3600)
+    state.reconcile()
+    state.on_message(transaction_heartbeat(100))
+    assert state.reconciliations == 1
+    client.account = make_account([], last_id=102)
+    state.on_message(transaction_heartbeat(102))
+    assert state.reconciliations == 2
+    assert state.position("GBP_JPY") == 0 and state.trades == {}
+
+
+def test_reduction_of_unknown_trade_reconciles():
+    client = FakeOandaClient(
+        account=make_account([("1", "GBP_JPY", 100)]),
+        transaction_sessions=[
+            [
+                fill_transaction(101, "EUR_USD", 20, reduced=(7, 20)),
+                fill_transaction(102, "GBP_JPY", 10, opened=8),
+            ]
+        ],
+    )
+    state = make_state(client)
+    state.reconcile()
+    # Trade 7 was opened before the stream started, unknown to the state
+    client.account = make_account([("1", "GBP_JPY", 100), ("7", "EUR_USD", -30)], last_id=101)
+    state.run(bootstrap=False)
+    assert state.reconciliations == 2
+    assert state.position("EUR_USD") == -30
+    # The stream went on after reconciling
+    assert state.position("GBP_JPY") == 110 and state.last_transaction_id == "102"
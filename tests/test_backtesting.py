@@ -0,0 +1,59 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from galgoz import DATA_FOLDER
+from galgoz.backtesting import Backtest, positions_from_signals, supertrend_signals
+from galgoz.indicators import QQE, SuperTrend
+from galgoz.utils import set_data_index_and_time_str
+
+
+@pytest.fixture(scope="module")
+def candles():
+    data = pd.read_pickle(DATA_FOLDER / "GBP_JPY_H4.pkl").iloc[-2000:]
+    return set_data_index_and_time_str(data)
+
+
+def test_positions_from_signals():
+    signals = np.array([[0, 1], [1, 0], [0, 0], [-1, 0], [0, -1]], dtype=float)
+    expected = np.array([[0, 1], [1, 1], [1, 1], [-1, 1], [-1, -1]], dtype=float)
+    np.testing.assert_array_equal(positions_from_signals(signals), expected)
+
+
+def test_fills_at_bid_and_ask():
+    data = pd.DataFrame(
+        {
+            "mid_o": [100.0, 101.0, 103.0, 102.0],
+            "mid_c": [101.0, 103.0, 102.0, 104.0],
+            "bid_o": [99.9, 100.9, 102.9, 101.9],
+            "ask_o": [100.1, 101.1, 103.1, 102.1],
+        },
+        index=pd.date_range("2024-01-01", periods=4, freq="h", tz="UTC"),
+    )
+    bt = Backtest(data=data, signals=pd.Series([1, 0, -1, 0], index=data.index), units=2)
+    stats = bt.run()
+    # Buy 2 at the ask of bar 1 (101.1), reverse at the bid of bar 3 (101.9) and hold -2 to the last close
+    assert stats["total_pnl"] == pytest.approx(2 * (101.9 - 101.1) + 2 * (101.9 - 104.0))
+    assert stats["trades"] == 2
+    assert list(bt.results["position"]) == [0, 2, 2, -2]
+
+
+def test_sweep_matches_single_backtests(candles):
+    signals = supertrend_signals(candles, atr_periods=[10, 14], multipliers=[2.0, 3.0, 6.5])
+    sweep = Backtest(data=candles, signals=signals).run()
+    assert len(sweep) == 6
+    for atr_period, multiplier in [(10, 2.0), (14, 6.5)]:
+        indicator = SuperTrend(candles, atr_period=atr_period, multiplier=multiplier)
+        single = Backtest(data=candles, indicators=[indicator]).run()
+        pd.testing.assert_series_equal(
+            single, sweep.loc[(atr_period, multiplier)], check_names=False
+        )
+
+
+def test_qqe_signals(candles):
+    qqe = QQE(candles)
+    signals = qqe.signals()
+    above = qqe.output["qqe_fast"] > qqe.output["qqe_slow"]
+    assert (signals[signals == 1].index.isin(above[above].index)).all()
+    assert set(np.unique(signals)) <= {-1, 0, 1}
+    assert Backtest(data=candles, indicators=[qqe]).run()["trades"] > 0
@@ -0,0 +1,48 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from galgoz import DATA_FOLDER
+from galgoz.indicators import HMA, MFI, QQE, RSI, SG, WPR, SuperTrend
+from galgoz.utils import set_data_index_and_time_str
+
+
+@pytest.fixture(scope="module")
+def candles():
+    data = pd.read_pickle(DATA_FOLDER / "GBP_JPY_H4.pkl").iloc[-3000:]
+    data = set_data_index_and_time_str(data)
+    return data[~data.index.duplicated()]
+
+
+@pytest.mark.parametrize(
+    "indicator_cls, grid, atol",
+    [
+        (RSI, {"window": [2, 5, 14, 50, 200]}, 1e-10),
+        (WPR, {"window": [5, 14, 50]}, 0),
+        (MFI, {"window": [5, 14, 50]}, 1e-8),
+        (HMA, {"window": [4, 9, 50, 169]}, 1e-8),
+        (SG, {"window": [51, 101], "order": [2, 3]}, 0),
+        (SuperTrend, {"atr_period": [10, 14], "multiplier": [3.0, 6.5]}, 0),
+    ],
+)
+def test_batch_matches_indicator(candles, indicator_cls, grid, atol):
+    batched = indicator_cls.batch(candles, **grid)
+    names = list(grid)
+    assert batched.shape == (len(candles), np.prod([len(v) for v in grid.values()]))
+    assert batched.columns.names == names
+    for column in batched.columns:
+        params = dict(zip(names, np.atleast_1d(column)))
+        expected = indicator_cls(candles, **params).output
+        np.testing.assert_allclose(batched[column], expected, rtol=0, atol=atol)
+
+
+def test_scalar_parameters(candles):
+    batched = RSI.batch(candles, window=14)
+    assert list(batched.columns) == [14]
+
+
+def test_generic_batch_loops_over_combinations(candles):
+    batched = QQE.batch(candles, length=[8, 14], factor=1.618)
+    assert batched.columns.names == ["length", "factor", None]
+    expected = QQE(candles, length=14, factor=1.618).output
+    pd.testing.assert_frame_equal(batched[(14, 1.618)], expected, check_names=False)
@@ -0,0 +1,21 @@
+from benchmarks import suite
+
+
+def test_suite_runs_offline():
+    results = suite.run("candles_df", sizes=(100,), repeat=1)
+    assert set(results["results"]) == {"candles_df[100]"}
+    assert results["results"]["candles_df[100]"]["min"] > 0
+
+    report, regressions = suite.compare(results, results)
+    assert regressions == []
+    assert "candles_df[100]" in report
+
+
+def test_compare_flags_regressions():
+    baseline = {"results": {"a[10]": {"min": 1.0}, "b[10]": {"min": 1.0}}}
+    results = {"results": {"a[10]": {"min": 2.0}, "b[10]": {"min": 0.5}, "c[10]": {"min": 1.0}}}
+
+    report, regressions = suite.compare(results, baseline, threshold=1.5)
+
+    assert regressions == ["a[10]"]
+    assert "REGRESSION" in report and "faster" in report and "new" in report
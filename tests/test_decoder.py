@@ -0,0 +1,33 @@
+from datetime import datetime as dt
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.fakes import make_candles
+from benchmarks.reference import json_normalize_candles
+from galgoz.decoder import decode_candles
+
+
+def test_decode_matches_json_normalize():
+    candles = make_candles(dt(2024, 12, 10), dt(2024, 12, 18), "H1")
+    expected = json_normalize_candles(candles)
+    res = decode_candles(candles, time_index=False)
+    assert list(res.columns) == list(expected.columns)
+    pd.testing.assert_frame_equal(res, expected, check_dtype=False)
+
+
+def test_decode_time_index():
+    candles = make_candles(dt(2024, 12, 10), dt(2024, 12, 18), "M15", price="M")
+    res = decode_candles(candles)
+    assert isinstance(res.index, pd.DatetimeIndex)
+    assert str(res.index.tz) == "UTC"
+    assert res.index[0] == pd.Timestamp("2024-12-10", tz="UTC")
+    assert list(res.columns) == ["complete", "volume", "mid_o", "mid_h", "mid_l", "mid_c"]
+    assert res["complete"].dtype == np.bool_
+    assert res["volume"].dtype == np.int64
+    assert res["mid_c"].dtype == np.float64
+    assert not res["complete"].iloc[-1]
+
+
+def test_decode_empty():
+    assert decode_candles([]).empty
@@ -0,0 +1,207 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from galgoz.execution import ExecutionClient, RateLimiter
+
+
+class MockOanda(BaseHTTPRequestHandler):
+    # Minimal OANDA v20 orders and trades endpoints, see make_server
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def _reply(self, status, body):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _record(self):
+        state = self.server.state
+        length = int(self.headers.get("Content-Length", 0))
+        body = json.loads(self.rfile.read(length)) if length else None
+        with state["lock"]:
+            state["requests"].append((self.command, self.path, body))
+            state["ports"].add(self.client_address[1])
+        time.sleep(state["delay"])
+        return state, body
+
+    def do_POST(self):
+        state, body = self._record()
+        order = body["order"]
+        client_id = order["clientExtensions"]["id"]
+        with state["lock"]:
+            failures = state["fail"].get(client_id, 0)
+            if failures:
+                state["fail"][client_id] = failures - 1
+            duplicate = client_id in state["orders"]
+            if not duplicate:
+                state["orders"][client_id] = order
+        if duplicate:
+            return self._reply(
+                400,
+                {
+                    "orderRejectTransaction": {"rejectReason": "CLIENT_ORDER_ID_ALREADY_EXISTS"},
+                    "errorCode": "CLIENT_ORDER_ID_ALREADY_EXISTS",
+                    "errorMessage": "Client order ID already exists",
+                },
+            )
+        if failures:
+            # The order was created but the response is an error, as with a dropped connection
+            return self._reply(503, {"errorMessage": "Service unavailable"})
+        self._reply(201, {"orderCreateTransaction": {"type": "MARKET_ORDER", **order}})
+
+    def do_GET(self):
+        state, _ = self._record()
+        if "/trades/" in self.path:
+            trade_id = self.path.rsplit("/", 1)[-1]
+            if trade_id not in state["trades"]:
+                return self._reply(404, {"errorMessage": "The Trade specified does not exist"})
+            units = state["trades"][trade_id]
+            trade = {"id": trade_id, "state": "OPEN" if units else "CLOSED", "currentUnits": str(units)}
+            return self._reply(200, {"trade": trade})
+        client_id = self.path.rsplit("@", 1)[-1]
+        if client_id in state["orders"]:
+            return self._reply(200, {"order": state["orders"][client_id]})
+        self._reply(404, {"errorMessage": "Order not found"})
+
+    def do_PUT(self):
+        state, body = self._record()
+        trade_id = self.path.split("/")[-2]
+        with state["lock"]:
+            unavailable = state["fail"].get(trade_id, 0)
+            if unavailable:
+                state["fail"][trade_id] = unavailable - 1
+        if unavailable:
+            # Rejected before the trade was closed
+            return self._reply(503, {"errorMessage": "Service unavailable"})
+        with state["lock"]:
+            units = state["trades"].get(trade_id, 0)
+            if units:
+                closed = units if body["units"] == "ALL" else min(units, int(body["units"]))
+                state["trades"][trade_id] = units - closed
+            lost = units and state["lost"].pop(trade_id, False)
+        if not units:
+            return self._reply(404, {"errorMessage": "The Trade specified does not exist"})
+        if lost:
+            # The trade was closed but the connection drops before the response
+            self.close_connection = True
+            return
+        self._reply(200, {"orderFillTransaction": {"tradesClosed": [{"tradeID": trade_id}]}})
+
+
+@pytest.fixture
+def server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), MockOanda)
+    server.state = dict(
+        lock=threading.Lock(),
+        requests=[],
+        ports=set(),
+        orders={},
+        fail={},
+        trades={},
+        lost={},
+        delay=0.1,
+    )
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def make_client(server, **kwargs):
+    host, port = server.server_address
+    return ExecutionClient(
+        account_id="ACC", access_token="token", api_url=f"http://{host}:{port}", **kwargs
+    )
+
+
+def test_orders_are_submitted_concurrently(server):
+    with make_client(server, max_workers=4) as client:
+        start = time.perf_counter()
+        results = client.create_orders(
+            [{"instrument": "GBP_JPY", "units": 100 * (i + 1)} for i in range(8)]
+        )
+        elapsed = time.perf_counter() - start
+    assert all(result.ok and result.status == 201 for result in results)
+    assert [r.response["orderCreateTransaction"]["units"] for r in results] == [
+        str(100 * (i + 1)) for i in range(8)
+    ]
+    assert all(0.1 <= result.latency < 1 for result in results)
+    assert elapsed < 0.6, "8 orders of 0.1 s with 4 workers should take about 0.2 s"
+    # Connections are pooled and reused
+    assert len(server.state["ports"]) <= 4
+
+
+def test_retry_is_idempotent(server):
+    server.state["fail"]["order-1"] = 1
+    with make_client(server, backoff=0.01) as client:
+        result = client.create_order("GBP_JPY", 100, client_id="order-1")
+        again = client.create_order("GBP_JPY", 100, client_id="order-1")
+    assert result.ok and result.attempts == 3  # 503, duplicate rejection, order lookup
+    assert result.response["order"]["clientExtensions"]["id"] == "order-1"
+    assert again.ok and again.attempts == 2
+    assert len(server.state["orders"]) == 1
+    methods = [method for method, _, _ in server.state["requests"]]
+    assert methods == ["POST", "POST", "GET", "POST", "GET"]
+
+
+def test_close_trades(server):
+    server.state["trades"].update({"1": 100, "3": 100})
+    with make_client(server) as client:
+        results = client.close_trades(["1", "404", "3"])
+    assert [result.ok for result in results] == [True, False, True]
+    assert results[1].status == 404 and results[1].attempts == 1
+    assert results[1].error == "The Trade specified does not exist"
+    assert results[2].trade_id == "3"
+
+
+def test_lost_close_response_is_not_retried(server):
+    server.state["trades"].update({"1": 100, "2": 100})
+    server.state["lost"].update({"1": True, "2": True})
+    with make_client(server, backoff=0.01) as client:
+        partial = client.submit_close("1", units="40").result()
+        full = client.submit_close("2").result()
+    assert partial.ok and partial.attempts == 3  # units before, lost close, trade check
+    assert partial.response["trade"]["currentUnits"] == "60"
+    assert full.ok and full.attempts == 2  # lost close, trade check
+    assert full.response["trade"]["state"] == "CLOSED"
+    assert server.state["trades"] == {"1": 60, "2": 0}
+    closes = [path for method, path, _ in server.state["requests"] if method == "PUT"]
+    assert len(closes) == 2
+
+
+def test_unexecuted_close_is_retried(server):
+    server.state["trades"]["1"] = 100
+    server.state["fail"]["1"] = 1
+    with make_client(server, backoff=0.01) as client:
+        result = client.submit_close("1").result()
+    assert result.ok and result.status == 200 and result.attempts == 3  # 503, trade check, close
+    assert "orderFillTransaction" in result.response
+    assert server.state["trades"]["1"] == 0
+
+
+def test_connection_errors_are_reported():
+    client = ExecutionClient(
+        account_id="ACC", access_token="token", api_url="http://127.0.0.1:9", retries=1, backoff=0
+    )
+    result = client.create_order("GBP_JPY", 100)
+    client.close()
+    assert not result.ok and result.status is None and result.attempts == 2
+    assert result.error
+
+
+def test_rate_limiter():
+    limiter = RateLimiter(rate=50, burst=5)
+    start = time.perf_counter()
+    for _ in range(15):
+        limiter.acquire()
+    assert time.perf_counter() - start >= 0.18  # 10 requests beyond the burst at 50 per second
@@ -0,0 +1,52 @@
+import time
+
+from benchmarks.fakes import FakeOandaClient
+from galgoz import Galgoz
+from galgoz.galgoz import _date_windows
+
+
+def test_date_windows_cover_range():
+    windows = _date_windows("2024-01-01T00:00:00Z", "2024-03-01T00:00:00Z", "M5")
+    assert windows[0][0].isoformat() == "2024-01-01T00:00:00"
+    assert windows[-1][1].isoformat() == "2024-03-01T00:00:00"
+    for (_, end), (start, _) in zip(windows[:-1], windows[1:]):
+        assert end == start
+
+
+def test_concurrent_fetch_matches_sequential():
+    kwargs = dict(
+        granularity="M5", date_from="2024-01-01T00:00:00Z", date_to="2024-03-01T00:00:00Z"
+    )
+    sequential = Galgoz(client=FakeOandaClient()).fetch_candles(**kwargs)
+    concurrent = Galgoz(client=FakeOandaClient()).fetch_candles(
+        max_workers=4, **kwargs
+    )
+    times = [candle["time"] for candle in concurrent]
+    assert concurrent == sequential
+    assert times == sorted(set(times)), "Candles are not unique and in time order"
+
+
+def test_fetch_retries_failed_windows():
+    client = FakeOandaClient(failures=2)
+    gz = Galgoz(client=client)
+    candles = gz.fetch_candles(
+        granularity="H1",
+        date_from="2024-01-01T00:00:00Z",
+        date_to="2024-01-02T00:00:00Z",
+        backoff=0,
+    )
+    assert len(candles) == 25
+    assert len(client.requests) == 3
+
+
+def test_concurrent_fetch_is_faster():
+    kwargs = dict(
+        granularity="M1", date_from="2024-01-01T00:00:00Z", date_to="2024-01-15T00:00:00Z"
+    )
+    start = time.perf_counter()
+    Galgoz(client=FakeOandaClient(latency=0.25)).fetch_candles(**kwargs)
+    sequential = time.perf_counter() - start
+    start = time.perf_counter()
+    Galgoz(client=FakeOandaClient(latency=0.25)).fetch_candles(max_workers=8, **kwargs)
+    concurrent = time.perf_counter() - start
+    assert concurrent < sequential * 0.7
@@ -0,0 +1,43 @@
+import json
+import subprocess
+import sys
+
+# Seconds allowed for `import galgoz` (about 0.6 s on a developer machine, 2.5 s before the lazy imports)
+IMPORT_BUDGET = 1.5
+
+# Imported on first use only
+LAZY_MODULES = ("plotly", "vectorbt", "scipy", "numba", "dotenv")
+
+SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+import galgoz
+elapsed = time.perf_counter() - start
+print(json.dumps({"elapsed": elapsed, "modules": sorted({name.split(".")[0] for name in sys.modules})}))
+"""
+
+
+def import_galgoz() -> dict:
+    output = subprocess.run(
+        [sys.executable, "-c", SCRIPT], capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.splitlines()[-1])
+
+
+def test_heavy_dependencies_are_not_imported():
+    modules = import_galgoz()["modules"]
+    assert [module for module in LAZY_MODULES if module in modules] == []
+
+
+def test_import_time_budget():
+    # Best of three, the first run may also pay for writing the bytecode caches
+    elapsed = min(import_galgoz()["elapsed"] for _ in range(3))
+    assert elapsed < IMPORT_BUDGET, f"import galgoz took {elapsed:.2f}s"
+
+
+def test_client_is_built_on_first_instance():
+    from galgoz import Galgoz, default_client
+
+    gz = Galgoz(store=None)
+    assert gz.client is default_client("practice")
+    assert Galgoz(store=None).client is gz.client
@@ -0,0 +1,90 @@
+import pandas as pd
+import pytest
+
+from galgoz import DATA_FOLDER
+from galgoz.indicators import HMA, MFI, RSI, SuperTrend, Indicator, IndicatorCache
+from galgoz.utils import set_data_index_and_time_str
+
+
+@pytest.fixture(scope="module")
+def candles():
+    return set_data_index_and_time_str(
+        pd.read_pickle(DATA_FOLDER / "GBP_JPY_H4.pkl").iloc[-3000:]
+    )
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    cache = IndicatorCache()
+    monkeypatch.setattr(Indicator, "cache", cache)
+    return cache
+
+
+def test_repeated_construction_hits_cache(candles, cache):
+    first = SuperTrend(candles, atr_period=14, multiplier=6.5)
+    second = SuperTrend(candles, atr_period=14, multiplier=6.5, row=3)
+    assert cache.info()["hits"] == 1 and cache.info()["misses"] == 1
+    pd.testing.assert_series_equal(first.output, second.output)
+
+    SuperTrend(candles, atr_period=10, multiplier=6.5)
+    MFI(candles, window=14)
+    SuperTrend(candles.iloc[:-1], atr_period=14, multiplier=6.5)
+    changed = candles.copy()
+    changed.loc[changed.index[-1], "mid_c"] += 0.01
+    SuperTrend(changed, atr_period=14, multiplier=6.5)
+    assert cache.misses == 5 and cache.hits == 1
+
+
+def test_frames_differing_in_the_middle_rows_do_not_share_outputs(candles, cache):
+    first = RSI(candles, window=14)
+    perturbed = candles.copy()
+    perturbed.iloc[1001:1011, perturbed.columns.get_loc("mid_c")] += 5
+    second = RSI(perturbed, window=14)
+    assert cache.hits == 0 and cache.misses == 2
+    assert not second.output.iloc[1001:1011].equals(first.output.iloc[1001:1011])
+    pd.testing.assert_series_equal(second.output, RSI(perturbed, window=14).output)
+    assert cache.hits == 1
+
+
+def test_cached_output_is_not_shared(candles, cache):
+    first = HMA(candles, window=50)
+    first.output.iloc[-1] = 0.0
+    second = HMA(candles, window=50)
+    assert cache.hits == 1
+    assert second.output.iloc[-1] != 0.0
+    expected = second.output.iloc[-1]
+    # Writing through the values, as pandas < 3 does for shallow copies
+    values = second.output.to_numpy()
+    values.flags.writeable = True
+    values[-2] = 0.0
+    second.output.iloc[-1] = 0.0
+    third = HMA(candles, window=50)
+    assert cache.hits == 2
+    assert third.output.iloc[-1] == expected and third.output.iloc[-2] != 0.0
+
+
+def test_lru_eviction(candles, cache):
+    cache.maxsize = 2
+    for window in (10, 20, 30):
+        MFI(candles, window=window)
+    assert cache.info()["entries"] == 2
+    MFI(candles, window=10)
+    assert cache.hits == 0
+    MFI(candles, window=30)
+    assert cache.hits == 1
+
+
+def test_disk_persistence(candles, cache, tmp_path):
+    cache.folder = tmp_path
+    expected = MFI(candles, window=14).output
+    cache.clear()
+    output = MFI(candles, window=14).output
+    assert cache.hits == 1 and cache.misses == 0
+    pd.testing.assert_series_equal(output, expected)
+
+
+def test_disabled_cache(candles, cache):
+    cache.enabled = False
+    MFI(candles)
+    MFI(candles)
+    assert cache.info() == dict(hits=0, misses=0, entries=0, bytes=0)
@@ -1,7 +1,200 @@
-from galgoz.indicators.base import Indicator
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks.reference import reference_supertrend
+from benchmarks.synthetic import synthetic_candles
+from galgoz import DATA_FOLDER
+from galgoz.indicators import HMA, MFI, QQE, RSI, SG, WPR, Hline, SuperTrend
+from galgoz.indicators.oscillators import qqe
+from galgoz.indicators.trend import supertrend
+from galgoz.utils import set_data_index_and_time_str
+from galgoz.indicators.base import Indicator, as_float64
+
 
 def test_base_empty_indicator():
     indicator = Indicator(name="Test Indicator")
     assert indicator.name == "Test Indicator"
     assert indicator.data is None
-    assert indicator.output is None
\ No newline at end of file
+    assert indicator.output is None
+
+
+@pytest.fixture(scope="module")
+def candles():
+    data = pd.read_pickle(DATA_FOLDER / "GBP_JPY_H4.pkl").iloc[-3000:]
+    return set_data_index_and_time_str(data)
+
+
+@pytest.mark.parametrize("period, multiplier", [(14, 6.5), (10, 3.0), (50, 1.5)])
+def test_supertrend_matches_reference(candles, period, multiplier):
+    expected = reference_supertrend(
+        candles.mid_h, candles.mid_l, candles.mid_c, period, multiplier
+    )
+    res = supertrend(candles.mid_h, candles.mid_l, candles.mid_c, period, multiplier)
+    for r, e in zip(res, expected):
+        np.testing.assert_array_equal(r.to_numpy(), e.to_numpy())
+
+
+def test_supertrend_indicator(candles):
+    st = SuperTrend(candles, atr_period=10, multiplier=3.0)
+    expected = reference_supertrend(candles.mid_h, candles.mid_l, candles.mid_c, 10, 3.0)
+    np.testing.assert_array_equal(st.output.to_numpy(), expected[0].to_numpy())
+
+
+def test_indicator_data_is_projected(candles):
+    indicator = SuperTrend(candles)
+    assert list(indicator.data.columns) == ["mid_h", "mid_l", "mid_c"]
+    close = as_float64(indicator.data.mid_c)
+    assert np.shares_memory(close, candles["mid_c"].to_numpy())
+    assert not close.flags.writeable
+    with pytest.raises(ValueError, match="mid_h"):
+        SuperTrend(candles.drop(columns="mid_h"))
+
+
+def reference_qqe(data, length=8, smooth=1, factor=1.618):
+    # The Python loops qqe() had before the compiled kernel
+    import talib
+
+    df = data.copy()
+    _rsi = talib.RSI(df["mid_c"].to_numpy(dtype=np.float64), timeperiod=length)
+    _qqe_fast = pd.Series(data=_rsi, index=df.index).ewm(span=smooth).mean().to_numpy()
+    df["qqe_fast"] = _qqe_fast
+    rsi_delta = df["qqe_fast"].diff().abs().values
+    wmma = np.zeros(len(df))
+    atr_rsi = np.zeros(len(df))
+    for i in range(1, len(df)):
+        wmma[i] = rsi_delta[i] / length + (1 - 1 / length) * (
+            wmma[i - 1] if not np.isnan(wmma[i - 1]) else 0
+        )
+        atr_rsi[i] = wmma[i] / length + (1 - 1 / length) * (
+            atr_rsi[i - 1] if not np.isnan(atr_rsi[i - 1]) else 0
+        )
+    qqe_up = _qqe_fast + atr_rsi * factor
+    qqe_down = _qqe_fast - atr_rsi * factor
+
+    qqe_slow = np.zeros(len(df))
+    for i in range(1, len(df)):
+        prev = qqe_slow[i - 1] if not np.isnan(qqe_slow[i - 1]) else 0
+        if qqe_up[i] < prev:
+            qqe_slow[i] = qqe_up[i]
+        elif _qqe_fast[i] > prev and _qqe_fast[i - 1] < prev:
+            qqe_slow[i] = qqe_down[i]
+        elif qqe_down[i] > prev:
+            qqe_slow[i] = qqe_down[i]
+        elif _qqe_fast[i] < prev and _qqe_fast[i - 1] > prev:
+            qqe_slow[i] = qqe_up[i]
+        else:
+            qqe_slow[i] = qqe_slow[i - 1]
+
+    df["qqe_slow"] = qqe_slow
+    return df
+
+
+@pytest.mark.parametrize("length, smooth, factor", [(8, 1, 1.618), (14, 5, 4.236)])
+def test_qqe_matches_reference(candles, length, smooth, factor):
+    expected = reference_qqe(candles, length, smooth, factor)
+    res = qqe(candles, length, smooth, factor)
+    assert list(res.columns) == ["qqe_fast", "qqe_slow"]
+    assert res.index.equals(candles.index)
+    np.testing.assert_array_equal(res["qqe_fast"], expected["qqe_fast"])
+    np.testing.assert_array_equal(res["qqe_slow"], expected["qqe_slow"])
+
+
+def test_qqe_does_not_modify_data(candles):
+    columns = list(candles.columns)
+    QQE(candles)
+    assert list(candles.columns) == columns
+
+
+@pytest.mark.parametrize(
+    "indicator_cls, kwargs",
+    [
+        (Hline, dict(yvalue=75)),
+        (WPR, dict(window=14)),
+        (RSI, dict(window=14)),
+        (QQE, dict(length=8, smooth=5)),
+        (MFI, dict(window=11)),
+        (SG, dict(window=101, order=3)),
+        (SG, dict(window=100, order=2, causal=True)),
+        (HMA, dict(window=55)),
+        (SuperTrend, dict(atr_period=10, multiplier=3.0)),
+    ],
+)
+def test_streaming_matches_run(candles, indicator_cls, kwargs):
+    full = indicator_cls(candles, **kwargs)
+    streamed = indicator_cls(candles.iloc[:2500], **kwargs)
+    streamed.extend(candles.iloc[2500:2900])
+    for _, bar in candles.iloc[2900:].iterrows():
+        streamed.append(bar)
+    assert streamed.output.index.equals(full.output.index)
+    np.testing.assert_allclose(
+        streamed.output.to_numpy(dtype=float),
+        full.output.to_numpy(dtype=float),
+        rtol=1e-9,
+        atol=1e-9,
+    )
+
+
+def test_append_cost_does_not_grow_with_history():
+    data = synthetic_candles(500_100)
+
+    def per_bar(n):
+        rsi = RSI(data.iloc[:n], window=14)
+        rsi.extend(data.iloc[n : n + 1])
+        bars = [data.iloc[i] for i in range(n + 1, n + 100)]
+        output = rsi.output
+        timings = []
+        for chunk in range(0, len(bars), 20):
+            start = time.perf_counter()
+            for bar in bars[chunk : chunk + 20]:
+                rsi.append(bar)
+            timings.append((time.perf_counter() - start) / 20)
+        # The history was not copied: the new output is a view of the same values
+        assert np.shares_memory(rsi.output.to_numpy(), output.to_numpy())
+        return min(timings)
+
+    assert per_bar(500_000) < 2 * per_bar(1_000)
+
+
+def test_appends_leave_earlier_outputs_unchanged(candles):
+    rsi = RSI(candles.iloc[:40], window=14)
+    rsi.extend(candles.iloc[40:41])
+    data, output = rsi.data, rsi.output
+    expected_data, expected_output = data.copy(), output.copy()
+    # Enough bars to reallocate the buffer twice
+    for _, bar in candles.iloc[41:200].iterrows():
+        rsi.append(bar)
+    pd.testing.assert_frame_equal(data, expected_data)
+    pd.testing.assert_series_equal(output, expected_output)
+    pd.testing.assert_series_equal(rsi.output.iloc[:41], expected_output)
+
+
+def test_causal_sg_matches_live_filter(candles):
+    from scipy.signal import savgol_filter
+
+    sg = SG(candles, window=101, order=3, causal=True)
+    close = candles["mid_c"].to_numpy()
+    assert sg.output.iloc[:100].isna().all()
+    for i in (100, 101, 1500, len(close) - 1):
+        live = savgol_filter(close[: i + 1], window_length=101, polyorder=3)[-1]
+        assert sg.output.iloc[i] == pytest.approx(live, rel=1e-9)
+    # New bars do not change the past output
+    past = SG(candles.iloc[:2000], window=101, order=3, causal=True).output
+    pd.testing.assert_series_equal(sg.output.iloc[:2000], past)
+    batched = SG.batch(candles, window=[101], order=[3], causal=True)
+    np.testing.assert_allclose(batched[(101, 3)], sg.output)
+
+
+def test_hma_is_weighted(candles):
+    def wma(values, window):
+        # Direct definition: weights 1 to window, the last bar weighing most
+        weights = np.arange(1, window + 1) / (window * (window + 1) / 2)
+        return pd.Series(values).rolling(window).apply(lambda w: w @ weights, raw=True)
+
+    close = candles["mid_c"].to_numpy()
+    expected = wma(2 * wma(close, 27) - wma(close, 55), 7)
+    hma = HMA(candles, window=55)
+    assert hma.output.iloc[:60].isna().all()
+    np.testing.assert_allclose(hma.output.to_numpy(dtype=float), expected, rtol=1e-12)
@@ -0,0 +1,76 @@
+import pandas as pd
+import requests
+
+from benchmarks.fakes import FakeOandaClient, heartbeat_message, price_message
+from galgoz import Galgoz
+from galgoz.indicators import RSI
+from galgoz.live import CandleAggregator, PriceStream
+
+
+def test_aggregator_builds_candles():
+    aggregator = CandleAggregator(granularity="M1")
+    aggregator.update(pd.Timestamp("2024-12-17T10:00:05Z"), 190.00, 190.02)
+    aggregator.update(pd.Timestamp("2024-12-17T10:00:30Z"), 190.10, 190.12)
+    aggregator.update(pd.Timestamp("2024-12-17T10:00:50Z"), 189.90, 189.92)
+    updated = aggregator.update(pd.Timestamp("2024-12-17T10:01:10Z"), 190.05, 190.07)
+    (candle, complete), (partial, partial_complete) = updated
+    assert complete and not partial_complete
+    assert candle.name == pd.Timestamp("2024-12-17T10:00:00Z")
+    assert candle["volume"] == 3
+    assert (candle["bid_o"], candle["bid_h"], candle["bid_l"], candle["bid_c"]) == (
+        190.00,
+        190.10,
+        189.90,
+        189.90,
+    )
+    assert candle["mid_h"] == 190.11
+    assert partial.name == pd.Timestamp("2024-12-17T10:01:00Z")
+
+
+def test_stream_dispatches_candles_and_backfills():
+    sessions = [
+        [
+            price_message("2024-12-17T10:00:05.000000000Z", "GBP_JPY", 190.00, 190.02),
+            price_message("2024-12-17T10:00:40.000000000Z", "GBP_JPY", 190.10, 190.12),
+            heartbeat_message("2024-12-17T10:01:02.000000000Z"),
+            requests.ConnectionError("connection dropped"),
+        ],
+        [
+            price_message("2024-12-17T10:05:20.000000000Z", "GBP_JPY", 190.20, 190.22),
+            heartbeat_message("2024-12-17T10:06:00.000000000Z"),
+        ],
+    ]
+    client = FakeOandaClient(stream_sessions=sessions)
+    gz = Galgoz(client=client)
+    stream = PriceStream(
+        gz=gz, instruments=["GBP_JPY"], reconnect_delay=0, max_reconnects=1
+    )
+    completed = []
+    stream.subscribe(
+        "GBP_JPY", callback=lambda i, candle, complete: complete and completed.append(candle)
+    )
+    stream.run()  # returns after the second connection ends (max_reconnects=1)
+
+    times = [candle.name for candle in completed]
+    assert times == list(
+        pd.date_range("2024-12-17T10:00:00Z", periods=6, freq="min")
+    ), "Missed candles were not back-filled in order"
+    assert completed[0]["volume"] == 2
+    assert len(client.requests) == 3  # 2 stream connections and 1 back-fill request
+
+
+def test_stream_appends_to_indicators():
+    history = pd.read_pickle("data/file_for_testing.pkl").iloc[:-1]
+    history = history.set_index(pd.DatetimeIndex(pd.to_datetime(history["time"]), name="time"))
+    history = history.drop(columns=["time"])
+    rsi = RSI(history, window=5)
+    stream = PriceStream(
+        gz=Galgoz(client=FakeOandaClient()), instruments=["EUR_USD"], granularity="H1"
+    )
+    stream.subscribe("EUR_USD", indicator=rsi)
+    stream.on_message(
+        price_message("2024-12-17T23:10:00.000000000Z", "EUR_USD", 1.05, 1.0502)
+    )
+    stream.on_message(heartbeat_message("2024-12-18T00:00:01.000000000Z"))
+    assert len(rsi.output) == len(history) + 1
+    assert rsi.output.index[-1] == pd.Timestamp("2024-12-17T23:00:00Z")
@@ -0,0 +1,54 @@
+import pandas as pd
+import plotly.graph_objects as go  # type: ignore
+import pytest
+
+from benchmarks.synthetic import synthetic_candles
+from galgoz.indicators import QQE, SuperTrend
+from galgoz.plotting.live import LiveChart
+
+
+def widgets_installed() -> bool:
+    try:
+        go.FigureWidget()
+    except ImportError:
+        return False
+    return True
+
+
+@pytest.mark.skipif(not widgets_installed(), reason="requires the live extra")
+def test_live_chart_slides_window():
+    candles = synthetic_candles(1100, seed=3)
+    history, new = candles.iloc[:1000], candles.iloc[1000:]
+    indicators = [SuperTrend(history), QQE(history)]
+    chart = LiveChart(indicators=indicators, window=200)
+    fig = chart.show(history)
+    assert isinstance(fig, go.FigureWidget)
+    assert len(fig.data) == 4 and len(fig.data[0].x) == 200
+
+    partial = new.iloc[0].copy()
+    partial["mid_c"] = partial["mid_o"]
+    chart.update(partial, False)
+    assert fig.data[0].close[-1] == partial["mid_o"]
+    assert len(fig.data[0].x) == 200 and len(fig.data[1].x) == 200
+
+    for _, candle in new.iterrows():
+        for indicator in indicators:
+            indicator.append(candle)
+        chart.on_candle("GBP_JPY", candle, True)
+
+    assert len(fig.data[0].x) == 200
+    assert pd.Timestamp(fig.data[0].x[-1]) == new.index[-1]
+    assert fig.data[0].close[-1] == new["mid_c"].iloc[-1]
+    expected = SuperTrend(candles).output.iloc[-200:]
+    assert list(fig.data[1].y) == list(expected)
+    assert list(fig.data[3].y) == list(QQE(candles).output["qqe_slow"].iloc[-200:])
+
+
+def test_live_chart_without_widgets_explains_the_extra(monkeypatch):
+    def missing_widget(*args, **kwargs):
+        raise ImportError("Please install anywidget to use the FigureWidget class")
+
+    monkeypatch.setattr(go, "FigureWidget", missing_widget)
+    chart = LiveChart(window=50)
+    with pytest.raises(ImportError, match="poetry install -E live"):
+        chart.show(synthetic_candles(100, seed=3))
@@ -0,0 +1,86 @@
+import logging
+
+import pandas as pd
+import pytest
+
+from benchmarks.fakes import FakeOandaClient
+from galgoz import DATA_FOLDER, Galgoz
+from galgoz.indicators import SuperTrend, Indicator, IndicatorCache
+from galgoz.metrics import METRICS, InMemorySink, LoggingSink, PrometheusSink
+from galgoz.utils import set_data_index_and_time_str
+
+
+@pytest.fixture
+def sink():
+    sink = METRICS.add_sink(PrometheusSink())
+    yield sink
+    METRICS.remove_sink(sink)
+
+
+def test_disabled_metrics_measure_nothing():
+    assert not METRICS.enabled
+    with METRICS.timer("x") as tags:
+        tags["status"] = 200
+    with METRICS.timer("y") as tags:
+        assert tags == {}
+
+
+def test_candle_requests_and_decoding_are_timed(sink):
+    gz = Galgoz(client=FakeOandaClient(failures=1), store=None)
+    gz.candles_df(
+        granularity="H1", date_from="2024-01-01T00:00:00Z", date_to="2024-01-02T00:00:00Z", backoff=0
+    )
+
+    tags = (("endpoint", "candles"), ("instrument", "GBP_JPY"))
+    assert sink.counters[("api.retries", tags)] == 1
+    assert sink.counters[("api.candles", (("instrument", "GBP_JPY"),))] == 25
+    assert sink.timings[("api.request", (*tags[:1], ("error", "V20Error"), *tags[1:]))]["count"] == 1
+    assert sink.timings[("api.request", tags)]["count"] == 1
+    assert sink.timings[("decode", ())]["count"] == 1
+
+
+def test_indicator_runs_are_tagged_with_cache_outcome(sink, monkeypatch):
+    monkeypatch.setattr(Indicator, "cache", IndicatorCache())
+    candles = set_data_index_and_time_str(pd.read_pickle(DATA_FOLDER / "GBP_JPY_H4.pkl").iloc[-500:])
+    SuperTrend(candles)
+    SuperTrend(candles)
+
+    summary = sink.summary()
+    runs = summary[summary["name"] == "indicator.run"].set_index("tags")["count"]
+    assert runs["{cache=miss,indicator=SuperTrend}"] == 1
+    assert runs["{cache=hit,indicator=SuperTrend}"] == 1
+
+
+def test_prometheus_text_format(sink):
+    METRICS.timing("api.request", 0.25, endpoint="candles")
+    METRICS.timing("api.request", 0.75, endpoint="candles")
+    METRICS.count("api.bytes", 512, endpoint='say "hi"')
+
+    assert sink.render().splitlines() == [
+        "# TYPE galgoz_api_request_seconds summary",
+        'galgoz_api_request_seconds_count{endpoint="candles"} 2',
+        'galgoz_api_request_seconds_sum{endpoint="candles"} 1.000000000',
+        "# TYPE galgoz_api_bytes_total counter",
+        'galgoz_api_bytes_total{endpoint="say \\"hi\\""} 512',
+    ]
+    sink.reset()
+    assert sink.render() == "\n" and sink.summary().empty
+
+
+def test_logging_sink(caplog):
+    sink = METRICS.add_sink(LoggingSink())
+    try:
+        with caplog.at_level(logging.INFO, logger="galgoz.metrics"):
+            with METRICS.timer("decode", rows=3):
+                pass
+    finally:
+        METRICS.remove_sink(sink)
+    assert caplog.records[0].getMessage().startswith("decode{rows=3} ")
+
+
+def test_in_memory_sink_aggregates():
+    sink = InMemorySink()
+    sink.timing("plot", 1.0, {})
+    sink.timing("plot", 3.0, {})
+    row = sink.summary().iloc[0]
+    assert (row["count"], row["total"], row["mean"], row["min"], row["max"]) == (2, 4.0, 2.0, 1.0, 3.0)
@@ -0,0 +1,62 @@
+import pandas as pd
+import pytest
+
+from galgoz import DATA_FOLDER
+from galgoz.backtesting import Backtest
+from galgoz.indicators import SuperTrend
+from galgoz.optimize import Optimizer, optimize
+from galgoz.utils import set_data_index_and_time_str
+
+
+@pytest.fixture(scope="module")
+def candles():
+    data = pd.read_pickle(DATA_FOLDER / "GBP_JPY_H4.pkl").iloc[-3000:]
+    return set_data_index_and_time_str(data)
+
+
+def test_optimize_matches_in_process_backtests(candles):
+    grid = {"atr_period": [10, 14], "multiplier": [3.0, 6.5]}
+    board = optimize(candles, SuperTrend, grid, max_workers=2)
+    assert len(board) == 4
+    assert board["sharpe"].is_monotonic_decreasing
+    indicator = SuperTrend(candles, atr_period=14, multiplier=3.0)
+    expected = Backtest(data=candles, indicators=[indicator]).run()
+    assert board.loc[(14, 3.0), "total_pnl"] == pytest.approx(expected["total_pnl"])
+
+
+def test_optimizer_streams_folds_and_walks_forward(candles):
+    optimizer = Optimizer(
+        data=candles,
+        indicator=SuperTrend,
+        grid={"atr_period": [14], "multiplier": [2.0, 4.0]},
+        folds=3,
+        max_workers=2,
+    )
+    seen = []
+    for result in optimizer.run():
+        seen.append(result)
+        assert len(optimizer.results) == len(seen)
+    assert sorted((r["multiplier"], r["fold"]) for r in seen) == [
+        (m, f) for m in (2.0, 4.0) for f in range(3)
+    ]
+    assert (optimizer.leaderboard()["folds"] == 3).all()
+
+    start, end = optimizer.fold_bounds()[1]
+    signals = SuperTrend(candles.iloc[:end], atr_period=14, multiplier=2.0).signals()
+    expected = Backtest(data=candles.iloc[start:end], signals=signals.iloc[start:]).run()
+    fold = next(r for r in seen if r["multiplier"] == 2.0 and r["fold"] == 1)
+    assert fold["total_pnl"] == pytest.approx(expected["total_pnl"])
+
+    # Each fold is tested with the multiplier that did best on the folds before it
+    sharpe = {(r["multiplier"], r["fold"]): r["sharpe"] for r in seen}
+    walk = optimizer.walk_forward()
+    assert list(walk.index) == [1, 2]
+    for fold, row in walk.iterrows():
+        in_sample = {m: sum(sharpe[m, f] for f in range(fold)) / fold for m in (2.0, 4.0)}
+        assert row["multiplier"] == max(in_sample, key=in_sample.get)
+        assert row["in_sample_sharpe"] == pytest.approx(in_sample[row["multiplier"]])
+        assert row["sharpe"] == sharpe[row["multiplier"], fold]
+    optimizer.anchored = False
+    rolling = optimizer.walk_forward()
+    best = max((2.0, 4.0), key=lambda m: sharpe[m, 1])
+    assert rolling.loc[2, "multiplier"] == best
@@ -0,0 +1,79 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks.fakes import FakeOandaClient
+from galgoz import DATA_FOLDER, Galgoz, panel
+from galgoz.indicators import HMA, RSI, SuperTrend
+from galgoz.storage import CandleStore
+from galgoz.utils import set_data_index_and_time_str
+
+
+@pytest.fixture(scope="module")
+def frames():
+    data = set_data_index_and_time_str(
+        pd.read_pickle(DATA_FOLDER / "GBP_JPY_H4.pkl").iloc[-3000:]
+    ).drop(columns=["index", "time_str"])
+    data = data[~data.index.duplicated()]
+    rng = np.random.default_rng(0)
+    other = data.iloc[200:].drop(data.index[rng.choice(len(data) - 200, 100, replace=False) + 200])
+    other = other * 1.01
+    return {"GBP_JPY": data, "EUR_JPY": other}
+
+
+def test_align_panel_fills_gaps(frames):
+    aligned = panel.align_panel(frames)
+    assert aligned.index.equals(frames["GBP_JPY"].index)
+    eur = aligned["EUR_JPY"]
+    assert eur["mid_c"].iloc[:200].isna().all()
+    assert eur["mid_c"].iloc[200:].notna().all()
+    gaps = ~aligned.index.isin(frames["EUR_JPY"].index)
+    assert (eur.loc[gaps, "volume"].iloc[200:] == 0).all()
+
+    inner = panel.align_panel(frames, how="inner")
+    assert inner.index.equals(frames["EUR_JPY"].index)
+    assert panel.to_array(inner, ["mid_o", "mid_c"]).shape == (len(inner), 2, 2)
+
+
+def test_panel_indicators_match_single_instrument(frames):
+    aligned = panel.align_panel(frames)
+    for instrument, data in frames.items():
+        rows = data.index
+        rsi = panel.rsi(aligned, 14)[instrument].loc[rows]
+        expected = RSI(data, window=14).output
+        if instrument == "GBP_JPY":
+            pd.testing.assert_series_equal(rsi, expected, check_names=False, atol=1e-10)
+            st = panel.supertrend(aligned, 14, 6.5)[instrument]
+            expected = SuperTrend(data, atr_period=14, multiplier=6.5).output
+            pd.testing.assert_series_equal(st, expected, check_names=False, atol=1e-10)
+            hma = panel.hma(aligned, 169)[instrument]
+            expected = HMA(data, window=169).output
+            pd.testing.assert_series_equal(hma, expected, check_names=False, atol=1e-10)
+        else:
+            # Gap-filled bars change the result, but the leading NaNs must be skipped
+            assert rsi.iloc[20:].notna().all()
+
+
+def test_fetch_panel(tmp_path):
+    client = FakeOandaClient()
+    gz = Galgoz(client=client, store=CandleStore(folder=tmp_path))
+    result = gz.fetch_panel(
+        ["GBP_JPY", "EUR_USD", "USD_JPY"],
+        granularity="H1",
+        date_from="2024-01-01T00:00:00Z",
+        date_to="2024-01-03T00:00:00Z",
+    )
+    assert len(client.requests) == 3
+    assert {r._endpoint.split("/")[2] for r in client.requests} == {
+        "GBP_JPY",
+        "EUR_USD",
+        "USD_JPY",
+    }
+    assert list(result.columns.get_level_values("instrument").unique()) == [
+        "GBP_JPY",
+        "EUR_USD",
+        "USD_JPY",
+    ]
+    assert len(result) == 2 * 24 + 1
+    assert str(result.index.tz) == "UTC"
+    assert panel.field(result, "mid_c").shape == (len(result), 3)
@@ -0,0 +1,61 @@
+from datetime import datetime as dt
+
+import pandas as pd
+
+from benchmarks.fakes import make_candles
+from galgoz.decoder import decode_candles
+from galgoz.storage import parquet
+from galgoz.storage.parquet import migrate_pickles, read_parquet, write_parquet
+
+
+def candles(date_from, date_to, granularity="H1"):
+    return decode_candles(make_candles(date_from, date_to, granularity), time_index=False)
+
+
+def test_parquet_round_trip_with_projection(tmp_path):
+    df = candles(dt(2021, 12, 1), dt(2022, 2, 1))
+    write_parquet(df, tmp_path, "GBP_JPY", "H1")
+    res = read_parquet(
+        tmp_path,
+        "GBP_JPY",
+        "H1",
+        columns=["mid_c"],
+        date_from="2022-01-01",
+        date_to="2022-01-31T23:00:00",
+    )
+    assert list(res.columns) == ["mid_c"]
+    assert isinstance(res.index, pd.DatetimeIndex)
+    assert len(res) == 31 * 24
+    expected = df.set_index(pd.to_datetime(df["time"], utc=True))["mid_c"]
+    assert res["mid_c"].equals(expected.loc[res.index])
+
+
+def test_parquet_appends_partial_years(tmp_path):
+    write_parquet(candles(dt(2022, 1, 1), dt(2022, 6, 1)), tmp_path, "GBP_JPY", "H1")
+    write_parquet(candles(dt(2022, 5, 1), dt(2023, 2, 1)), tmp_path, "GBP_JPY", "H1")
+    res = read_parquet(tmp_path, "GBP_JPY", "H1")
+    full = candles(dt(2022, 1, 1), dt(2023, 2, 1))
+    assert len(res) == len(full)
+    assert res.index.is_unique and res.index.is_monotonic_increasing
+
+
+def test_parquet_time_filter_skips_row_groups(tmp_path, monkeypatch):
+    monkeypatch.setattr(parquet, "ROW_GROUP_SIZE", 24 * 7)
+    write_parquet(candles(dt(2020, 1, 1), dt(2023, 1, 1)), tmp_path, "GBP_JPY", "H1")
+    expression = parquet._filter("GBP_JPY", "H1", "2022-03-01", "2022-03-31")
+    dataset = parquet._dataset(tmp_path)
+    fragments = list(dataset.get_fragments(filter=expression))
+    assert len(fragments) == 1
+    row_groups = fragments[0].split_by_row_group(
+        parquet._time_filter("2022-03-01", "2022-03-31")
+    )
+    assert len(row_groups) <= 6
+    assert fragments[0].metadata.num_row_groups > 50
+
+
+def test_migrate_pickles(tmp_path):
+    candles(dt(2022, 1, 1), dt(2022, 2, 1), "D").to_pickle(tmp_path / "EUR_USD_D.pkl")
+    candles(dt(2022, 1, 1), dt(2022, 2, 1)).to_pickle(tmp_path / "file_for_testing.pkl")
+    migrated = migrate_pickles(tmp_path, tmp_path / "parquet")
+    assert [path.name for path in migrated] == ["EUR_USD_D.pkl"]
+    assert len(read_parquet(tmp_path / "parquet", "EUR_USD", "D")) == 32
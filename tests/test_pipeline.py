@@ -0,0 +1,66 @@
+import pandas as pd
+import pytest
+
+from galgoz import DATA_FOLDER
+from galgoz.indicators import HMA, MFI, QQE, RSI, Pipeline, SuperTrend
+from galgoz.utils import set_data_index_and_time_str
+
+
+@pytest.fixture(scope="module")
+def candles():
+    data = set_data_index_and_time_str(
+        pd.read_pickle(DATA_FOLDER / "GBP_JPY_H4.pkl").iloc[-3000:]
+    )
+    return data[~data.index.duplicated()]
+
+
+def strategy():
+    return [
+        RSI(None, window=14),
+        RSI(None, window=8),
+        QQE(None, length=14),
+        QQE(None, length=8, smooth=5),
+        SuperTrend(None, atr_period=14, multiplier=6.5),
+        SuperTrend(None, atr_period=14, multiplier=3),
+        HMA(None, window=169),
+        HMA(None, window=338),
+        MFI(None, window=14),
+    ]
+
+
+def test_pipeline_matches_run(candles):
+    pipeline = Pipeline(data=candles)
+    indicators = strategy()
+    for indicator in indicators:
+        pipeline.add(indicator)
+    pipeline.run()
+    for indicator, expected in zip(indicators, strategy()):
+        expected.update(candles)
+        if isinstance(expected.output, pd.DataFrame):
+            pd.testing.assert_frame_equal(indicator.output, expected.output)
+        else:
+            pd.testing.assert_series_equal(indicator.output, expected.output)
+
+
+def test_shared_blocks_are_evaluated_once(candles):
+    pipeline = Pipeline(data=candles)
+    indicators = strategy()
+    for indicator in indicators:
+        pipeline.add(indicator)
+    assert sum(pipeline.evaluations.values()) == 0, "Declaring indicators evaluated them"
+
+    pipeline.output(indicators[0])
+    assert pipeline.evaluations == {"column": 1, "rsi": 1, "rename": 1}
+
+    pipeline.run()
+    assert pipeline.evaluations["rsi"] == 2
+    assert pipeline.evaluations["atr"] == 1
+    assert pipeline.evaluations["medprice"] == 1
+    # HMA 169 and 338 share the 169 bars weighted moving average
+    assert pipeline.evaluations["wma"] == 5
+    assert pipeline.evaluations["column"] == 3
+
+    pipeline.update(candles.iloc[:-10])
+    pipeline.run()
+    assert pipeline.evaluations["rsi"] == 4
+    assert len(indicators[-1].output) == len(candles) - 10
@@ -0,0 +1,61 @@
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go  # type: ignore
+import pytest
+
+from benchmarks.synthetic import synthetic_candles
+from galgoz.indicators import QQE, SuperTrend
+from galgoz.plotting.candles import plot
+from galgoz.plotting.decimate import aggregate_ohlc, decimate, lttb_indices, minmax_indices
+from galgoz.utils import generate_indicators
+
+
+def test_aggregate_ohlc():
+    candles = synthetic_candles(1003, seed=1)
+    bars = aggregate_ohlc(candles, 100)
+    assert len(bars) == 92  # 11 bars per candle
+    assert bars.index[1] == candles.index[11]
+    first = candles.iloc[:11]
+    assert bars.iloc[0].tolist() == [
+        first.mid_o.iloc[0],
+        first.mid_h.max(),
+        first.mid_l.min(),
+        first.mid_c.iloc[-1],
+    ]
+    assert bars.mid_c.iloc[-1] == candles.mid_c.iloc[-1]
+
+
+@pytest.mark.parametrize("select", [minmax_indices, lttb_indices])
+def test_decimation_keeps_bounds(select):
+    y = np.cumsum(np.random.default_rng(0).normal(size=50_000))
+    y[:300] = np.nan
+    indices = select(y, 1000)
+    assert len(indices) <= 1000
+    assert np.all(np.diff(indices) > 0)
+    assert indices[-1] == len(y) - 1 or select is minmax_indices
+    # All-NaN buckets keep one point so that the gap is drawn
+    assert (indices[np.isnan(y[indices])] < 300).all()
+    if select is minmax_indices:
+        assert np.nanmax(y[indices]) == np.nanmax(y)
+        assert np.nanmin(y[indices]) == np.nanmin(y)
+
+
+def test_decimate_short_series_is_unchanged():
+    line = pd.Series([1.0, 2.0, 3.0])
+    assert decimate(line, 10, "lttb").equals(line)
+    with pytest.raises(ValueError):
+        decimate(line, 2, "every_other")
+
+
+def test_downsampled_plot_is_bounded():
+    sizes = []
+    for n in (20_000, 200_000):
+        candles = synthetic_candles(n, seed=2)
+        indicators = generate_indicators(SuperTrend(candles), QQE(candles))
+        fig = plot(candles, indicators=indicators, max_bars=1000)
+        assert isinstance(fig.data[0], go.Candlestick)
+        assert all(isinstance(trace, go.Scattergl) for trace in fig.data[1:])
+        assert all(len(trace.x) <= 1000 for trace in fig.data)
+        assert fig.layout.xaxis.type == "date"
+        sizes.append(len(fig.to_json()))
+    assert sizes[1] < 1.2 * sizes[0]
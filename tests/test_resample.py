@@ -0,0 +1,87 @@
+from datetime import datetime as dt
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks.fakes import FakeOandaClient, make_candles
+from galgoz import Galgoz
+from galgoz.decoder import decode_candles
+from galgoz.storage import CandleStore, Resampler, resample_candles
+from galgoz.utils import candle_start
+
+
+@pytest.fixture(scope="module")
+def m1():
+    # Spans the US daylight saving change of 2024-03-10 and two weekly candles
+    return decode_candles(make_candles(dt(2024, 3, 6), dt(2024, 3, 18, 12), "M1"))
+
+
+def groupby_reference(df: pd.DataFrame, granularity: str) -> pd.DataFrame:
+    groups = df.groupby(candle_start(df.index, granularity))
+    return pd.DataFrame(
+        {
+            "volume": groups["volume"].sum(),
+            "mid_o": groups["mid_o"].first(),
+            "mid_h": groups["mid_h"].max(),
+            "mid_l": groups["mid_l"].min(),
+            "mid_c": groups["mid_c"].last(),
+            "ask_h": groups["ask_h"].max(),
+        }
+    )
+
+
+@pytest.mark.parametrize("granularity", ["M5", "H1", "H4", "D", "W"])
+def test_resample_matches_groupby(m1, granularity):
+    resampled = resample_candles(m1, granularity)
+    expected = groupby_reference(m1, granularity)
+    pd.testing.assert_frame_equal(
+        resampled[expected.columns], expected, check_names=False, check_freq=False
+    )
+
+
+def test_oanda_alignment(m1):
+    daily = resample_candles(m1, "D")
+    # 17:00 New York: 22:00 UTC before the daylight saving change, 21:00 UTC after
+    assert daily.index[1] == pd.Timestamp("2024-03-06 22:00", tz="UTC")
+    assert daily.index[-1] == pd.Timestamp("2024-03-17 21:00", tz="UTC")
+    weekly = resample_candles(m1, "W")
+    assert list(weekly.index.tz_convert("America/New_York").day_name()) == ["Friday"] * len(weekly)
+    assert weekly["complete"].tolist() == [True, True, False]
+    assert daily["complete"].iloc[:-1].all() and not daily["complete"].iloc[-1]
+
+
+def test_candles_df_layout_round_trip(m1):
+    layout = decode_candles(make_candles(dt(2024, 3, 6), dt(2024, 3, 8), "M1"), time_index=False)
+    resampled = resample_candles(layout, "H4")
+    assert list(resampled.columns) == list(layout.columns)
+    assert resampled["time"].iloc[0] == "2024-03-05T22:00:00.000000000Z"
+    assert resampled["complete"].dtype == np.int64
+
+
+def test_invalid_source():
+    with pytest.raises(ValueError):
+        resample_candles(pd.DataFrame(), "M5", source="H1")
+
+
+def test_incremental_update_matches_full_resample(m1):
+    resampler = Resampler(m1.iloc[:5000])
+    for granularity in ("H1", "D", "W"):
+        resampler.get(granularity)
+    # Appended candles, a replaced last candle, then an update in the past
+    resampler.update(m1.iloc[5000:9000])
+    resampler.update(m1.iloc[8999:12000])
+    resampler.update(m1.iloc[100:200])
+    for granularity in ("H1", "D", "W"):
+        pd.testing.assert_frame_equal(
+            resampler.get(granularity), resample_candles(m1.iloc[:12000], granularity)
+        )
+
+
+def test_galgoz_resampler_makes_a_single_download(tmp_path):
+    client = FakeOandaClient()
+    gz = Galgoz(client=client, store=CandleStore(folder=tmp_path))
+    resampler = gz.resampler("2024-03-01T00:00:00Z", "2024-03-04T00:00:00Z", price="M")
+    hourly, daily = resampler.get("H1"), resampler.get("D")
+    assert {r.params["granularity"] for r in client.requests} == {"M1"}
+    assert len(hourly) == 73 and len(daily) == 4
@@ -0,0 +1,55 @@
+from benchmarks.fakes import FakeOandaClient
+from galgoz import Galgoz
+from galgoz.storage import CandleStore
+
+
+def make_gz(tmp_path, client=None):
+    return Galgoz(client=client or FakeOandaClient(), store=CandleStore(folder=tmp_path))
+
+
+def test_store_fetches_only_missing_ranges(tmp_path):
+    client = FakeOandaClient()
+    gz = make_gz(tmp_path, client)
+    first = gz.candles_df(
+        granularity="H1", date_from="2024-01-01T00:00:00Z", date_to="2024-01-03T00:00:00Z"
+    )
+    assert len(client.requests) == 1
+    again = gz.candles_df(
+        granularity="H1", date_from="2024-01-01T00:00:00Z", date_to="2024-01-03T00:00:00Z"
+    )
+    assert len(client.requests) == 1, "Stored range was downloaded again"
+    assert again.equals(first)
+
+    wider = gz.candles_df(
+        granularity="H1", date_from="2023-12-31T00:00:00Z", date_to="2024-01-04T00:00:00Z"
+    )
+    fetched = [(r.params["from"], r.params["to"]) for r in client.requests[1:]]
+    assert fetched == [
+        ("2023-12-31T00:00:00Z", "2024-01-01T00:00:00Z"),
+        ("2024-01-03T00:00:00Z", "2024-01-04T00:00:00Z"),
+    ]
+    assert len(wider) == 4 * 24 + 1
+    assert wider["time"].is_monotonic_increasing and wider["time"].is_unique
+
+
+def test_store_refetches_incomplete_candle(tmp_path):
+    client = FakeOandaClient()
+    gz = make_gz(tmp_path, client)
+    df = gz.candles_df(
+        granularity="H1", date_from="2024-12-17T00:00:00Z", date_to="2024-12-19T00:00:00Z"
+    )
+    assert df["complete"].iloc[-1] == 0
+    assert gz.store.missing(
+        "GBP_JPY", "H1", "MBA", "2024-12-17T00:00:00Z", "2024-12-19T00:00:00Z"
+    ) == [("2024-12-18T00:00:00Z", "2024-12-19T00:00:00Z")]
+
+
+def test_store_persists_between_instances(tmp_path):
+    kwargs = dict(
+        granularity="D", date_from="2024-01-01T00:00:00Z", date_to="2024-02-01T00:00:00Z"
+    )
+    first = make_gz(tmp_path).candles_df(**kwargs)
+    client = FakeOandaClient()
+    second = make_gz(tmp_path, client).candles_df(**kwargs)
+    assert len(client.requests) == 0
+    assert second.equals(first)